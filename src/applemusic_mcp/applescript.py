@@ -10,14 +10,20 @@ Security Notes:
     - All user input (track names, playlist names, etc.) is escaped via
       _escape_for_applescript() which escapes backslashes first, then quotes,
       before embedding in AppleScript strings. This prevents injection attacks.
-    - Scripts are executed via subprocess.run() with capture_output=True
-      and a 30-second timeout to prevent hangs.
+    - Scripts run in a long-lived osascript host process (see
+      _OsascriptHost) with a 30-second per-script timeout to prevent hangs.
+      Set APPLEMUSIC_PERSISTENT_OSASCRIPT=0 to spawn one osascript per call.
     - The osascript binary location is verified via shutil.which() before use.
 """
 
+import atexit
+import json
+import os
+import select
+import shutil
 import subprocess
 import sys
-import shutil
+import threading
 import time
 from typing import Optional
 
@@ -159,31 +165,220 @@ def _library_track_query(track_name: str, artist: Optional[str] = None) -> str:
     return f'first track of library playlist 1 whose name contains "{safe_track}"'
 
 
-def run_applescript(script: str) -> tuple[bool, str]:
-    """Execute AppleScript and return (success, output/error).
+APPLESCRIPT_TIMEOUT = 30  # seconds
+
+# Compiled scripts kept by the persistent host, keyed by source text.
+# Static scripts (playback control, state queries, playlist listing) are
+# compiled once per host lifetime instead of on every call; parameterized
+# scripts churn through the LRU.
+_HOST_COMPILED_MAX = 64
+
+# JXA program run by the persistent host. Reads one JSON-encoded script per
+# line on stdin, compiles (or reuses) it via NSAppleScript, runs it
+# in-process, and writes one JSON reply per line on stdout. Text, numbers,
+# booleans, flat lists (joined with ", "), missing value, no result, and
+# error messages (with the "start:end: " source-range prefix) come back the
+# way `osascript -s h` prints them. Nested lists are flattened and records
+# render as "", which osascript does not do; the scripts in this module
+# return only the former, and callers must not rely on the latter.
+# Python sends ASCII-only JSON, so decoding each stdin chunk is safe.
+_HOST_SCRIPT = r"""ObjC.import("Foundation");
+var COMPILED_MAX = %d;
+function descToText(d) {
+    var t = d.descriptorType;
+    if (t === 0x6E756C6C) return "";
+    if (t === 0x74797065 && d.typeCodeValue === 0x6D736E67) return "missing value";
+    if (t === 0x6C697374) {
+        var parts = [];
+        for (var i = 1; i <= d.numberOfItems; i++) parts.push(descToText(d.descriptorAtIndex(i)));
+        return parts.join(", ");
+    }
+    if (t === 0x74727565 || t === 0x66616C73 || t === 0x626F6F6C) {
+        return d.booleanValue ? "true" : "false";
+    }
+    var s = d.stringValue;
+    return (s && !s.isNil()) ? s.js : "";
+}
+function errorReply(info) {
+    var msg = info.objectForKey("NSAppleScriptErrorMessage");
+    var num = info.objectForKey("NSAppleScriptErrorNumber");
+    msg = (msg && !msg.isNil()) ? msg.js : "Unknown AppleScript error";
+    num = (num && !num.isNil()) ? num.js : 0;
+    var kind = (num === -2740 || num === -2741) ? "syntax error" : "execution error";
+    var where = "";
+    var range = info.objectForKey("NSAppleScriptErrorRange");
+    if (range && !range.isNil()) {
+        var r = range.rangeValue;
+        where = r.location + ":" + (r.location + r.length) + ": ";
+    }
+    return {ok: false, out: where + kind + ": " + msg + " (" + num + ")"};
+}
+var compiled = new Map();
+function compile(src) {
+    var script = compiled.get(src);
+    if (script) {
+        compiled.delete(src);
+    } else {
+        var err = Ref();
+        script = $.NSAppleScript.alloc.initWithSource(src);
+        if (!script.compileAndReturnError(err)) return {error: errorReply(err[0])};
+        if (compiled.size >= COMPILED_MAX) compiled.delete(compiled.keys().next().value);
+    }
+    compiled.set(src, script);
+    return {script: script};
+}
+function runOne(src) {
+    var c = compile(src);
+    if (c.error) return c.error;
+    var script = c.script;
+    var err = Ref();
+    var result = script.executeAndReturnError(err);
+    if (result.isNil()) return errorReply(err[0]);
+    return {ok: true, out: descToText(result)};
+}
+function run() {
+    var stdin = $.NSFileHandle.fileHandleWithStandardInput;
+    var stdout = $.NSFileHandle.fileHandleWithStandardOutput;
+    var buf = "";
+    while (true) {
+        var data = stdin.availableData;
+        if (data.length === 0) return "";
+        buf += $.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding).js;
+        var nl;
+        while ((nl = buf.indexOf("\n")) >= 0) {
+            var line = buf.slice(0, nl);
+            buf = buf.slice(nl + 1);
+            var reply = JSON.stringify(runOne(JSON.parse(line))) + "\n";
+            stdout.writeData($(reply).dataUsingEncoding($.NSUTF8StringEncoding));
+        }
+    }
+}""" % _HOST_COMPILED_MAX
 
-    Args:
-        script: AppleScript code to execute
 
-    Returns:
-        Tuple of (success: bool, output: str)
-        On success, output is the script's return value.
-        On failure, output is the error message.
+class _HostUnavailable(Exception):
+    """The persistent host couldn't accept a script (spawn or write failed)."""
+
+
+class _OsascriptHost:
+    """Long-lived osascript process that runs AppleScript sent over a pipe.
+
+    Spawning osascript costs ~100ms per call (process launch, LaunchServices
+    registration, loading the AppleScript component). A single host process
+    amortizes that to zero. Calls are serialized on a lock — Music.app
+    handles Apple Events one at a time anyway.
+
+    The host is respawned lazily after it exits or is killed on timeout.
     """
+
+    def __init__(self):
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _spawn(self) -> subprocess.Popen:
+        return subprocess.Popen(
+            ["osascript", "-l", "JavaScript", "-e", _HOST_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def _kill(self) -> None:
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+                self._proc.wait(timeout=5)
+            except Exception:
+                pass
+        self._proc = None
+
+    def close(self) -> None:
+        """Terminate the host process (registered with atexit)."""
+        with self._lock:
+            self._kill()
+
+    def run(self, script: str, timeout: float = APPLESCRIPT_TIMEOUT) -> tuple[bool, str]:
+        """Run one script in the host.
+
+        Raises _HostUnavailable only when the script was never delivered, so
+        the caller can safely retry it elsewhere without running it twice.
+        """
+        with self._lock:
+            try:
+                if self._proc is None or self._proc.poll() is not None:
+                    self._proc = self._spawn()
+                self._proc.stdin.write(json.dumps(script).encode("ascii") + b"\n")
+                self._proc.stdin.flush()
+            except Exception as e:
+                self._kill()
+                raise _HostUnavailable(str(e)) from e
+
+            try:
+                ready, _, _ = select.select([self._proc.stdout], [], [], timeout)
+                if not ready:
+                    self._kill()
+                    return False, f"AppleScript timed out after {timeout:g} seconds"
+                line = self._proc.stdout.readline()
+                if not line:
+                    self._kill()
+                    return False, "osascript host exited unexpectedly"
+                reply = json.loads(line)
+            except Exception as e:
+                self._kill()
+                return False, str(e)
+
+        output = reply.get("out", "").strip()
+        return bool(reply.get("ok")), output
+
+
+_host = _OsascriptHost()
+atexit.register(_host.close)
+
+
+def _use_persistent_host() -> bool:
+    return os.environ.get("APPLEMUSIC_PERSISTENT_OSASCRIPT", "1") != "0"
+
+
+def _run_applescript_oneshot(script: str) -> tuple[bool, str]:
+    """Execute AppleScript in a fresh osascript process."""
     try:
         result = subprocess.run(
-            ["osascript", "-e", script], capture_output=True, text=True, timeout=30
+            ["osascript", "-e", script],
+            capture_output=True,
+            text=True,
+            timeout=APPLESCRIPT_TIMEOUT,
         )
         if result.returncode == 0:
             return True, result.stdout.strip()
         else:
             return False, result.stderr.strip()
     except subprocess.TimeoutExpired:
-        return False, "AppleScript timed out after 30 seconds"
+        return False, f"AppleScript timed out after {APPLESCRIPT_TIMEOUT} seconds"
     except Exception as e:
         return False, str(e)
 
 
+def run_applescript(script: str) -> tuple[bool, str]:
+    """Execute AppleScript and return (success, output/error).
+
+    Runs in the persistent osascript host; falls back to a one-shot
+    osascript process if the host can't be started.
+
+    Args:
+        script: AppleScript code to execute
+
+    Returns:
+        Tuple of (success: bool, output: str)
+        On success, output is the script's return value.
+        On failure, output is the error message.
+    """
+    if _use_persistent_host():
+        try:
+            return _host.run(script)
+        except _HostUnavailable:
+            pass
+    return _run_applescript_oneshot(script)
+
+
 # AppleScript error categories. Used to map osascript stderr text to a
 # stable category so callers can produce actionable user-facing messages
 # without each callsite re-matching the same regexes.
@@ -404,11 +599,46 @@ def seek(position: float) -> tuple[bool, str]:
 # =============================================================================
 
 
-def get_playlists() -> tuple[bool, list[dict]]:
-    """Get all user playlists with details.
+def _get_playlists_bulk() -> tuple[bool, str]:
+    """Fetch user playlist properties with one Apple Event per property (fast path).
 
-    Returns:
-        Tuple of (success, list of playlist dicts or error string)
+    Only the track counts need a per-playlist event; name/ID/smart/time come
+    back as parallel lists from a single `... of every user playlist` each.
+    Returns (success, output) where output is raw AppleScript output or error.
+    """
+    script = """
+    tell application "Music"
+        set allPlaylists to every user playlist
+        set playlistCount to count of allPlaylists
+        if playlistCount is 0 then return ""
+
+        -- Bulk fetch properties (one round-trip each instead of per playlist)
+        set allNames to name of every user playlist
+        set allIds to persistent ID of every user playlist
+        set allSmart to smart of every user playlist
+        set allTimes to time of every user playlist
+
+        set output to ""
+        repeat with i from 1 to playlistCount
+            set pName to item i of allNames
+            set pId to item i of allIds
+            set pSmart to item i of allSmart
+            set pCount to count of tracks of item i of allPlaylists
+            set pTime to item i of allTimes
+            if pTime is missing value then set pTime to "0:00"
+            set pRow to pName & "|||" & pId & "|||" & pSmart & "|||" & pCount
+            set output to output & pRow & "|||" & pTime & "\\n"
+        end repeat
+        return output
+    end tell
+    """
+    return run_applescript(script)
+
+
+def _get_playlists_slow() -> tuple[bool, str]:
+    """Per-playlist property fetch fallback (slow path).
+
+    Returns (success, output) where output is raw AppleScript output or error.
     """
     script = """
     tell application "Music"
@@ -428,7 +658,21 @@ def get_playlists() -> tuple[bool, list[dict]]:
         return output
     end tell
     """
-    success, output = run_applescript(script)
+    return run_applescript(script)
+
+
+def get_playlists() -> tuple[bool, list[dict]]:
+    """Get all user playlists with details.
+
+    Uses bulk property fetch when possible, falls back to per-playlist
+    iteration if any bulk property read fails.
+
+    Returns:
+        Tuple of (success, list of playlist dicts or error string)
+    """
+    success, output = _get_playlists_bulk()
+    if not success and classify_error(output) == ERROR_UNKNOWN:
+        success, output = _get_playlists_slow()
     if not success:
         return False, output
 
@@ -2066,12 +2310,16 @@ def get_library_songs_page(offset: int, limit: int) -> tuple[bool, list[dict], i
     return True, tracks, total, ""
 
 
-def search_library(query: str, types: str = "all") -> tuple[bool, list[dict]]:
+def search_library(query: str, types: str = "all", limit: int = 100) -> tuple[bool, list[dict]]:
     """Search the local library.
 
+    Uses Music.app's indexed `search` command (not a `whose` scan). Each
+    result costs ~8 Apple Events to read, so `limit` bounds the work.
+
     Args:
         query: Search query
         types: Type of search - "all", "artists", "albums", "songs"
+        limit: Maximum number of tracks to read (default 100)
 
     Returns:
         Tuple of (success, list of track dicts or error)
@@ -2091,7 +2339,7 @@ def search_library(query: str, types: str = "all") -> tuple[bool, list[dict]]:
     tell application "Music"
         set searchResults to search library playlist 1 for "{safe_query}" {search_modifier}
         set output to ""
-        set maxResults to 100
+        set maxResults to {max(1, int(limit))}
         set resultCount to 0
         repeat with t in searchResults
             if resultCount >= maxResults then exit repeat
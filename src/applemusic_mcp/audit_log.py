@@ -20,37 +20,116 @@ Operations logged:
 - set_preference: Configuration preference changes
 """
 
+import atexit
+import functools
 import json
 import logging
+import mmap
+import os
 import threading
-from datetime import datetime, timezone
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional
+
+from . import jsonio
 
 logger = logging.getLogger(__name__)
 
 MAX_LOG_SIZE = 10 * 1024 * 1024  # 10 MB
 _log_lock = threading.Lock()
 
+# Append-only descriptor reused across log_action calls (guarded by _log_lock),
+# plus the (path, device, inode) it was opened for
+_log_fd: Optional[int] = None
+_log_fd_key: Optional[tuple] = None
+
 
+@functools.cache
 def get_audit_log_path() -> Path:
-    """Get the audit log file path."""
+    """Get the audit log file path (resolved and created once per process)."""
     log_dir = Path.home() / ".cache" / "applemusic-mcp"
     log_dir.mkdir(parents=True, exist_ok=True)
     return log_dir / "audit_log.jsonl"
 
 
-def _rotate_if_needed(log_path: Path) -> None:
-    """Rotate the audit log if it exceeds MAX_LOG_SIZE."""
+def _rotate(log_path: Path) -> bool:
+    """Move the audit log to .jsonl.1 (replacing any older backup)."""
     try:
-        if log_path.exists() and log_path.stat().st_size > MAX_LOG_SIZE:
-            backup = log_path.with_suffix(".jsonl.1")
-            if backup.exists():
-                backup.unlink()
-            log_path.rename(backup)
-            logger.info(f"Rotated audit log ({MAX_LOG_SIZE // (1024*1024)}MB limit)")
+        os.replace(log_path, log_path.with_suffix(".jsonl.1"))
+        logger.info(f"Rotated audit log ({MAX_LOG_SIZE // (1024*1024)}MB limit)")
+        return True
     except Exception as e:
         logger.warning(f"Failed to rotate audit log: {e}")
+        return False
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last timestamp formatted
+_ts_second: tuple[int, str] = (-1, "")
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time in ISO 8601 with microseconds, e.g. ...T12:00:00.123456+00:00.
+
+    Same format as datetime.now(timezone.utc).isoformat(), but the date and
+    time part is formatted at most once per second.
+    """
+    global _ts_second
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    cached_second, prefix = _ts_second
+    if seconds != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _ts_second = (seconds, prefix)
+    return f"{prefix}.{nanos // 1000:06d}+00:00"
+
+
+def _close_log_fd() -> None:
+    """Close the cached log descriptor, if any."""
+    global _log_fd, _log_fd_key
+    if _log_fd is not None:
+        try:
+            os.close(_log_fd)
+        except OSError:
+            pass
+    _log_fd = None
+    _log_fd_key = None
+
+
+atexit.register(_close_log_fd)
+
+
+def _get_log_fd(log_path: Path, st: Optional[os.stat_result]) -> int:
+    """Return an O_APPEND descriptor for log_path, opening it on first use.
+
+    Reopens when the path changes or the file on disk (st, None if missing)
+    is no longer the one the descriptor points at: rotated, cleared, or
+    deleted externally. Caller must hold _log_lock.
+    """
+    global _log_fd, _log_fd_key
+    key = (log_path, st.st_dev, st.st_ino) if st is not None else None
+    if _log_fd is not None and key != _log_fd_key:
+        _close_log_fd()
+    if _log_fd is None:
+        fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        st = os.fstat(fd)
+        _log_fd, _log_fd_key = fd, (log_path, st.st_dev, st.st_ino)
+    return _log_fd
+
+
+def _write_line(log_path: Path, line: bytes) -> None:
+    """Append one encoded entry. Caller must hold _log_lock."""
+    # One stat serves both the rotation check and the descriptor check
+    try:
+        st = os.stat(log_path)
+    except FileNotFoundError:
+        st = None
+    if st is not None and st.st_size > MAX_LOG_SIZE:
+        # Windows can't rename a file that is still open
+        _close_log_fd()
+        if _rotate(log_path):
+            st = None
+    # One write() on an O_APPEND fd: appends atomically, no open/close
+    os.write(_get_log_fd(log_path, st), line)
 
 
 def log_action(
@@ -66,7 +145,7 @@ def log_action(
         undo_info: Optional information needed to undo this action
     """
     entry = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": _utc_timestamp(),
         "action": action,
         "details": details,
     }
@@ -74,15 +153,69 @@ def log_action(
         entry["undo_info"] = undo_info
 
     try:
-        log_path = get_audit_log_path()
+        line = jsonio.dumps(entry) + b"\n"
         with _log_lock:
-            _rotate_if_needed(log_path)
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry) + "\n")
+            try:
+                _write_line(get_audit_log_path(), line)
+            except FileNotFoundError:
+                # Cache dir was removed after the path was cached; resolving
+                # the path again recreates it
+                get_audit_log_path.cache_clear()
+                _write_line(get_audit_log_path(), line)
     except Exception as e:
         logger.warning(f"Failed to write audit log: {e}")
 
 
+def iter_entries(path: Optional[Path] = None) -> Iterator[dict]:
+    """Yield audit log entries oldest first, skipping lines that don't parse.
+
+    Args:
+        path: Log file to read (defaults to get_audit_log_path())
+
+    Yields:
+        Parsed entry dicts; nothing if the file doesn't exist
+    """
+    try:
+        f = open(path if path is not None else get_audit_log_path(), "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            if line.isspace():
+                continue
+            try:
+                yield jsonio.loads(line)
+            except (jsonio.JSONDecodeError, UnicodeDecodeError):
+                continue
+
+
+def _read_tail(log_path: Path, limit: int) -> list[dict]:
+    """Parse the last `limit` valid entries of the log, most recent first.
+
+    Memory-maps the file and walks backward line by line with rfind, so only
+    the lines that are returned (plus any invalid ones among them) are
+    copied and parsed. A non-positive limit reads everything.
+    """
+    entries = []
+    with open(log_path, "rb") as f:
+        end = os.fstat(f.fileno()).st_size
+        if end == 0:
+            return entries  # mmap can't map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            while end > 0 and (limit <= 0 or len(entries) < limit):
+                # end - 1 is this line's own trailing newline
+                start = mm.rfind(b"\n", 0, end - 1) + 1
+                line = mm[start:end]
+                end = start
+                if line.isspace():
+                    continue
+                try:
+                    entries.append(jsonio.loads(line))
+                except (jsonio.JSONDecodeError, UnicodeDecodeError):
+                    continue
+    return entries
+
+
 def get_recent_entries(limit: int = 50) -> list[dict]:
     """Get the most recent audit log entries.
 
@@ -92,29 +225,121 @@ def get_recent_entries(limit: int = 50) -> list[dict]:
     Returns:
         List of audit log entries (most recent first)
     """
-    log_path = get_audit_log_path()
-    if not log_path.exists():
-        return []
-
-    entries = []
     try:
-        with open(log_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        entries.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
+        entries = _read_tail(get_audit_log_path(), limit)
+    except FileNotFoundError:
+        return []
     except Exception as e:
         logger.warning(f"Failed to read audit log: {e}")
         return []
 
-    # Return most recent first
-    return entries[-limit:][::-1]
+    return entries
+
 
+def _format_header(ts: str) -> str:
+    """Render an entry's "[YYYY-MM-DD HH:MM:SS UTC]" prefix from its timestamp.
 
-def format_entries_for_display(entries: list[dict], limit: int = 20) -> str:
+    Unparseable timestamps are shown as-is.
+    """
+    try:
+        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+        return f"[{dt.strftime('%Y-%m-%d %H:%M:%S UTC')}]"
+    except ValueError:
+        return f"[{ts}]"
+
+
+def _format_track_list(lines: list[str], header: str, tracks: list[Any], marker: str) -> None:
+    """Append a header line plus up to 5 tracks and an overflow note."""
+    lines.append(f"{header}: {len(tracks)} track(s)")
+    for t in tracks[:5]:
+        lines.append(f"    {marker} {t}")
+    if len(tracks) > 5:
+        lines.append(f"    ... and {len(tracks) - 5} more")
+
+
+def _fmt_add_to_library(lines: list[str], header: str, details: dict[str, Any]) -> None:
+    _format_track_list(lines, f"{header} ADD TO LIBRARY", details.get("tracks", []), "+")
+
+
+def _fmt_remove_from_library(lines: list[str], header: str, details: dict[str, Any]) -> None:
+    _format_track_list(lines, f"{header} REMOVE FROM LIBRARY", details.get("tracks", []), "-")
+
+
+def _fmt_add_to_playlist(lines: list[str], header: str, details: dict[str, Any]) -> None:
+    playlist = details.get("playlist", "unknown")
+    _format_track_list(
+        lines, f"{header} ADD TO PLAYLIST '{playlist}'", details.get("tracks", []), "+"
+    )
+
+
+def _fmt_remove_from_playlist(lines: list[str], header: str, details: dict[str, Any]) -> None:
+    playlist = details.get("playlist", "unknown")
+    _format_track_list(
+        lines, f"{header} REMOVE FROM PLAYLIST '{playlist}'", details.get("tracks", []), "-"
+    )
+
+
+def _fmt_playlist_query(lines: list[str], header: str, details: dict[str, Any]) -> None:
+    playlist = details.get("playlist", "unknown")
+    track_count = details.get("track_count", 0)
+    duration = details.get("duration_sec", 0)
+    cache_hits = details.get("cache_hits", 0)
+    cache_misses = details.get("cache_misses", 0)
+    api_calls = details.get("api_calls", 0)
+    lines.append(f"{header} PLAYLIST QUERY: '{playlist}' ({track_count} tracks)")
+    lines.append(
+        f"    {duration}s | Cache: {cache_hits} hits, {cache_misses} misses"
+        f" | API: {api_calls} calls"
+    )
+
+
+# Single-line actions: (template, defaults for missing detail keys).
+# Templates are filled with str.format_map, after the "[timestamp] " prefix.
+_LINE_TEMPLATES: dict[str, tuple[str, dict[str, Any]]] = {
+    "create_playlist": (
+        "CREATE PLAYLIST: '{name}' (ID: {playlist_id})",
+        {"name": "unknown", "playlist_id": ""},
+    ),
+    "delete_playlist": (
+        "DELETE PLAYLIST: '{name}' ({track_count} tracks)",
+        {"name": "unknown", "track_count": 0},
+    ),
+    "copy_playlist": (
+        "COPY PLAYLIST: '{source}' -> '{destination}' ({track_count} tracks)",
+        {"source": "unknown", "destination": "unknown", "track_count": 0},
+    ),
+    "rating": (
+        "RATING: {type} '{track}' {value}",
+        {"track": "unknown", "type": "unknown", "value": ""},
+    ),
+    "create_folder": ("CREATE FOLDER: '{name}'", {"name": "unknown"}),
+    "delete_folder": ("DELETE FOLDER: '{name}'", {"name": "unknown"}),
+    "rename_folder": (
+        "RENAME FOLDER: '{old_name}' -> '{new_name}'",
+        {"old_name": "unknown", "new_name": "unknown"},
+    ),
+    "move_to_root": ("MOVE TO ROOT: '{playlist}'", {"playlist": "unknown"}),
+    "move_to_folder": (
+        "MOVE TO FOLDER: '{playlist}' -> '{folder}'",
+        {"playlist": "unknown", "folder": "unknown"},
+    ),
+    "set_preference": (
+        "SET PREFERENCE: {preference} = {new_value} (was: {old_value})",
+        {"preference": "unknown", "old_value": None, "new_value": None},
+    ),
+}
+
+# Multi-line actions: formatter appending to the display lines
+_ACTION_FORMATTERS: dict[str, Callable[[list[str], str, dict[str, Any]], None]] = {
+    "add_to_library": _fmt_add_to_library,
+    "remove_from_library": _fmt_remove_from_library,
+    "add_to_playlist": _fmt_add_to_playlist,
+    "remove_from_playlist": _fmt_remove_from_playlist,
+    "playlist_query": _fmt_playlist_query,
+}
+
+
+def format_entries_for_display(entries: list[dict[str, Any]], limit: int = 20) -> str:
     """Format audit log entries for human-readable display.
 
     Args:
@@ -132,113 +357,20 @@ def format_entries_for_display(entries: list[dict], limit: int = 20) -> str:
 
     for entry in entries[:limit]:
         ts = entry.get("timestamp", "unknown")
-        # Parse and format timestamp more nicely
-        try:
-            dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-            ts_display = dt.strftime("%Y-%m-%d %H:%M:%S UTC")
-        except Exception:
-            ts_display = ts
+        header = _format_header(ts) if isinstance(ts, str) else f"[{ts}]"
 
         action = entry.get("action", "unknown")
         details = entry.get("details", {})
 
-        # Format based on action type
-        if action == "add_to_library":
-            tracks = details.get("tracks", [])
-            lines.append(f"[{ts_display}] ADD TO LIBRARY: {len(tracks)} track(s)")
-            for t in tracks[:5]:
-                lines.append(f"    + {t}")
-            if len(tracks) > 5:
-                lines.append(f"    ... and {len(tracks) - 5} more")
-
-        elif action == "remove_from_library":
-            tracks = details.get("tracks", [])
-            lines.append(f"[{ts_display}] REMOVE FROM LIBRARY: {len(tracks)} track(s)")
-            for t in tracks[:5]:
-                lines.append(f"    - {t}")
-            if len(tracks) > 5:
-                lines.append(f"    ... and {len(tracks) - 5} more")
-
-        elif action == "add_to_playlist":
-            playlist = details.get("playlist", "unknown")
-            tracks = details.get("tracks", [])
-            lines.append(f"[{ts_display}] ADD TO PLAYLIST '{playlist}': {len(tracks)} track(s)")
-            for t in tracks[:5]:
-                lines.append(f"    + {t}")
-            if len(tracks) > 5:
-                lines.append(f"    ... and {len(tracks) - 5} more")
-
-        elif action == "remove_from_playlist":
-            playlist = details.get("playlist", "unknown")
-            tracks = details.get("tracks", [])
-            lines.append(f"[{ts_display}] REMOVE FROM PLAYLIST '{playlist}': {len(tracks)} track(s)")
-            for t in tracks[:5]:
-                lines.append(f"    - {t}")
-            if len(tracks) > 5:
-                lines.append(f"    ... and {len(tracks) - 5} more")
-
-        elif action == "create_playlist":
-            name = details.get("name", "unknown")
-            playlist_id = details.get("playlist_id", "")
-            lines.append(f"[{ts_display}] CREATE PLAYLIST: '{name}' (ID: {playlist_id})")
-
-        elif action == "delete_playlist":
-            name = details.get("name", "unknown")
-            track_count = details.get("track_count", 0)
-            lines.append(f"[{ts_display}] DELETE PLAYLIST: '{name}' ({track_count} tracks)")
-
-        elif action == "copy_playlist":
-            source = details.get("source", "unknown")
-            dest = details.get("destination", "unknown")
-            track_count = details.get("track_count", 0)
-            lines.append(f"[{ts_display}] COPY PLAYLIST: '{source}' -> '{dest}' ({track_count} tracks)")
-
-        elif action == "rating":
-            track = details.get("track", "unknown")
-            rating_type = details.get("type", "unknown")
-            value = details.get("value", "")
-            lines.append(f"[{ts_display}] RATING: {rating_type} '{track}' {value}")
-
-        elif action == "create_folder":
-            name = details.get("name", "unknown")
-            lines.append(f"[{ts_display}] CREATE FOLDER: '{name}'")
-
-        elif action == "delete_folder":
-            name = details.get("name", "unknown")
-            lines.append(f"[{ts_display}] DELETE FOLDER: '{name}'")
-
-        elif action == "rename_folder":
-            old = details.get("old_name", "unknown")
-            new = details.get("new_name", "unknown")
-            lines.append(f"[{ts_display}] RENAME FOLDER: '{old}' -> '{new}'")
-
-        elif action == "move_to_root":
-            playlist = details.get("playlist", "unknown")
-            lines.append(f"[{ts_display}] MOVE TO ROOT: '{playlist}'")
-
-        elif action == "move_to_folder":
-            playlist = details.get("playlist", "unknown")
-            folder = details.get("folder", "unknown")
-            lines.append(f"[{ts_display}] MOVE TO FOLDER: '{playlist}' -> '{folder}'")
-
-        elif action == "set_preference":
-            pref = details.get("preference", "unknown")
-            old_val = details.get("old_value")
-            new_val = details.get("new_value")
-            lines.append(f"[{ts_display}] SET PREFERENCE: {pref} = {new_val} (was: {old_val})")
-
-        elif action == "playlist_query":
-            playlist = details.get("playlist", "unknown")
-            track_count = details.get("track_count", 0)
-            duration = details.get("duration_sec", 0)
-            cache_hits = details.get("cache_hits", 0)
-            cache_misses = details.get("cache_misses", 0)
-            api_calls = details.get("api_calls", 0)
-            lines.append(f"[{ts_display}] PLAYLIST QUERY: '{playlist}' ({track_count} tracks)")
-            lines.append(f"    {duration}s | Cache: {cache_hits} hits, {cache_misses} misses | API: {api_calls} calls")
-
+        template = _LINE_TEMPLATES.get(action)
+        if template is not None:
+            text, defaults = template
+            lines.append(f"{header} " + text.format_map({**defaults, **details}))
+        elif action in _ACTION_FORMATTERS:
+            _ACTION_FORMATTERS[action](lines, header, details)
         else:
-            lines.append(f"[{ts_display}] {action.upper()}: {json.dumps(details)}")
+            # Unknown action: fall back to raw JSON details
+            lines.append(f"{header} {action.upper()}: {json.dumps(details)}")
 
         lines.append("")
 
@@ -248,16 +380,28 @@ def format_entries_for_display(entries: list[dict], limit: int = 20) -> str:
     return "\n".join(lines)
 
 
-def clear_audit_log() -> bool:
+def clear_audit_log(*, truncate: bool = False) -> bool:
     """Clear the audit log file.
 
+    Args:
+        truncate: Empty the file in place instead of deleting it. Keeps the
+            cached append descriptor valid, so the next log_action doesn't
+            have to reopen the file.
+
     Returns:
         True if successful, False otherwise
     """
     try:
         log_path = get_audit_log_path()
-        if log_path.exists():
-            log_path.unlink()
+        with _log_lock:
+            if truncate:
+                # Same inode, so a cached descriptor stays valid
+                if log_path.exists():
+                    os.truncate(log_path, 0)
+                return True
+            _close_log_fd()
+            if log_path.exists():
+                log_path.unlink()
         return True
     except Exception as e:
         logger.warning(f"Failed to clear audit log: {e}")
@@ -1,6 +1,8 @@
 """Authentication and token management for Apple Music API."""
 
 import json
+import os
+import threading
 import time
 import webbrowser
 from http.server import HTTPServer, BaseHTTPRequestHandler
@@ -93,23 +95,66 @@ def generate_developer_token(expiry_days: int = 180) -> str:
         "team_id": config["team_id"],
         "key_id": config["key_id"],
     }
-    with open(token_file, "w") as f:
-        json.dump(token_data, f, indent=2)
+    _write_token_file(token_file, token_data)
 
     return token
 
 
+# Parsed token files, keyed by path and stamped with (mtime_ns, size).
+# get_headers() runs before every API request, so re-reading only when the
+# file changes saves an open + JSON parse per call. Tools call it from
+# concurrent worker threads, hence the lock.
+_token_file_cache: dict[Path, tuple[tuple[int, int], dict]] = {}
+_token_file_lock = threading.Lock()
+
+
+def _read_token_file(token_file: Path) -> Optional[dict]:
+    """Read a token JSON file, reusing the last parse while it's unchanged.
+
+    Returns:
+        Parsed file contents, or None if the file doesn't exist
+    """
+    with _token_file_lock:
+        try:
+            st = token_file.stat()
+        except FileNotFoundError:
+            _token_file_cache.pop(token_file, None)
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = _token_file_cache.get(token_file)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        with open(token_file) as f:
+            data = json.load(f)
+        _token_file_cache[token_file] = (stamp, data)
+        return data
+
+
+def _write_token_file(token_file: Path, data: dict) -> None:
+    """Write a token file via a temp file and rename.
+
+    Replacing the file instead of truncating it in place means a concurrent
+    reader never sees a half-written token, and any other links to the old
+    file keep their contents.
+    """
+    tmp_file = token_file.with_suffix(".json.tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(data, f, indent=2)
+    with _token_file_lock:
+        os.replace(tmp_file, token_file)
+        _token_file_cache.pop(token_file, None)
+
+
 def get_developer_token() -> str:
     """Get existing developer token or raise if not found/expired."""
     token_file = get_config_dir() / "developer_token.json"
-    if not token_file.exists():
+    data = _read_token_file(token_file)
+    if data is None:
         raise FileNotFoundError(
             "Developer token not found. Run: applemusic-mcp generate-token"
         )
 
-    with open(token_file) as f:
-        data = json.load(f)
-
     # Check if expired (with 1 day buffer)
     if data["expires"] < time.time() + 86400:
         raise ValueError(
@@ -122,14 +167,12 @@ def get_developer_token() -> str:
 def get_user_token() -> str:
     """Get the music user token or raise if not found."""
     token_file = get_config_dir() / "music_user_token.json"
-    if not token_file.exists():
+    data = _read_token_file(token_file)
+    if data is None:
         raise FileNotFoundError(
             "Music user token not found. Run: applemusic-mcp authorize"
         )
 
-    with open(token_file) as f:
-        data = json.load(f)
-
     return data["music_user_token"]
 
 
@@ -140,8 +183,7 @@ def save_user_token(token: str) -> None:
         "music_user_token": token,
         "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
     }
-    with open(token_file, "w") as f:
-        json.dump(data, f, indent=2)
+    _write_token_file(token_file, data)
 
 
 def create_auth_html(developer_token: str, port: int) -> str:
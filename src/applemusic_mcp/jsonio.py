@@ -0,0 +1,46 @@
+"""JSON encode/decode helpers for Apple Music MCP.
+
+Uses orjson when it's installed (``pip install mcp-applemusic[fast]``) and
+falls back to the stdlib ``json`` module otherwise. Both paths produce
+compact UTF-8 bytes and accept bytes or str on decode.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError (and ValueError),
+# and loads() turns the stdlib's UnicodeDecodeError on invalid UTF-8 into
+# one, so callers can catch this one name regardless of backend.
+JSONDecodeError = json.JSONDecodeError
+
+# json.dumps() with non-default arguments builds a new encoder on every call;
+# build the stdlib fallback's encoder once instead.
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _encoder.encode(obj).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Deserialize JSON from bytes or str.
+
+    Raises:
+        JSONDecodeError: data isn't valid JSON or isn't valid UTF-8
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    try:
+        return json.loads(data)
+    except UnicodeDecodeError as e:
+        # orjson reports bad UTF-8 as a decode error; match it
+        doc = data.decode("utf-8", "replace") if isinstance(data, bytes) else data
+        raise JSONDecodeError(f"Invalid UTF-8: {e.reason}", doc, e.start) from e
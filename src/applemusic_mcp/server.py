@@ -5,11 +5,13 @@ deleting tracks from playlists, and other operations not supported by the REST A
 """
 
 import csv
+import functools
 import io
 import json
 import os
 import re
 import sys
+import threading
 import time
 import unicodedata
 from dataclasses import dataclass
@@ -17,6 +19,7 @@ from enum import Enum
 from pathlib import Path
 from typing import Callable, Optional
 
+import anyio
 import requests
 from mcp.server.fastmcp import FastMCP
 
@@ -24,6 +27,7 @@ from .auth import get_developer_token, get_user_token, get_config_dir, get_user_
 from . import applescript as asc
 from .track_cache import get_track_cache, get_cache_dir
 from . import audit_log
+from . import jsonio
 
 # Check if AppleScript is available (macOS only)
 APPLESCRIPT_AVAILABLE = asc.is_available()
@@ -80,7 +84,7 @@ class FuzzyMatchResult:
     match_type: str  # "exact", "fuzzy", or "partial"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ResolvedPlaylist:
     """Result of resolving a playlist parameter.
 
@@ -184,6 +188,28 @@ def _normalize_for_match(s: str) -> str:
     return s
 
 
+# Compiled once for _normalized_variations, which runs per candidate name
+_LEADING_ARTICLES = [
+    (article, re.compile(rf"^\b{article}\s+")) for article in ("the", "an", "a")
+]
+_ABBREVIATIONS = [
+    (re.compile(r"\bfeat\.?\s"), "ft "),
+    (re.compile(r"\bfeaturing\s"), "ft "),
+    (re.compile(r"\bft\.?\s"), "ft "),
+    (re.compile(r"\bw/\s"), "with "),
+]
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]")
+_MULTI_SPACE_RE = re.compile(r"\s{2,}")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _strip_diacritics(text: str) -> str:
+    """Drop combining marks after NFD decomposition (café → cafe)."""
+    return "".join(
+        c for c in unicodedata.normalize("NFD", text) if not unicodedata.category(c).startswith("M")
+    )
+
+
 def _normalize_with_tracking(name: str) -> tuple[list[str], list[str]]:
     """Normalize a name for fuzzy matching and track transformations applied.
 
@@ -196,6 +222,17 @@ def _normalize_with_tracking(name: str) -> tuple[list[str], list[str]]:
     Returns:
         Tuple of (normalized_variations, transformations_applied)
     """
+    variations, transformations = _normalized_variations(name)
+    return list(variations), list(transformations)
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalized_variations(name: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Memoized core of _normalize_with_tracking, returning immutable tuples.
+
+    Fuzzy matching normalizes every candidate name for each query, and the
+    same library playlist/album names come up lookup after lookup.
+    """
     transformations = []
 
     # Step 1: Lowercase and strip
@@ -203,19 +240,14 @@ def _normalize_with_tracking(name: str) -> tuple[list[str], list[str]]:
 
     # Step 2: Remove diacritics (café → cafe)
     if any(unicodedata.category(c).startswith("M") for c in unicodedata.normalize("NFD", name)):
-        name = "".join(
-            c
-            for c in unicodedata.normalize("NFD", name)
-            if not unicodedata.category(c).startswith("M")
-        )
+        name = _strip_diacritics(name)
         transformations.append("removed diacritics")
 
     # Step 3: Strip leading articles (The Beatles → Beatles)
-    for article in [r"\bthe\s+", r"\ban\s+", r"\ba\s+"]:
-        if re.match(article, name):
-            name = re.sub(f"^{article}", "", name)
-            clean_article = article.replace(r"\b", "").replace(r"\s+", "").strip()
-            transformations.append(f"removed article '{clean_article}'")
+    for article, article_re in _LEADING_ARTICLES:
+        if article_re.match(name):
+            name = article_re.sub("", name, count=1)
+            transformations.append(f"removed article '{article}'")
             break
 
     # Step 4: Normalize "and" / "&"
@@ -229,16 +261,10 @@ def _normalize_with_tracking(name: str) -> tuple[list[str], list[str]]:
         variations = [name]
 
     # Step 5: Normalize music-specific abbreviations
-    abbrev_map = {
-        r"\bfeat\.?\s": "ft ",
-        r"\bfeaturing\s": "ft ",
-        r"\bft\.?\s": "ft ",
-        r"\bw/\s": "with ",
-    }
-    for pattern, replacement in abbrev_map.items():
-        if re.search(pattern, name):
-            name = re.sub(pattern, replacement, name)
-            transformations.append(f"normalized '{pattern}' to '{replacement.strip()}'")
+    for pattern, replacement in _ABBREVIATIONS:
+        if pattern.search(name):
+            name = pattern.sub(replacement, name)
+            transformations.append(f"normalized '{pattern.pattern}' to '{replacement.strip()}'")
 
     # Step 6: Normalize apostrophes and quotes
     if any(char in name for char in ["'", "'", "`", '"', '"', '"']):
@@ -252,14 +278,14 @@ def _normalize_with_tracking(name: str) -> tuple[list[str], list[str]]:
         transformations.append("hyphens → spaces")
 
     # Step 8: Remove emojis and special characters (keep only alphanumeric and spaces)
-    cleaned = re.sub(r"[^a-z0-9\s]", "", name)
+    cleaned = _NON_ALNUM_RE.sub("", name)
     if cleaned != name:
         transformations.append("removed special characters/emojis")
         name = cleaned
 
     # Step 9: Collapse multiple spaces
-    if re.search(r"\s{2,}", name):
-        name = re.sub(r"\s+", " ", name).strip()
+    if _MULTI_SPACE_RE.search(name):
+        name = _WHITESPACE_RE.sub(" ", name).strip()
         transformations.append("normalized whitespace")
 
     # Also generate variations for "and" / "&" substitution
@@ -267,23 +293,19 @@ def _normalize_with_tracking(name: str) -> tuple[list[str], list[str]]:
     for variant in variations:
         # Apply all transformations to each variant
         v = variant
-        v = "".join(
-            c
-            for c in unicodedata.normalize("NFD", v)
-            if not unicodedata.category(c).startswith("M")
-        )
-        for article in [r"\bthe\s+", r"\ban\s+", r"\ba\s+"]:
-            v = re.sub(f"^{article}", "", v)
-        for pattern, replacement in abbrev_map.items():
-            v = re.sub(pattern, replacement, v)
+        v = _strip_diacritics(v)
+        for _, article_re in _LEADING_ARTICLES:
+            v = article_re.sub("", v, count=1)
+        for pattern, replacement in _ABBREVIATIONS:
+            v = pattern.sub(replacement, v)
         v = v.replace("'", "").replace("'", "").replace("`", "")
         v = v.replace('"', "").replace('"', "").replace('"', "")
         v = v.replace("-", " ")
-        v = re.sub(r"[^a-z0-9\s]", "", v)
-        v = re.sub(r"\s+", " ", v).strip()
+        v = _NON_ALNUM_RE.sub("", v)
+        v = _WHITESPACE_RE.sub(" ", v).strip()
         all_variations.append(v)
 
-    return all_variations, transformations
+    return tuple(all_variations), tuple(transformations)
 
 
 def _fuzzy_match_entity(
@@ -313,29 +335,28 @@ def _fuzzy_match_entity(
 
     query_lower = query.lower()
 
-    # PASS 1: Exact match (fastest - no normalization)
-    for candidate in candidates:
-        candidate_name = name_extractor(candidate)
-        if query_lower == candidate_name.lower():
-            return candidate, None  # Exact match, no fuzzy result
-
-    # PASS 2: Partial match (fast - just substring check)
+    # PASS 1 + 2: Exact match, remembering the first partial match (query
+    # contained in name) seen on the way - one extract + lower per candidate.
+    # Names are kept so the fuzzy pass doesn't extract them again.
     partial_match = None
     partial_match_name = None
+    candidate_names = []
     for candidate in candidates:
         candidate_name = name_extractor(candidate)
-        if query_lower in candidate_name.lower():
+        candidate_names.append(candidate_name)
+        candidate_lower = candidate_name.lower()
+        if query_lower == candidate_lower:
+            return candidate, None  # Exact match, no fuzzy result
+        if partial_match is None and query_lower in candidate_lower:
             partial_match = candidate
             partial_match_name = candidate_name
-            break  # Take first partial match
 
     # PASS 3: Fuzzy match (slowest - only if no exact/partial)
     if partial_match is None:
         normalized_variations, transformations = _normalize_with_tracking(query)
 
-        for candidate in candidates:
-            candidate_name = name_extractor(candidate)
-            candidate_variations, _ = _normalize_with_tracking(candidate_name)
+        for candidate, candidate_name in zip(candidates, candidate_names):
+            candidate_variations, _ = _normalized_variations(candidate_name)
 
             for query_variant in normalized_variations:
                 for candidate_variant in candidate_variations:
@@ -544,23 +565,28 @@ def format_track_list(track_data: list[dict]) -> tuple[list[str], str]:
     if not track_data:
         return [], "Full"
 
-    def char_count(lines: list[str]) -> int:
-        return sum(len(line) for line in lines) + max(0, len(lines) - 1)
-
-    # Try full format first
-    full_output = [_format_full(t) for t in track_data]
-    if char_count(full_output) <= MAX_OUTPUT_CHARS:
-        return full_output, "Full"
-
-    # Try clipped (truncated but keeps all fields)
-    clipped_output = [_format_clipped(t) for t in track_data]
-    if char_count(clipped_output) <= MAX_OUTPUT_CHARS:
-        return clipped_output, "Clipped"
+    def fit(formatter: Callable[[dict], str]) -> list[str] | None:
+        # Stop formatting as soon as the tier overflows, rather than
+        # rendering every track in a tier that will be thrown away.
+        # Budget counts a newline after every line, including the last.
+        budget = MAX_OUTPUT_CHARS + 1
+        lines = []
+        for t in track_data:
+            line = formatter(t)
+            budget -= len(line) + 1
+            if budget < 0:
+                return None
+            lines.append(line)
+        return lines
 
-    # Fall back to compact (drops album/year/genre)
-    compact_output = [_format_compact(t) for t in track_data]
-    if char_count(compact_output) <= MAX_OUTPUT_CHARS:
-        return compact_output, "Compact"
+    for formatter, tier in (
+        (_format_full, "Full"),
+        (_format_clipped, "Clipped"),  # truncated but keeps all fields
+        (_format_compact, "Compact"),  # drops album/year/genre
+    ):
+        lines = fit(formatter)
+        if lines is not None:
+            return lines, tier
 
     # Fall back to minimal
     return [_format_minimal(t) for t in track_data], "Minimal"
@@ -735,6 +761,37 @@ BASE_URL = "https://api.music.apple.com/v1"
 DEFAULT_STOREFRONT = "us"
 REQUEST_TIMEOUT = 30  # seconds
 
+# One keep-alive connection pool for all Apple Music API calls, so paginated
+# fetches and multi-step tools reuse a TLS connection instead of opening a
+# new one per request. Auth headers stay per-request (tokens can change).
+# Tools run concurrently in worker threads; urllib3's pool is thread-safe and
+# no per-session state (cookies, auth, default headers) is changed after this.
+_session = requests.Session()
+
+# Library playlist list used for name -> API ID resolution. Resolving a
+# playlist by name pages through the whole list, and multi-step tools resolve
+# names repeatedly, so the list is reused briefly. Actions that create, copy,
+# rename or delete playlists drop it. Tools run in worker threads, so the
+# cache is guarded by a lock; the generation is bumped on every drop so a fetch
+# that was in flight at the time doesn't store its now-stale list.
+LIBRARY_PLAYLISTS_TTL = 60.0  # seconds
+_library_playlists_cache: tuple[float, str, list[dict]] | None = None
+_library_playlists_generation = 0
+_library_playlists_lock = threading.Lock()
+# Name lookups answered from the cached list above; valid only as long as it is
+_playlist_name_matches: dict[str, tuple[str | None, FuzzyMatchResult | None]] = {}
+
+# Catalog album matches by (storefront, name, artist). Adding an album and then
+# asking for its details searches the catalog for the same name twice; catalog
+# results change rarely, so a match is reused briefly. Misses aren't cached
+# (a failed search also reads as a miss).
+CATALOG_ALBUM_MATCH_TTL = 300.0  # seconds
+CATALOG_ALBUM_MATCH_MAX = 128  # entries; oldest dropped first
+_catalog_album_matches: dict[
+    tuple[str, str, str], tuple[float, dict, FuzzyMatchResult | None]
+] = {}
+_catalog_album_matches_lock = threading.Lock()
+
 # play_track retry constants for iCloud sync
 PLAY_TRACK_INITIAL_DELAY = 1.0  # seconds before first retry
 PLAY_TRACK_RETRY_DELAY = 0.2  # seconds between retries
@@ -756,6 +813,25 @@ def get_storefront() -> str:
 mcp = FastMCP("AppleMusicAPI")
 
 
+def blocking_tool() -> Callable[[Callable], Callable]:
+    """Register a blocking tool so FastMCP runs it in a worker thread.
+
+    Tools do synchronous HTTP and AppleScript I/O; registered as-is, FastMCP
+    would call them on the event loop and every other request would wait.
+    The module-level function stays synchronous for direct callers.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def run_in_thread(**kwargs):
+            return await anyio.to_thread.run_sync(functools.partial(fn, **kwargs))
+
+        mcp.tool()(run_in_thread)
+        return fn
+
+    return decorator
+
+
 # ============ MCP RESOURCES ============
 
 
@@ -813,6 +889,11 @@ def get_headers() -> dict:
     }
 
 
+def _response_json(response: requests.Response) -> dict:
+    """Decode an API response body (orjson when installed, else stdlib json)."""
+    return jsonio.loads(response.content)
+
+
 def _has_developer_token() -> bool:
     """Probe whether a usable developer token is configured.
 
@@ -946,6 +1027,71 @@ def _detect_id_type(id_str: str) -> str:
         return "unknown"
 
 
+def _invalidate_library_playlists() -> None:
+    """Drop the cached library playlist list."""
+    global _library_playlists_cache, _library_playlists_generation
+    with _library_playlists_lock:
+        _library_playlists_cache = None
+        _library_playlists_generation += 1
+        _playlist_name_matches.clear()
+
+
+def _invalidates_library_playlists(fn: Callable[..., str]) -> Callable[..., str]:
+    """Drop the cached playlist list once a playlist-changing action finishes."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _invalidate_library_playlists()
+
+    return wrapper
+
+
+def _fetch_library_playlists(headers: dict) -> list[dict]:
+    """Fetch every library playlist via the API, reusing a recent result.
+
+    A cached list is reused for LIBRARY_PLAYLISTS_TTL seconds as long as the
+    music user token is unchanged. A fetch cut short by a non-200 response
+    returns what it has but isn't cached, and neither is one that overlapped
+    a drop of the cache.
+    """
+    global _library_playlists_cache
+    token = headers.get("Music-User-Token", "")
+    now = time.monotonic()
+    with _library_playlists_lock:
+        cached = _library_playlists_cache
+        generation = _library_playlists_generation
+    if cached is not None and cached[1] == token and now - cached[0] < LIBRARY_PLAYLISTS_TTL:
+        return cached[2]
+
+    all_playlists = []
+    api_offset = 0
+    while True:
+        response = _session.get(
+            f"{BASE_URL}/me/library/playlists",
+            headers=headers,
+            params={"limit": 100, "offset": api_offset},
+            timeout=REQUEST_TIMEOUT,
+        )
+        if response.status_code != 200:
+            return all_playlists
+
+        playlists = _response_json(response).get("data", [])
+        all_playlists.extend(playlists)
+
+        if len(playlists) < 100:
+            break
+        api_offset += 100
+
+    with _library_playlists_lock:
+        if generation == _library_playlists_generation:
+            _library_playlists_cache = (now, token, all_playlists)
+            _playlist_name_matches.clear()
+    return all_playlists
+
+
 def _find_api_playlist_by_name(name: str) -> tuple[str | None, FuzzyMatchResult | None]:
     """Find API playlist ID by name with fuzzy matching.
 
@@ -963,39 +1109,28 @@ def _find_api_playlist_by_name(name: str) -> tuple[str | None, FuzzyMatchResult
         - fuzzy_match_result: Details about the match if fuzzy/partial, None if exact
     """
     try:
-        headers = get_headers()
-        api_offset = 0
-
         # Collect all playlists first (for multi-pass matching)
-        all_playlists = []
-        while True:
-            response = requests.get(
-                f"{BASE_URL}/me/library/playlists",
-                headers=headers,
-                params={"limit": 100, "offset": api_offset},
-                timeout=REQUEST_TIMEOUT,
-            )
-            if response.status_code != 200:
-                break
+        all_playlists = _fetch_library_playlists(get_headers())
 
-            playlists = response.json().get("data", [])
-            if not playlists:
-                break
-
-            all_playlists.extend(playlists)
-
-            if len(playlists) < 100:
-                break
-            api_offset += 100
+        # Same name against the same cached list -> same answer
+        with _library_playlists_lock:
+            cached = _library_playlists_cache
+            reusable = cached is not None and cached[2] is all_playlists
+            if reusable and name in _playlist_name_matches:
+                return _playlist_name_matches[name]
 
         # Use generic fuzzy matching
         def playlist_name_extractor(pl: dict) -> str:
             return pl.get("attributes", {}).get("name", "")
 
         matched, fuzzy_result = _fuzzy_match_entity(name, all_playlists, playlist_name_extractor)
-
-        if matched:
-            return matched.get("id"), fuzzy_result
+        found = (matched.get("id"), fuzzy_result) if matched else (None, None)
+        with _library_playlists_lock:
+            # Only while the list it was matched against is still the cached one
+            cached = _library_playlists_cache
+            if cached is not None and cached[2] is all_playlists:
+                _playlist_name_matches[name] = found
+        return found
 
     except Exception:
         pass  # Fall back to AppleScript
@@ -1385,7 +1520,7 @@ def _search_catalog_songs(query: str, limit: int = 5) -> list[dict]:
     """
     try:
         headers = get_headers()
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/catalog/{get_storefront()}/search",
             headers=headers,
             params={"term": query, "types": "songs", "limit": min(limit, 25)},
@@ -1399,6 +1534,21 @@ def _search_catalog_songs(query: str, limit: int = 5) -> list[dict]:
     return []
 
 
+def _catalog_song_matches(song_name: str, song_artist: str, track: str, artist: str = "") -> bool:
+    """Check whether a catalog search hit is a reasonable match for a track request.
+
+    Matches are case-insensitive substrings. The artist may appear in either
+    the song's artistName or its title, so "Uptown Funk (feat. Bruno Mars)"
+    matches a request for Bruno Mars.
+    """
+    if track.lower() not in song_name.lower():
+        return False
+    if not artist:
+        return True
+    artist = artist.lower()
+    return artist in song_artist.lower() or artist in song_name.lower()
+
+
 def _search_catalog_albums(query: str, limit: int = 5) -> list[dict]:
     """Search catalog for albums and return raw album data.
 
@@ -1412,7 +1562,7 @@ def _search_catalog_albums(query: str, limit: int = 5) -> list[dict]:
     """
     try:
         headers = get_headers()
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/catalog/{get_storefront()}/search",
             headers=headers,
             params={"term": query, "types": "albums", "limit": min(limit, 25)},
@@ -1436,6 +1586,9 @@ def _find_matching_catalog_album(
     2. Partial match (name in album_name), with artist filter
     3. Fuzzy match on name only (relaxes artist constraint)
 
+    A match is reused for CATALOG_ALBUM_MATCH_TTL seconds per storefront;
+    a miss is searched again next time.
+
     Args:
         name: Album name to search for
         artist: Artist name (optional, for filtering)
@@ -1445,11 +1598,32 @@ def _find_matching_catalog_album(
         - On success: (album dict, None, fuzzy_result or None)
         - On not found: (None, "Not found in catalog", None)
     """
+    key = (get_storefront(), name, artist)
+    now = time.monotonic()
+    with _catalog_album_matches_lock:
+        cached = _catalog_album_matches.get(key)
+    if cached is not None and now - cached[0] < CATALOG_ALBUM_MATCH_TTL:
+        return cached[1], None, cached[2]
+
+    matched, fuzzy_result = _match_catalog_album(name, artist)
+    if matched is None:
+        return None, "Not found in catalog", None
+
+    with _catalog_album_matches_lock:
+        _catalog_album_matches.pop(key, None)
+        if len(_catalog_album_matches) >= CATALOG_ALBUM_MATCH_MAX:
+            del _catalog_album_matches[next(iter(_catalog_album_matches))]
+        _catalog_album_matches[key] = (now, matched, fuzzy_result)
+    return matched, None, fuzzy_result
+
+
+def _match_catalog_album(name: str, artist: str) -> tuple[dict | None, FuzzyMatchResult | None]:
+    """Search the catalog and pick the album for _find_matching_catalog_album."""
     search_term = f"{name} {artist}".strip() if artist else name
     albums = _search_catalog_albums(search_term, limit=5)
 
     if not albums:
-        return None, "Not found in catalog", None
+        return None, None
 
     # Filter by artist first if provided
     def artist_matches(album: dict) -> bool:
@@ -1471,15 +1645,15 @@ def _find_matching_catalog_album(
     if artist_filtered:
         matched, fuzzy_result = _fuzzy_match_entity(name, artist_filtered, album_name_extractor)
         if matched:
-            return matched, None, fuzzy_result
+            return matched, fuzzy_result
 
     # If no match with artist filter, try all albums (relaxed matching)
     if artist and not matched:
         matched, fuzzy_result = _fuzzy_match_entity(name, albums, album_name_extractor)
         if matched:
-            return matched, None, fuzzy_result
+            return matched, fuzzy_result
 
-    return None, "Not found in catalog", None
+    return None, None
 
 
 def _search_library_songs(query: str, limit: int = 5) -> list[dict]:
@@ -1495,7 +1669,7 @@ def _search_library_songs(query: str, limit: int = 5) -> list[dict]:
     """
     try:
         headers = get_headers()
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/me/library/search",
             headers=headers,
             params={"term": query, "types": "library-songs", "limit": min(limit, 25)},
@@ -1603,7 +1777,7 @@ def _add_to_library_api(catalog_ids: list[str], content_type: str = "songs") ->
 
     try:
         headers = get_headers()
-        response = requests.post(
+        response = _session.post(
             f"{BASE_URL}/me/library",
             headers=headers,
             params={type_param: ",".join(catalog_ids)},
@@ -1882,7 +2056,7 @@ def _auto_search_and_add_to_playlist(
         headers = get_headers()
 
         # Search catalog
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/catalog/{get_storefront()}/search",
             headers=headers,
             params={"term": catalog_search, "types": "songs", "limit": 3},
@@ -1908,7 +2082,7 @@ def _auto_search_and_add_to_playlist(
         steps.append(f"Found in catalog: {found_name} - {found_artist}")
 
         # Add to library via API
-        add_response = requests.post(
+        add_response = _session.post(
             f"{BASE_URL}/me/library",
             headers=headers,
             params={"ids[songs]": catalog_id},
@@ -1919,7 +2093,7 @@ def _auto_search_and_add_to_playlist(
             return False, f"Failed to add to library (status {add_response.status_code})", steps
 
         # Get library ID from catalog song's library relationship
-        lib_response = requests.get(
+        lib_response = _session.get(
             f"{BASE_URL}/catalog/{get_storefront()}/songs/{catalog_id}/library",
             headers=headers,
             timeout=REQUEST_TIMEOUT,
@@ -2006,7 +2180,7 @@ def _auto_search_and_add_to_playlist(
         if not playlist_id:
             return False, f"Could not find playlist ID for '{playlist_name}'", steps
 
-        pl_add_response = requests.post(
+        pl_add_response = _session.post(
             f"{BASE_URL}/me/library/playlists/{playlist_id}/tracks",
             headers=headers,
             json={"data": [{"id": library_id, "type": "library-songs"}]},
@@ -2039,7 +2213,7 @@ def _rate_song_api(song_id: str, rating: str) -> tuple[bool, str]:
     try:
         headers = get_headers()
         body = {"type": "rating", "attributes": {"value": rating_value}}
-        response = requests.put(
+        response = _session.put(
             f"{BASE_URL}/me/ratings/songs/{song_id}",
             headers=headers,
             json=body,
@@ -2095,7 +2269,7 @@ def _playlist_list(
 
         # Paginate to get all playlists
         while True:
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/me/library/playlists",
                 headers=headers,
                 params={"limit": 100, "offset": offset},
@@ -2104,7 +2278,7 @@ def _playlist_list(
             if response.status_code == 404:
                 break
             response.raise_for_status()
-            playlists = response.json().get("data", [])
+            playlists = _response_json(response).get("data", [])
             if not playlists:
                 break
             all_playlists.extend(playlists)
@@ -2204,15 +2378,14 @@ def _playlist_tracks(
                 cache = get_track_cache()
 
                 # First pass: fill in what we know from cache (ID-based lookup only)
+                known = cache.get_explicit_many(t["id"] for t in track_data if t["id"])
                 unknown_tracks = []
                 for track in track_data:
-                    track_id = track.get("id", "")
-                    if track_id:
-                        cached_explicit = cache.get_explicit(track_id)
-                        if cached_explicit:
-                            track["explicit"] = cached_explicit
-                            query_stats["cache_hits"] += 1
-                            continue
+                    cached_explicit = known.get(track["id"])
+                    if cached_explicit:
+                        track["explicit"] = cached_explicit
+                        query_stats["cache_hits"] += 1
+                        continue
                     query_stats["cache_misses"] += 1
                     unknown_tracks.append(track)
 
@@ -2222,7 +2395,7 @@ def _playlist_tracks(
 
                     # Find the playlist in the API library by matching name
                     query_stats["api_calls"] += 1
-                    response = requests.get(
+                    response = _session.get(
                         f"{BASE_URL}/me/library/playlists",
                         headers=headers,
                         params={"limit": 100},
@@ -2250,7 +2423,7 @@ def _playlist_tracks(
 
                             while True:
                                 query_stats["api_calls"] += 1
-                                track_response = requests.get(
+                                track_response = _session.get(
                                     f"{BASE_URL}/me/library/playlists/{api_playlist_id}/tracks",
                                     headers=headers,
                                     params={"limit": 100, "offset": api_offset},
@@ -2259,7 +2432,7 @@ def _playlist_tracks(
                                 if track_response.status_code != 200:
                                     break
 
-                                tracks = track_response.json().get("data", [])
+                                tracks = _response_json(track_response).get("data", [])
                                 if not tracks:
                                     break
 
@@ -2311,6 +2484,7 @@ def _playlist_tracks(
                                 api_track_map_name[track_name] = api_data
 
                             # Match AppleScript tracks to API tracks and cache
+                            pending_cache = []
                             for track in track_data:
                                 if track["explicit"] != "Unknown":
                                     continue
@@ -2337,23 +2511,25 @@ def _playlist_tracks(
                                     track["explicit"] = api_data["explicit"]
 
                                     # Cache by all IDs for this track
-                                    cache.set_track_metadata(
-                                        explicit=api_data["explicit"],
-                                        persistent_id=persistent_id,
-                                        library_id=api_data["library_id"],
-                                        catalog_id=api_data["catalog_id"],
-                                        isrc=api_data["isrc"] or None,
-                                        name=track["name"],
-                                        artist=track["artist"],
-                                        album=track.get("album", ""),
+                                    pending_cache.append(
+                                        {
+                                            "explicit": api_data["explicit"],
+                                            "persistent_id": persistent_id,
+                                            "library_id": api_data["library_id"],
+                                            "catalog_id": api_data["catalog_id"],
+                                            "isrc": api_data["isrc"] or None,
+                                            "name": track["name"],
+                                            "artist": track["artist"],
+                                            "album": track.get("album", ""),
+                                        }
                                     )
                                 else:
                                     # Cache unmatched track as Unknown to avoid re-fetching
                                     if persistent_id:
-                                        cache.set_track_metadata(
-                                            explicit="Unknown",
-                                            persistent_id=persistent_id,
+                                        pending_cache.append(
+                                            {"explicit": "Unknown", "persistent_id": persistent_id}
                                         )
+                            cache.set_tracks_bulk(pending_cache)
 
             except Exception:
                 pass  # API not available - explicit stays "Unknown"
@@ -2413,18 +2589,19 @@ def _playlist_tracks(
         # Use playlist_track_count for total if available
         can_optimize = not filter and limit > 0
         if can_optimize:
-            # Fetch only offset+limit tracks. Capture meta.total from the
-            # first response so the header can show "1-200 of 436" rather
-            # than masking truncation when limit is set. The library-playlists
-            # endpoint omits trackCount, but the /tracks endpoint returns
-            # meta.total on every page — no extra API call needed.
+            # Fetch only the requested page, starting the API at offset.
+            # Capture meta.total from the first response so the header can
+            # show "1-200 of 436" rather than masking truncation when limit
+            # is set. The library-playlists endpoint omits trackCount, but
+            # the /tracks endpoint returns meta.total on every page — no
+            # extra API call needed.
             true_total = None
-            needed = offset + limit
-            api_offset = 0
+            needed = limit
+            api_offset = offset
             while len(all_tracks) < needed:
                 batch_limit = min(100, needed - len(all_tracks))
                 query_stats["api_calls"] += 1
-                response = requests.get(
+                response = _session.get(
                     f"{BASE_URL}/me/library/playlists/{resolved.api_id}/tracks",
                     headers=headers,
                     params={"limit": batch_limit, "offset": api_offset},
@@ -2433,7 +2610,7 @@ def _playlist_tracks(
                 if response.status_code == 404:
                     break
                 response.raise_for_status()
-                payload = response.json()
+                payload = _response_json(response)
                 if true_total is None:
                     meta_total = payload.get("meta", {}).get("total")
                     if isinstance(meta_total, int) and meta_total >= 0:
@@ -2447,16 +2624,15 @@ def _playlist_tracks(
                 api_offset += batch_limit
 
             if not all_tracks:
-                return "Playlist is empty"
-
-            track_data = [extract_track_data(t, full) for t in all_tracks]
+                if offset == 0:
+                    return "Playlist is empty"
+                if true_total is not None:
+                    return f"Offset {offset} exceeds playlist size of {true_total} tracks"
+                return f"Offset {offset} is past the end of the playlist"
 
-            # Apply pagination locally (skip offset, take limit)
-            if offset > 0:
-                track_data = track_data[offset:]
-            track_data = track_data[:limit]
+            track_data = [extract_track_data(t, full) for t in all_tracks[:limit]]
 
-            total_count = true_total if true_total is not None else len(all_tracks)
+            total_count = true_total if true_total is not None else offset + len(all_tracks)
 
             safe_id = resolved.api_id.replace(".", "_")
             result = format_output(
@@ -2478,7 +2654,7 @@ def _playlist_tracks(
         api_offset = 0
         while True:
             query_stats["api_calls"] += 1
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/me/library/playlists/{resolved.api_id}/tracks",
                 headers=headers,
                 params={"limit": 100, "offset": api_offset},
@@ -2487,7 +2663,7 @@ def _playlist_tracks(
             if response.status_code == 404:
                 break
             response.raise_for_status()
-            tracks = response.json().get("data", [])
+            tracks = _response_json(response).get("data", [])
             if not tracks:
                 break
             all_tracks.extend(tracks)
@@ -2618,7 +2794,7 @@ def _get_playlist_track_names(playlist_id: str) -> tuple[bool, list[dict] | str]
         offset = 0
 
         while True:
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/me/library/playlists/{playlist_id}/tracks",
                 headers=headers,
                 params={"limit": 100, "offset": offset},
@@ -2627,7 +2803,7 @@ def _get_playlist_track_names(playlist_id: str) -> tuple[bool, list[dict] | str]
             if response.status_code == 404:
                 break
             response.raise_for_status()
-            tracks = response.json().get("data", [])
+            tracks = _response_json(response).get("data", [])
             if not tracks:
                 break
             all_tracks.extend(tracks)
@@ -2664,6 +2840,7 @@ def _find_track_in_list(tracks: list[dict], track_name: str, artist: str = "") -
     return matches
 
 
+@_invalidates_library_playlists
 def _playlist_create(name: str, description: str = "") -> str:
     """Internal: Create playlist."""
     # Try AppleScript first (local, instant, no auth required)
@@ -2690,16 +2867,17 @@ def _playlist_create(name: str, description: str = "") -> str:
 
         body = {"attributes": {"name": name, "description": description}}
 
-        response = requests.post(
+        response = _session.post(
             f"{BASE_URL}/me/library/playlists",
             headers=headers,
             json=body,
             timeout=REQUEST_TIMEOUT,
         )
         response.raise_for_status()
-        data = response.json()
-
-        playlist_id = data.get("data", [{}])[0].get("id")
+        try:
+            playlist_id = _response_json(response)["data"][0]["id"]
+        except (KeyError, IndexError, ValueError):
+            playlist_id = None
         audit_log.log_action(
             "create_playlist",
             {"name": name, "playlist_id": playlist_id, "method": "api"},
@@ -2713,6 +2891,7 @@ def _playlist_create(name: str, description: str = "") -> str:
         return str(e)
 
 
+@_invalidates_library_playlists
 def _playlist_create_folder(path: str) -> str:
     """Internal: Create a folder or folder path. Supports slash-separated paths.
 
@@ -2737,15 +2916,17 @@ def _playlist_create_folder(path: str) -> str:
         return "Error: Nested folder paths require macOS. API only supports single-level folders."
     try:
         headers = get_headers()
-        response = requests.post(
+        response = _session.post(
             f"{BASE_URL}/me/library/playlist-folders",
             headers={**headers, "Content-Type": "application/json"},
             json={"attributes": {"name": path}},
             timeout=REQUEST_TIMEOUT,
         )
         if response.status_code in (200, 201):
-            data = response.json().get("data", [{}])
-            folder_id = data[0].get("id", "") if data else ""
+            try:
+                folder_id = _response_json(response)["data"][0]["id"]
+            except (KeyError, IndexError, ValueError):
+                folder_id = ""
             audit_log.log_action(
                 "create_folder",
                 {"path": path, "folder_id": folder_id, "method": "api"},
@@ -2780,6 +2961,7 @@ def _playlist_path(name: str) -> str:
     return f"Error: {result}"
 
 
+@_invalidates_library_playlists
 def _playlist_move(playlist_name: str, folder_name: str) -> str:
     """Internal: Move a playlist into a folder via AppleScript."""
     success, result = asc.move_to_folder(playlist_name, folder_name)
@@ -2792,6 +2974,7 @@ def _playlist_move(playlist_name: str, folder_name: str) -> str:
     return f"Error moving playlist: {result}"
 
 
+@_invalidates_library_playlists
 def _playlist_move_to_root(playlist_name: str) -> str:
     """Internal: Move a playlist out of its folder to the top level."""
     success, result = asc.move_to_root(playlist_name)
@@ -2804,6 +2987,7 @@ def _playlist_move_to_root(playlist_name: str) -> str:
     return f"Error: {result}"
 
 
+@_invalidates_library_playlists
 def _playlist_create_in_folder(name: str, folder: str, description: str = "") -> str:
     """Internal: Create a playlist inside a folder. Creates the folder if it doesn't exist."""
     # Ensure folder exists (ignore errors — folder may already exist)
@@ -2827,6 +3011,7 @@ def _playlist_create_in_folder(name: str, folder: str, description: str = "") ->
     return f"Created playlist '{name}' in folder '{folder}'"
 
 
+@_invalidates_library_playlists
 def _playlist_delete_folder(folder_name: str) -> str:
     """Internal: Delete a folder via AppleScript."""
     if not folder_name:
@@ -2841,6 +3026,7 @@ def _playlist_delete_folder(folder_name: str) -> str:
     return f"Error: {result}"
 
 
+@_invalidates_library_playlists
 def _playlist_rename_folder(folder_name: str, new_name: str) -> str:
     """Internal: Rename a folder via AppleScript."""
     if not folder_name:
@@ -2948,7 +3134,7 @@ def _playlist_add(
                 headers = get_headers()
                 if r.input_type == InputType.CATALOG_ID:
                     # Direct album ID - fetch tracks
-                    response = requests.get(
+                    response = _session.get(
                         f"{BASE_URL}/catalog/{get_storefront()}/albums/{r.value}/tracks",
                         headers=headers,
                         params={"limit": 100},
@@ -2962,7 +3148,7 @@ def _playlist_add(
                 elif r.input_type in (InputType.NAME, InputType.JSON_OBJECT):
                     # Search for album by name
                     query = f"{r.value} {r.artist}" if r.artist else r.value
-                    response = requests.get(
+                    response = _session.get(
                         f"{BASE_URL}/catalog/{get_storefront()}/search",
                         headers=headers,
                         params={"term": query, "types": "albums", "limit": 5},
@@ -2991,7 +3177,7 @@ def _playlist_add(
                             album_id = found_album.get("id")
                             album_name = found_album.get("attributes", {}).get("name", r.value)
                             # Fetch tracks
-                            track_response = requests.get(
+                            track_response = _session.get(
                                 f"{BASE_URL}/catalog/{get_storefront()}/albums/{album_id}/tracks",
                                 headers=headers,
                                 params={"limit": 100},
@@ -3139,7 +3325,7 @@ def _playlist_add(
                     # Add to library first
                     steps.append(f"Adding catalog ID {track_id} to library...")
                     params = {"ids[songs]": track_id}
-                    requests.post(
+                    _session.post(
                         f"{BASE_URL}/me/library",
                         headers=headers,
                         params=params,
@@ -3147,7 +3333,7 @@ def _playlist_add(
                     )
 
                     # Get catalog info
-                    response = requests.get(
+                    response = _session.get(
                         f"{BASE_URL}/catalog/{get_storefront()}/songs/{track_id}",
                         headers=headers,
                         timeout=REQUEST_TIMEOUT,
@@ -3163,7 +3349,7 @@ def _playlist_add(
                     artist_name = attrs.get("artistName", "")
                 else:
                     # Library ID - look up info
-                    response = requests.get(
+                    response = _session.get(
                         f"{BASE_URL}/me/library/songs/{track_id}",
                         headers=headers,
                         timeout=REQUEST_TIMEOUT,
@@ -3316,7 +3502,7 @@ def _playlist_add(
 
                 # Add to library
                 params = {"ids[songs]": track_id}
-                response = requests.post(
+                response = _session.post(
                     f"{BASE_URL}/me/library",
                     headers=headers,
                     params=params,
@@ -3326,7 +3512,7 @@ def _playlist_add(
                     steps.append(f"  Warning: library add returned {response.status_code}")
 
                 # Get catalog info for the track name
-                cat_response = requests.get(
+                cat_response = _session.get(
                     f"{BASE_URL}/catalog/{get_storefront()}/songs/{track_id}",
                     headers=headers,
                     timeout=REQUEST_TIMEOUT,
@@ -3344,7 +3530,7 @@ def _playlist_add(
                         for attempt in range(10):
                             if attempt > 0:
                                 time.sleep(0.1)
-                            lib_response = requests.get(
+                            lib_response = _session.get(
                                 f"{BASE_URL}/me/library/search",
                                 headers=headers,
                                 params={"term": name, "types": "library-songs", "limit": 25},
@@ -3391,7 +3577,7 @@ def _playlist_add(
                 filtered_ids = []
                 for lib_id in library_ids:
                     # Get track name for this library ID
-                    response = requests.get(
+                    response = _session.get(
                         f"{BASE_URL}/me/library/songs/{lib_id}",
                         headers=headers,
                         timeout=REQUEST_TIMEOUT,
@@ -3417,7 +3603,7 @@ def _playlist_add(
         track_data = [{"id": lid, "type": "library-songs"} for lid in library_ids]
         body = {"data": track_data}
 
-        response = requests.post(
+        response = _session.post(
             f"{BASE_URL}/me/library/playlists/{resolved.api_id}/tracks",
             headers=headers,
             json=body,
@@ -3459,6 +3645,7 @@ def _playlist_add(
         return f"Error: {str(e)}\n" + "\n".join(steps)
 
 
+@_invalidates_library_playlists
 def _playlist_copy(source: str = "", new_name: str = "") -> str:
     """Internal: Copy playlist."""
     # Validate inputs
@@ -3549,7 +3736,7 @@ def _playlist_copy(source: str = "", new_name: str = "") -> str:
         all_tracks = []
         offset = 0
         while True:
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/me/library/playlists/{resolved.api_id}/tracks",
                 headers=headers,
                 params={"limit": 100, "offset": offset},
@@ -3558,7 +3745,7 @@ def _playlist_copy(source: str = "", new_name: str = "") -> str:
             if response.status_code == 404:
                 break  # End of pagination or empty
             response.raise_for_status()
-            tracks = response.json().get("data", [])
+            tracks = _response_json(response).get("data", [])
             if not tracks:
                 break
             all_tracks.extend(tracks)
@@ -3568,21 +3755,21 @@ def _playlist_copy(source: str = "", new_name: str = "") -> str:
 
         # Create new playlist
         body = {"attributes": {"name": new_name}}
-        response = requests.post(
+        response = _session.post(
             f"{BASE_URL}/me/library/playlists",
             headers=headers,
             json=body,
             timeout=REQUEST_TIMEOUT,
         )
         response.raise_for_status()
-        new_id = response.json()["data"][0]["id"]
+        new_id = _response_json(response)["data"][0]["id"]
 
         # Add tracks in batches
         batch_size = 25
         for i in range(0, len(all_tracks), batch_size):
             batch = all_tracks[i : i + batch_size]
             track_data = [{"id": t["id"], "type": "library-songs"} for t in batch]
-            requests.post(
+            _session.post(
                 f"{BASE_URL}/me/library/playlists/{new_id}/tracks",
                 headers=headers,
                 json={"data": track_data},
@@ -3608,7 +3795,7 @@ def _playlist_copy(source: str = "", new_name: str = "") -> str:
         return str(e)
 
 
-@mcp.tool()
+@blocking_tool()
 def playlist(
     action: str = "list",
     name: str = "",
@@ -3722,7 +3909,7 @@ def playlist(
 # ============ LIBRARY MANAGEMENT ============
 
 
-@mcp.tool()
+@blocking_tool()
 def library(
     action: str = "search",
     query: str = "",
@@ -3807,24 +3994,23 @@ def _library_search(
     if clean_only is None:
         clean_only = prefs["clean_only"]
 
-    # Try AppleScript on macOS (faster for local searches)
+    # Try AppleScript on macOS (faster for local searches: Music.app's
+    # indexed `search` command, and it returns persistent IDs that the
+    # AppleScript playlist operations need). Read only about as many results
+    # as will be shown, with headroom for the duplicates dropped below;
+    # clean_only can drop many more, so it reads the max.
     asc_error: Optional[str] = None
     if APPLESCRIPT_AVAILABLE:
-        success, results = asc.search_library(query, types)
+        as_limit = 100 if clean_only else min(max(limit, 1) * 2, 100)
+        success, results = asc.search_library(query, types, limit=as_limit)
         if success and results:
             # Enrich with explicit status if requested
             if fetch_explicit or clean_only:
-                cache = get_track_cache()
+                known = get_track_cache().get_explicit_many(
+                    t["id"] for t in results if t.get("id")
+                )
                 for track in results:
-                    track_id = track.get("id", "")
-                    if track_id:
-                        cached_explicit = cache.get_explicit(track_id)
-                        if cached_explicit:
-                            track["explicit"] = cached_explicit
-                        else:
-                            track["explicit"] = "Unknown"
-                    else:
-                        track["explicit"] = "Unknown"
+                    track["explicit"] = known.get(track.get("id", ""), "Unknown")
 
             # Deduplicate by track ID (AppleScript can return duplicates)
             results = _deduplicate_by_id(results, keep_no_id=True)
@@ -3833,6 +4019,7 @@ def _library_search(
             if clean_only:
                 results = [t for t in results if t.get("explicit") != "Yes"]
 
+            results = results[: max(limit, 1)]
             return format_output(results, format, export, full, f"search_{query[:20]}")
         if not success:
             # Capture so the API-fallback error path can surface what really
@@ -3860,7 +4047,7 @@ def _library_search(
     # API fallback (or primary on non-macOS)
     try:
         headers = get_headers()
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/me/library/search",
             headers=headers,
             params={"term": query, "types": "library-songs", "limit": min(limit, 25)},
@@ -4158,7 +4345,7 @@ def _library_recently_played(
         # API limits to 10 per request, paginate up to max
         for offset in range(0, max_limit, 10):
             batch_limit = min(10, max_limit - offset)
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/me/recent/played/tracks",
                 headers=headers,
                 params={"limit": batch_limit, "offset": offset},
@@ -4166,7 +4353,7 @@ def _library_recently_played(
             )
             if response.status_code != 200:
                 break
-            tracks = response.json().get("data", [])
+            tracks = _response_json(response).get("data", [])
             if not tracks:
                 break
             all_tracks.extend(tracks)
@@ -4210,7 +4397,7 @@ def _catalog_search(
 
         # Handle music-videos with empty query (get featured/charts)
         if types == "music-videos" and not query:
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/catalog/{get_storefront()}/charts",
                 headers=headers,
                 params={"types": "music-videos", "limit": min(limit, 25)},
@@ -4222,7 +4409,7 @@ def _catalog_search(
             videos = charts[0].get("data", []) if charts else []
             results = {"music-videos": {"data": videos}}
         else:
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/catalog/{get_storefront()}/search",
                 headers=headers,
                 params={"term": query, "types": types, "limit": min(limit, 25)},
@@ -4379,7 +4566,7 @@ def _catalog_album_tracks(
         try:
             headers = get_headers()
             search_term = f"{r.value} {r.artist}".strip() if r.artist else r.value
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/catalog/{get_storefront()}/search",
                 headers=headers,
                 params={"term": search_term, "types": "albums", "limit": 5},
@@ -4416,7 +4603,7 @@ def _catalog_album_tracks(
         api_offset = 0
 
         while True:
-            response = requests.get(
+            response = _session.get(
                 base_url,
                 headers=headers,
                 params={"limit": 100, "offset": api_offset},
@@ -4425,7 +4612,7 @@ def _catalog_album_tracks(
             if response.status_code == 404:
                 break
             response.raise_for_status()
-            tracks = response.json().get("data", [])
+            tracks = _response_json(response).get("data", [])
             if not tracks:
                 break
             all_tracks.extend(tracks)
@@ -4500,7 +4687,7 @@ def _catalog_album_details(
 
         # Fetch album metadata
         album_url = f"{BASE_URL}/catalog/{get_storefront()}/albums/{album_id}"
-        album_response = requests.get(
+        album_response = _session.get(
             album_url,
             headers=headers,
             timeout=REQUEST_TIMEOUT,
@@ -4534,7 +4721,7 @@ def _catalog_album_details(
         api_offset = 0
 
         while True:
-            response = requests.get(
+            response = _session.get(
                 tracks_url,
                 headers=headers,
                 params={"limit": 100, "offset": api_offset},
@@ -4543,7 +4730,7 @@ def _catalog_album_details(
             if response.status_code == 404:
                 break
             response.raise_for_status()
-            tracks = response.json().get("data", [])
+            tracks = _response_json(response).get("data", [])
             if not tracks:
                 break
             all_tracks.extend(tracks)
@@ -4594,13 +4781,9 @@ def _build_library_track_data(
         for s in songs
     ]
     if fetch_explicit or clean_only:
-        cache = get_track_cache()
+        known = get_track_cache().get_explicit_many(t["id"] for t in data if t["id"])
         for track in data:
-            track_id = track.get("id", "")
-            if track_id:
-                cached_explicit = cache.get_explicit(track_id)
-                if cached_explicit:
-                    track["explicit"] = cached_explicit
+            track["explicit"] = known.get(track["id"], track["explicit"])
     if clean_only:
         data = [t for t in data if t.get("explicit") != "Yes"]
     return data
@@ -4687,7 +4870,7 @@ def _library_browse(
         while len(all_items) < max_to_fetch:
             batch_limit = 100 if fetch_all else min(100, int(max_to_fetch - len(all_items)))
             url = f"{BASE_URL}/me/{endpoint}" if "/" in endpoint else f"{BASE_URL}/me/library/songs"
-            response = requests.get(
+            response = _session.get(
                 url,
                 headers=headers,
                 params={"limit": batch_limit, "offset": api_offset},
@@ -4696,7 +4879,7 @@ def _library_browse(
             if response.status_code == 404:
                 break
             response.raise_for_status()
-            items = response.json().get("data", [])
+            items = _response_json(response).get("data", [])
             if not items:
                 break
             all_items.extend(items)
@@ -4772,7 +4955,7 @@ def _discover_recommendations(limit: int, format: str, export: str, full: bool)
     """Internal: Get personalized recommendations."""
     try:
         headers = get_headers()
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/me/recommendations",
             headers=headers,
             params={"limit": 10},
@@ -4817,7 +5000,7 @@ def _discover_heavy_rotation(format: str, export: str, full: bool) -> str:
     """Internal: Get heavy rotation."""
     try:
         headers = get_headers()
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/me/history/heavy-rotation",
             headers=headers,
             timeout=REQUEST_TIMEOUT,
@@ -4868,7 +5051,7 @@ def _library_recently_added(limit: int, format: str, export: str, full: bool) ->
 
         while len(all_items) < max_to_fetch:
             batch_limit = min(25, max_to_fetch - len(all_items))
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/me/library/recently-added",
                 headers=headers,
                 params={"limit": batch_limit, "offset": offset},
@@ -4921,7 +5104,7 @@ def _discover_personal_station() -> str:
     """Internal: Get personal station."""
     try:
         headers = get_headers()
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/catalog/{get_storefront()}/stations",
             headers=headers,
             params={"filter[identity]": "personal"},
@@ -4955,7 +5138,7 @@ def _discover_personal_station() -> str:
         return str(e)
 
 
-@mcp.tool()
+@blocking_tool()
 def discover(
     action: str = "recommendations",
     artist: str = "",
@@ -5011,7 +5194,7 @@ def _discover_top_songs(artist: str, storefront: str = "") -> str:
         if artist.isdigit():
             artist_id = artist
             # Look up artist name
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/catalog/{sf}/artists/{artist_id}",
                 headers=headers,
                 timeout=REQUEST_TIMEOUT,
@@ -5025,7 +5208,7 @@ def _discover_top_songs(artist: str, storefront: str = "") -> str:
                 artist_actual_name = artist
         else:
             # Search for artist by name
-            search_response = requests.get(
+            search_response = _session.get(
                 f"{BASE_URL}/catalog/{sf}/search",
                 headers=headers,
                 params={"term": artist, "types": "artists", "limit": 1},
@@ -5042,7 +5225,7 @@ def _discover_top_songs(artist: str, storefront: str = "") -> str:
             artist_actual_name = artist_data.get("attributes", {}).get("name", artist)
 
         # Get top songs
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/catalog/{sf}/artists/{artist_id}/view/top-songs",
             headers=headers,
             timeout=REQUEST_TIMEOUT,
@@ -5081,7 +5264,7 @@ def _discover_similar_artists(artist: str, storefront: str = "") -> str:
         if artist.isdigit():
             artist_id = artist
             # Look up artist name
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/catalog/{sf}/artists/{artist_id}",
                 headers=headers,
                 timeout=REQUEST_TIMEOUT,
@@ -5095,7 +5278,7 @@ def _discover_similar_artists(artist: str, storefront: str = "") -> str:
                 artist_actual_name = artist
         else:
             # Search for artist by name
-            search_response = requests.get(
+            search_response = _session.get(
                 f"{BASE_URL}/catalog/{sf}/search",
                 headers=headers,
                 params={"term": artist, "types": "artists", "limit": 1},
@@ -5112,7 +5295,7 @@ def _discover_similar_artists(artist: str, storefront: str = "") -> str:
             artist_actual_name = artist_data.get("attributes", {}).get("name", artist)
 
         # Get similar artists
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/catalog/{sf}/artists/{artist_id}/view/similar-artists",
             headers=headers,
             timeout=REQUEST_TIMEOUT,
@@ -5142,7 +5325,7 @@ def _discover_song_station(song_id: str, storefront: str = "") -> str:
         headers = get_headers()
         sf = storefront if storefront else get_storefront()
 
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/catalog/{sf}/songs/{song_id}/station",
             headers=headers,
             timeout=REQUEST_TIMEOUT,
@@ -5217,7 +5400,7 @@ def _library_rate(
             return "Error: Star ratings require macOS"
         try:
             headers = get_headers()
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/catalog/{get_storefront()}/songs/{catalog_id}",
                 headers=headers,
                 timeout=REQUEST_TIMEOUT,
@@ -5325,7 +5508,7 @@ def _catalog_song_details(song_id: str) -> str:
     """Internal: Get song details."""
     try:
         headers = get_headers()
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/catalog/{get_storefront()}/songs/{song_id}",
             headers=headers,
             timeout=REQUEST_TIMEOUT,
@@ -5370,7 +5553,7 @@ def _catalog_artist_details(artist: str) -> str:
         if artist.isdigit():
             artist_id = artist
             # Look up artist details directly
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/catalog/{get_storefront()}/artists/{artist_id}",
                 headers=headers,
                 timeout=REQUEST_TIMEOUT,
@@ -5384,7 +5567,7 @@ def _catalog_artist_details(artist: str) -> str:
             attrs = artist_data.get("attributes", {})
         else:
             # Search for the artist by name
-            search_response = requests.get(
+            search_response = _session.get(
                 f"{BASE_URL}/catalog/{get_storefront()}/search",
                 headers=headers,
                 params={"term": artist, "types": "artists", "limit": 1},
@@ -5408,7 +5591,7 @@ def _catalog_artist_details(artist: str) -> str:
         ]
 
         # Get artist's albums
-        albums_response = requests.get(
+        albums_response = _session.get(
             f"{BASE_URL}/catalog/{get_storefront()}/artists/{artist_id}/albums",
             headers=headers,
             params={"limit": 10},
@@ -5439,7 +5622,7 @@ def _discover_charts(chart_type: str = "songs", storefront: str = "") -> str:
     try:
         headers = get_headers()
         sf = storefront if storefront else get_storefront()
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/catalog/{sf}/charts",
             headers=headers,
             params={"types": chart_type, "limit": 20},
@@ -5477,7 +5660,7 @@ def _catalog_genres() -> str:
     """Internal: Get genres."""
     try:
         headers = get_headers()
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/catalog/{get_storefront()}/genres",
             headers=headers,
             params={"limit": 50},
@@ -5505,7 +5688,7 @@ def _catalog_suggestions(term: str) -> str:
     """Internal: Get search suggestions."""
     try:
         headers = get_headers()
-        response = requests.get(
+        response = _session.get(
             f"{BASE_URL}/catalog/{get_storefront()}/search/suggestions",
             headers=headers,
             params={"term": term, "kinds": "terms", "limit": 10},
@@ -5530,7 +5713,7 @@ def _catalog_suggestions(term: str) -> str:
         return str(e)
 
 
-@mcp.tool()
+@blocking_tool()
 def catalog(
     action: str = "search",
     query: str = "",
@@ -5601,7 +5784,7 @@ def catalog(
 # ============ SYSTEM MANAGEMENT ============
 
 
-@mcp.tool()
+@blocking_tool()
 def config(
     action: str = "info",
     days_old: int = 0,
@@ -5663,7 +5846,7 @@ def config(
         if action == "list-storefronts":
             try:
                 headers = get_headers()
-                response = requests.get(
+                response = _session.get(
                     f"{BASE_URL}/storefronts",
                     headers=headers,
                     timeout=REQUEST_TIMEOUT,
@@ -5741,9 +5924,9 @@ def config(
 
         # === CLEAR AUDIT LOG ===
         if action == "clear-audit-log":
-            entries = audit_log.get_recent_entries(limit=1000)
-            if audit_log.clear_audit_log():
-                return f"✓ Cleared audit log ({len(entries)} entries removed)"
+            entry_count = sum(1 for _ in audit_log.iter_entries())
+            if audit_log.clear_audit_log(truncate=True):
+                return f"✓ Cleared audit log ({entry_count} entries removed)"
             return "Error: Failed to clear audit log"
 
         # === INFO (DEFAULT) ===
@@ -5911,7 +6094,7 @@ def _config_auth_status() -> str:
     if dev_token_file.exists() and user_token_file.exists():
         try:
             headers = get_headers()
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/me/library/playlists",
                 headers=headers,
                 params={"limit": 1},
@@ -6214,7 +6397,7 @@ def _library_snapshot_delete(filename: str) -> str:
 
 if APPLESCRIPT_AVAILABLE:
 
-    @mcp.tool()
+    @blocking_tool()
     def playback(
         action: str = "now_playing",
         # play params
@@ -6278,7 +6461,7 @@ if APPLESCRIPT_AVAILABLE:
         try:
             headers = get_headers()
             sf = get_storefront()
-            response = requests.get(
+            response = _session.get(
                 f"{BASE_URL}/catalog/{sf}/songs/{song_id}",
                 headers=headers,
                 params={"include": "albums"},
@@ -6411,7 +6594,7 @@ if APPLESCRIPT_AVAILABLE:
             # Not in library - search catalog
             try:
                 headers = get_headers()
-                response = requests.get(
+                response = _session.get(
                     f"{BASE_URL}/catalog/{get_storefront()}/search",
                     headers=headers,
                     params={"term": f"{album} {artist}".strip(), "types": "albums", "limit": 5},
@@ -6512,7 +6695,7 @@ if APPLESCRIPT_AVAILABLE:
             catalog_id = r.value
             try:
                 headers = get_headers()
-                response = requests.get(
+                response = _session.get(
                     f"{BASE_URL}/catalog/{get_storefront()}/songs/{catalog_id}",
                     headers=headers,
                     timeout=REQUEST_TIMEOUT,
@@ -6601,15 +6784,7 @@ if APPLESCRIPT_AVAILABLE:
             song_name = attrs.get("name", "")
             song_artist = attrs.get("artistName", "")
 
-            # Check if it's a reasonable match
-            if track_name.lower() not in song_name.lower():
-                continue
-            # Check artist in artistName OR song name (for "feat. X" cases)
-            if (
-                track_artist
-                and track_artist.lower() not in song_artist.lower()
-                and track_artist.lower() not in song_name.lower()
-            ):
+            if not _catalog_song_matches(song_name, song_artist, track_name, track_artist):
                 continue
 
             catalog_id = song.get("id")
@@ -7030,6 +7205,7 @@ if APPLESCRIPT_AVAILABLE:
             results, errors, success_verb="removed from library", error_verb="failed to remove"
         )
 
+    @_invalidates_library_playlists
     def _playlist_delete(playlist_name: str) -> str:
         """Delete a playlist entirely (macOS). PERMANENT, cannot be undone."""
         # Get track count before deletion for audit log
@@ -7055,6 +7231,7 @@ if APPLESCRIPT_AVAILABLE:
             return result
         return f"Error: {result}"
 
+    @_invalidates_library_playlists
     def _playlist_rename(playlist_name: str, new_name: str) -> str:
         """Rename a playlist (macOS)."""
         if not playlist_name:
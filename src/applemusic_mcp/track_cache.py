@@ -9,14 +9,29 @@ Also maintains a name index for reverse lookups (name+artist → primary ID).
 All IDs for the same entity point to shared metadata for maximum hit rate.
 """
 
+import atexit
+import functools
 import json
 import logging
+import os
+import sys
 import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
+
+from . import jsonio
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
+COMPACT_MIN_BYTES = 1024 * 1024  # journal size before mid-session compaction
+UNKNOWN_TTL = 24 * 60 * 60  # seconds an "Unknown" explicit lookup is trusted
+
 
 def get_cache_dir() -> Path:
     """Get cache directory."""
@@ -25,6 +40,7 @@ def get_cache_dir() -> Path:
     return cache_dir
 
 
+@functools.lru_cache(maxsize=8192)
 def _normalize_name_key(name: str, artist: str = "") -> str:
     """Create a normalized key for name+artist lookup.
 
@@ -35,10 +51,80 @@ def _normalize_name_key(name: str, artist: str = "") -> str:
     Returns:
         Lowercase key like "abbey road|the beatles"
     """
-    parts = [name.lower().strip()]
-    if artist:
-        parts.append(artist.lower().strip())
-    return "|".join(parts)
+    if not artist:
+        return name.lower().strip()
+    return f"{name.lower().strip()}|{artist.lower().strip()}"
+
+
+def _empty_cache() -> dict:
+    return {"tracks": {}, "albums": {}, "name_index": {}}
+
+
+# Track fields whose values repeat heavily across a library ("Yes"/"No",
+# the same artist and album on every track of an album).
+_INTERNED_FIELDS = ("explicit", "artist", "album")
+
+
+def _intern_metadata(metadata: dict) -> dict:
+    """Intern repeated string fields of a track metadata dict in place."""
+    for field in _INTERNED_FIELDS:
+        value = metadata.get(field)
+        if isinstance(value, str):
+            metadata[field] = sys.intern(value)
+    return metadata
+
+
+def _share_track_entries(tracks: dict) -> None:
+    """Intern track fields and re-share identical metadata dicts after load.
+
+    In memory, every ID of a track points at one metadata dict; JSON
+    round-trips split them into one copy per ID. Collapsing equal entries
+    back to a single dict restores the sharing.
+    """
+    shared: dict[tuple, dict] = {}
+    for track_id, metadata in tracks.items():
+        if not isinstance(metadata, dict):
+            continue
+        try:
+            key = tuple(sorted(metadata.items()))
+            tracks[track_id] = shared.setdefault(key, _intern_metadata(metadata))
+        except TypeError:  # unhashable value from a hand-edited cache
+            continue
+
+
+def _is_stale_unknown(metadata: dict) -> bool:
+    """True for an "Unknown" tombstone older than UNKNOWN_TTL.
+
+    Entries cached before tombstones carried a timestamp count as stale.
+    """
+    if metadata.get("explicit") != "Unknown":
+        return False
+    return time.time() - metadata.get("ts", 0) >= UNKNOWN_TTL
+
+
+def _flock(f) -> None:
+    """Take an exclusive advisory lock on an open file (released on close)."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def _apply_record(data: dict, record: dict) -> None:
+    """Apply one journal record to a cache dict.
+
+    Records:
+        {"op": "set", "section": "tracks", "key": "ABC", "value": {...}}
+        {"op": "clear", "section": "tracks"}   (no section = clear everything)
+    """
+    op = record.get("op")
+    if op == "set":
+        data.setdefault(record["section"], {})[record["key"]] = record["value"]
+    elif op == "clear":
+        section = record.get("section")
+        if section:
+            data[section] = {}
+        else:
+            data.clear()
+            data.update(_empty_cache())
 
 
 class TrackCache:
@@ -50,20 +136,32 @@ class TrackCache:
     - name_index: name+artist → primary ID for reverse lookups
 
     Maintains backward compatibility with existing track_cache.json format.
+
+    Persistence is a snapshot (cache.json) plus an append-only journal
+    (cache.log). Each mutation appends one small record instead of
+    rewriting the whole cache; the journal is replayed on load and
+    compacted into the snapshot at startup, at exit, and when it grows
+    past twice the snapshot size.
     """
 
     def __init__(self):
         self.cache_file = get_cache_dir() / "cache.json"
         self._legacy_file = get_cache_dir() / "track_cache.json"
+        self._log_file = get_cache_dir() / "cache.log"
+        self._lock = threading.RLock()
+        self._snapshot_size = 0
+        self._log_size = 0
         self._cache = self._load()
+        if self._log_size:
+            self.flush()
 
-    def _load(self) -> dict:
-        """Load cache from disk, migrating from legacy format if needed."""
+    def _read_snapshot(self) -> dict:
+        """Read cache.json, migrating from legacy format if needed."""
         # Try new cache file first
         if self.cache_file.exists():
             try:
-                with open(self.cache_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                with open(self.cache_file, "rb") as f:
+                    data = jsonio.loads(f.read())
                     # Ensure required sections exist
                     if "tracks" not in data:
                         data["tracks"] = {}
@@ -91,15 +189,87 @@ class TrackCache:
             except Exception as e:
                 logger.warning(f"Failed to load legacy cache: {e}")
 
-        return {"tracks": {}, "albums": {}, "name_index": {}}
+        return _empty_cache()
+
+    def _replay_log(self, data: dict, log) -> int:
+        """Apply every journal record in an open log file to data.
+
+        Unparseable lines (e.g. a write torn by a crash) are skipped.
+
+        Returns:
+            Size of the journal in bytes
+        """
+        size = 0
+        for line in log:
+            size += len(line)
+            try:
+                _apply_record(data, jsonio.loads(line))
+            except (jsonio.JSONDecodeError, KeyError, TypeError, AttributeError):
+                continue
+        return size
 
-    def _save(self) -> None:
-        """Save cache to disk."""
+    def _load(self) -> dict:
+        """Load snapshot from disk and replay the journal on top of it."""
+        data = self._read_snapshot()
+        self._snapshot_size = self.cache_file.stat().st_size if self.cache_file.exists() else 0
         try:
-            with open(self.cache_file, "w", encoding="utf-8") as f:
-                json.dump(self._cache, f, indent=2)
+            with open(self._log_file, "rb") as log:
+                self._log_size = self._replay_log(data, log)
+        except FileNotFoundError:
+            self._log_size = 0
         except Exception as e:
-            logger.warning(f"Failed to save cache to {self.cache_file}: {e}")
+            logger.warning(f"Failed to replay cache journal {self._log_file}: {e}")
+        _share_track_entries(data["tracks"])
+        return data
+
+    def _append(self, records: list[dict]) -> None:
+        """Append mutation records to the journal (one write per call)."""
+        payload = b"".join(jsonio.dumps(r) + b"\n" for r in records)
+        with self._lock:
+            try:
+                with open(self._log_file, "ab") as log:
+                    _flock(log)
+                    log.write(payload)
+            except Exception as e:
+                logger.warning(f"Failed to append to cache journal {self._log_file}: {e}")
+                return
+            self._log_size += len(payload)
+            if self._log_size > max(COMPACT_MIN_BYTES, 2 * self._snapshot_size):
+                self.flush()
+
+    def flush(self) -> None:
+        """Compact the journal into cache.json.
+
+        Rebuilds the cache from the on-disk snapshot plus journal (so records
+        appended by other processes aren't lost), writes and fsyncs it to a
+        temp file, renames it over cache.json, then truncates the journal —
+        all while holding the journal lock.
+        """
+        with self._lock:
+            if not self._log_file.exists():
+                return
+            tmp_file = self.cache_file.with_suffix(".json.tmp")
+            try:
+                with open(self._log_file, "r+b") as log:
+                    _flock(log)
+                    data = self._read_snapshot()
+                    if not self._replay_log(data, log):
+                        return
+                    payload = jsonio.dumps(data)
+                    with open(tmp_file, "wb") as f:
+                        f.write(payload)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    # Snapshot must be durable before the journal that
+                    # backs it is dropped, or a power loss loses both.
+                    os.replace(tmp_file, self.cache_file)
+                    log.truncate(0)
+                _share_track_entries(data["tracks"])
+                self._cache = data
+                self._snapshot_size = len(payload)
+                self._log_size = 0
+            except Exception as e:
+                logger.warning(f"Failed to save cache to {self.cache_file}: {e}")
 
     # =========================================================================
     # Track methods (backward compatible)
@@ -112,12 +282,34 @@ class TrackCache:
             track_id: Persistent ID, Library ID, or Catalog ID
 
         Returns:
-            "Yes", "No", or None if not cached
+            "Yes", "No", "Unknown" (lookup failed within UNKNOWN_TTL),
+            or None if not cached or the failed lookup is due a retry
         """
-        tracks = self._cache.get("tracks", {})
-        if track_id in tracks:
-            return tracks[track_id].get("explicit")
-        return None
+        entry = self._cache["tracks"].get(track_id)
+        if entry is None or _is_stale_unknown(entry):
+            return None
+        return entry.get("explicit")
+
+    def get_explicit_many(self, track_ids: Iterable[str]) -> dict[str, str]:
+        """Get cached explicit status for many IDs in one call.
+
+        Args:
+            track_ids: Persistent, Library, or Catalog IDs
+
+        Returns:
+            Dict of track ID -> "Yes"/"No"/"Unknown" for the IDs that
+            get_explicit would answer; uncached IDs are left out
+        """
+        tracks = self._cache["tracks"]
+        found = {}
+        for track_id in track_ids:
+            entry = tracks.get(track_id)
+            if entry is None or _is_stale_unknown(entry):
+                continue
+            explicit = entry.get("explicit")
+            if explicit:
+                found[track_id] = explicit
+        return found
 
     def get_track_info(self, track_id: str) -> Optional[dict]:
         """Get cached track info (name, artist, album) by any ID type.
@@ -128,9 +320,8 @@ class TrackCache:
         Returns:
             Dict with name/artist/album if cached, None otherwise
         """
-        tracks = self._cache.get("tracks", {})
-        if track_id in tracks:
-            entry = tracks[track_id]
+        entry = self._cache["tracks"].get(track_id)
+        if entry is not None:
             if "name" in entry:
                 return {
                     "name": entry.get("name"),
@@ -164,40 +355,106 @@ class TrackCache:
             artist: Artist name for name index (optional)
             album: Album name for disambiguation (optional)
         """
-        tracks = self._cache.setdefault("tracks", {})
-
-        # Build metadata dict
-        metadata = {"explicit": explicit}
-        if isrc:
-            metadata["isrc"] = isrc
-        if name:
-            metadata["name"] = name
-        if artist:
-            metadata["artist"] = artist
-        if album:
-            metadata["album"] = album
-
-        # Cache by all provided IDs
-        ids_to_cache = [
-            id for id in [persistent_id, library_id, catalog_id]
-            if id
-        ]
+        self.set_tracks_bulk(
+            [
+                {
+                    "explicit": explicit,
+                    "persistent_id": persistent_id,
+                    "library_id": library_id,
+                    "catalog_id": catalog_id,
+                    "isrc": isrc,
+                    "name": name,
+                    "artist": artist,
+                    "album": album,
+                }
+            ]
+        )
 
-        primary_id = ids_to_cache[0] if ids_to_cache else None
+    def set_tracks_bulk(self, entries: Iterable[dict]) -> None:
+        """Cache metadata for many tracks with a single journal write.
 
-        for track_id in ids_to_cache:
-            if track_id not in tracks:
-                tracks[track_id] = metadata
+        Use when enumerating a playlist or library page instead of calling
+        set_track_metadata per track.
 
-        # Add to name index if name provided
-        if name and primary_id:
+        Args:
+            entries: Dicts of set_track_metadata keyword arguments
+                ("explicit" required, everything else optional)
+        """
+        with self._lock:
+            tracks = self._cache.setdefault("tracks", {})
             name_index = self._cache.setdefault("name_index", {})
-            key = _normalize_name_key(name, artist or "")
-            if key not in name_index:
-                name_index[key] = {"type": "track", "id": primary_id}
+            records = []
+
+            for entry in entries:
+                name = entry.get("name")
+                artist = entry.get("artist")
+
+                # Build metadata dict
+                metadata = {"explicit": entry["explicit"]}
+                if entry.get("isrc"):
+                    metadata["isrc"] = entry["isrc"]
+                if name:
+                    metadata["name"] = name
+                if artist:
+                    metadata["artist"] = artist
+                if entry.get("album"):
+                    metadata["album"] = entry["album"]
+                _intern_metadata(metadata)
+                unknown = metadata["explicit"] == "Unknown"
+                if unknown:
+                    metadata["ts"] = time.time()
+
+                # Cache by all provided IDs
+                ids_to_cache = [
+                    id
+                    for id in (
+                        entry.get("persistent_id"),
+                        entry.get("library_id"),
+                        entry.get("catalog_id"),
+                    )
+                    if id
+                ]
+
+                primary_id = ids_to_cache[0] if ids_to_cache else None
+
+                for track_id in ids_to_cache:
+                    existing = tracks.get(track_id)
+                    # Known values win; a tombstone is replaced by a real
+                    # answer, or refreshed once it has gone stale.
+                    if existing is None or (
+                        existing.get("explicit") == "Unknown"
+                        and (not unknown or _is_stale_unknown(existing))
+                    ):
+                        tracks[track_id] = metadata
+                        records.append(
+                            {"op": "set", "section": "tracks", "key": track_id, "value": metadata}
+                        )
+
+                # Add to name index if name provided
+                if name and primary_id:
+                    key = _normalize_name_key(name, artist or "")
+                    if key not in name_index:
+                        name_index[key] = {"type": "track", "id": primary_id}
+                        records.append(
+                            {
+                                "op": "set",
+                                "section": "name_index",
+                                "key": key,
+                                "value": name_index[key],
+                            }
+                        )
+
+            # Journal only what changed, in one write
+            if records:
+                self._append(records)
+
+    def mark_unknown(self, track_id: str) -> None:
+        """Cache a failed explicit lookup so callers skip it for UNKNOWN_TTL.
 
-        # Save to disk
-        self._save()
+        Args:
+            track_id: Persistent ID, Library ID, or Catalog ID
+        """
+        self.set_tracks_bulk([{"explicit": "Unknown", "persistent_id": track_id}])
 
     def get_track_by_name(self, name: str, artist: str = "") -> Optional[str]:
         """Look up track ID by name and optional artist.
@@ -209,9 +466,7 @@ class TrackCache:
         Returns:
             Primary ID if found, None otherwise
         """
-        name_index = self._cache.get("name_index", {})
-        key = _normalize_name_key(name, artist)
-        entry = name_index.get(key)
+        entry = self._cache["name_index"].get(_normalize_name_key(name, artist))
         if entry and entry.get("type") == "track":
             return entry.get("id")
         return None
@@ -229,8 +484,7 @@ class TrackCache:
         Returns:
             Album metadata dict or None if not cached
         """
-        albums = self._cache.get("albums", {})
-        return albums.get(album_id)
+        return self._cache["albums"].get(album_id)
 
     def set_album_metadata(
         self,
@@ -251,8 +505,6 @@ class TrackCache:
             track_count: Number of tracks (optional)
             year: Release year (optional)
         """
-        albums = self._cache.setdefault("albums", {})
-
         # Build metadata dict
         metadata = {}
         if name:
@@ -268,18 +520,28 @@ class TrackCache:
         ids_to_cache = [id for id in [library_id, catalog_id] if id]
         primary_id = ids_to_cache[0] if ids_to_cache else None
 
-        for album_id in ids_to_cache:
-            if album_id not in albums:
-                albums[album_id] = metadata
-
-        # Add to name index if name provided
-        if name and primary_id:
-            name_index = self._cache.setdefault("name_index", {})
-            key = _normalize_name_key(name, artist or "")
-            if key not in name_index:
-                name_index[key] = {"type": "album", "id": primary_id}
-
-        self._save()
+        with self._lock:
+            albums = self._cache.setdefault("albums", {})
+            records = []
+            for album_id in ids_to_cache:
+                if album_id not in albums:
+                    albums[album_id] = metadata
+                    records.append(
+                        {"op": "set", "section": "albums", "key": album_id, "value": metadata}
+                    )
+
+            # Add to name index if name provided
+            if name and primary_id:
+                name_index = self._cache.setdefault("name_index", {})
+                key = _normalize_name_key(name, artist or "")
+                if key not in name_index:
+                    name_index[key] = {"type": "album", "id": primary_id}
+                    records.append(
+                        {"op": "set", "section": "name_index", "key": key, "value": name_index[key]}
+                    )
+
+            if records:
+                self._append(records)
 
     def get_album_by_name(self, name: str, artist: str = "") -> Optional[str]:
         """Look up album ID by name and optional artist.
@@ -291,9 +553,7 @@ class TrackCache:
         Returns:
             Primary ID if found, None otherwise
         """
-        name_index = self._cache.get("name_index", {})
-        key = _normalize_name_key(name, artist)
-        entry = name_index.get(key)
+        entry = self._cache["name_index"].get(_normalize_name_key(name, artist))
         if entry and entry.get("type") == "album":
             return entry.get("id")
         return None
@@ -304,18 +564,22 @@ class TrackCache:
 
     def clear(self) -> None:
         """Clear entire cache (for testing/maintenance)."""
-        self._cache = {"tracks": {}, "albums": {}, "name_index": {}}
-        self._save()
+        with self._lock:
+            self._cache = _empty_cache()
+            self._append([{"op": "clear"}])
+            self.flush()
 
     def clear_tracks(self) -> None:
         """Clear only track cache."""
-        self._cache["tracks"] = {}
-        self._save()
+        with self._lock:
+            self._cache["tracks"] = {}
+            self._append([{"op": "clear", "section": "tracks"}])
 
     def clear_albums(self) -> None:
         """Clear only album cache."""
-        self._cache["albums"] = {}
-        self._save()
+        with self._lock:
+            self._cache["albums"] = {}
+            self._append([{"op": "clear", "section": "albums"}])
 
     def get_stats(self) -> dict:
         """Get cache statistics.
@@ -330,7 +594,8 @@ class TrackCache:
         }
 
 
-# Global cache instance with thread-safe initialization
+# Global cache instance with thread-safe initialization; two instances
+# would race on the journal.
 _track_cache: Optional[TrackCache] = None
 _track_cache_lock = threading.Lock()
 
@@ -343,4 +608,5 @@ def get_track_cache() -> TrackCache:
             # Double-check locking pattern
             if _track_cache is None:
                 _track_cache = TrackCache()
+                atexit.register(_track_cache.flush)
     return _track_cache
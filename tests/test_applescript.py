@@ -47,6 +47,45 @@ class TestAppleScriptAvailability:
         assert len(output) > 0  # Should have error message
 
 
+class TestPersistentHostParity:
+    """The persistent host should print results exactly like one-shot osascript."""
+
+    @pytest.fixture
+    def host(self):
+        host = asc._OsascriptHost()
+        yield host
+        host.close()
+
+    @pytest.mark.parametrize(
+        "script",
+        [
+            'return "hello"',
+            "return 2 + 2",
+            "return 1.5",
+            "return true",
+            'return {"a", "b", 3}',
+            "return missing value",
+            'return ""',
+            'error "boom" number -1728',
+            "this is not valid applescript",
+        ],
+        ids=[
+            "text",
+            "integer",
+            "real",
+            "boolean",
+            "flat_list",
+            "missing_value",
+            "empty",
+            "execution_error",
+            "syntax_error",
+        ],
+    )
+    def test_matches_oneshot(self, host, script):
+        """Should return the same (success, text) pair as a fresh osascript."""
+        assert host.run(script) == asc._run_applescript_oneshot(script)
+
+
 class TestPlaybackControl:
     """Test playback control functions."""
 
@@ -1,6 +1,5 @@
 """Tests for audit_log module."""
 
-import json
 import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
@@ -9,11 +8,15 @@ from unittest.mock import patch
 import pytest
 
 from applemusic_mcp import audit_log
+from applemusic_mcp.jsonio import dumps as _dumps
 
 
 # Note: conftest.py provides mock_audit_log_for_all_tests (autouse) which
 # patches get_audit_log_path for all tests. We use that path directly.
 
+# The unpatched function, for tests of the path resolution itself
+_real_get_audit_log_path = audit_log.get_audit_log_path
+
 
 class TestLogAction:
     """Tests for log_action function."""
@@ -26,8 +29,7 @@ class TestLogAction:
         )
 
         assert mock_audit_log_for_all_tests.exists()
-        with open(mock_audit_log_for_all_tests) as f:
-            entry = json.loads(f.readline())
+        [entry] = audit_log.iter_entries(mock_audit_log_for_all_tests)
 
         assert entry["action"] == "add_to_library"
         assert entry["details"]["tracks"] == ["Song - Artist"]
@@ -35,6 +37,18 @@ class TestLogAction:
         # Verify timestamp is valid ISO format
         datetime.fromisoformat(entry["timestamp"].replace("Z", "+00:00"))
 
+    def test_timestamp_matches_isoformat(self):
+        """Timestamps should match datetime.isoformat() for UTC with microseconds."""
+        ns = 1736942400_123456789  # 2025-01-15T12:00:00.123456789Z
+        with patch.object(audit_log.time, "time_ns", return_value=ns):
+            ts = audit_log._utc_timestamp()
+
+        expected = datetime.fromtimestamp(ns // 1000 / 1e6, timezone.utc).isoformat()
+        assert ts == expected == "2025-01-15T12:00:00.123456+00:00"
+
+        with patch.object(audit_log.time, "time_ns", return_value=ns + 2_000_000_000):
+            assert audit_log._utc_timestamp() == "2025-01-15T12:00:02.123456+00:00"
+
     def test_logs_action_with_undo_info(self, mock_audit_log_for_all_tests):
         """Should include undo_info when provided."""
         audit_log.log_action(
@@ -43,8 +57,7 @@ class TestLogAction:
             undo_info={"playlist_name": "My Playlist", "tracks": ["Song1", "Song2"]}
         )
 
-        with open(mock_audit_log_for_all_tests) as f:
-            entry = json.loads(f.readline())
+        [entry] = audit_log.iter_entries(mock_audit_log_for_all_tests)
 
         assert entry["undo_info"]["playlist_name"] == "My Playlist"
         assert len(entry["undo_info"]["tracks"]) == 2
@@ -55,13 +68,74 @@ class TestLogAction:
         audit_log.log_action("add_to_playlist", {"playlist": "Test", "tracks": ["B"]})
         audit_log.log_action("remove_from_playlist", {"playlist": "Test", "tracks": ["A"]})
 
-        with open(mock_audit_log_for_all_tests) as f:
-            lines = f.readlines()
+        entries = list(audit_log.iter_entries(mock_audit_log_for_all_tests))
+
+        assert len(entries) == 3
+        assert entries[0]["details"]["tracks"] == ["A"]
+        assert entries[1]["details"]["tracks"] == ["B"]
+        assert entries[2]["action"] == "remove_from_playlist"
+
+    def test_reuses_file_descriptor(self, mock_audit_log_for_all_tests):
+        """Consecutive writes should share one open descriptor."""
+        with patch.object(audit_log.os, "open", wraps=audit_log.os.open) as mock_open:
+            for i in range(3):
+                audit_log.log_action("add_to_playlist", {"index": i})
+
+        assert mock_open.call_count == 1
+        assert len(mock_audit_log_for_all_tests.read_bytes().splitlines()) == 3
+
+    def test_reopens_after_file_replaced(self, mock_audit_log_for_all_tests):
+        """Writes after the file is rotated or deleted should land in a new file."""
+        audit_log.log_action("first", {})
+        rotated = mock_audit_log_for_all_tests.with_suffix(".jsonl.1")
+        mock_audit_log_for_all_tests.rename(rotated)
+
+        audit_log.log_action("second", {})
+        assert [e["action"] for e in audit_log.get_recent_entries()] == ["second"]
+
+        mock_audit_log_for_all_tests.unlink()
+        audit_log.log_action("third", {})
+        assert [e["action"] for e in audit_log.get_recent_entries()] == ["third"]
+
+    def test_rotates_when_over_size_limit(self, mock_audit_log_for_all_tests, monkeypatch):
+        """A log past MAX_LOG_SIZE should move to .jsonl.1 before the next write."""
+        backup = mock_audit_log_for_all_tests.with_suffix(".jsonl.1")
+        backup.write_bytes(b"old backup\n")
+        for i in range(3):
+            audit_log.log_action("filler", {"pad": "x" * 40, "i": i})
+
+        monkeypatch.setattr(audit_log, "MAX_LOG_SIZE", 100)
+        audit_log.log_action("fresh", {})
 
-        assert len(lines) == 3
-        assert json.loads(lines[0])["details"]["tracks"] == ["A"]
-        assert json.loads(lines[1])["details"]["tracks"] == ["B"]
-        assert json.loads(lines[2])["action"] == "remove_from_playlist"
+        assert [e["action"] for e in audit_log.get_recent_entries()] == ["fresh"]
+        assert b"old backup" not in backup.read_bytes()
+        assert len(backup.read_bytes().splitlines()) == 3
+
+    def test_closes_descriptor_before_rotating(self, mock_audit_log_for_all_tests, monkeypatch):
+        """The cached descriptor must be closed first; Windows can't rename an open file."""
+        for i in range(3):
+            audit_log.log_action("filler", {"pad": "x" * 40, "i": i})
+        open_at_rotate = []
+        real_rotate = audit_log._rotate
+
+        def recording_rotate(log_path):
+            open_at_rotate.append(audit_log._log_fd is not None)
+            return real_rotate(log_path)
+
+        monkeypatch.setattr(audit_log, "_rotate", recording_rotate)
+        monkeypatch.setattr(audit_log, "MAX_LOG_SIZE", 100)
+        audit_log.log_action("fresh", {})
+
+        assert open_at_rotate == [False]
+        assert [e["action"] for e in audit_log.get_recent_entries()] == ["fresh"]
+
+    def test_writes_after_clear(self, mock_audit_log_for_all_tests):
+        """Clearing should drop the cached descriptor so new writes are kept."""
+        audit_log.log_action("before", {})
+        audit_log.clear_audit_log()
+        audit_log.log_action("after", {})
+
+        assert [e["action"] for e in audit_log.get_recent_entries()] == ["after"]
 
     def test_handles_write_error_gracefully(self):
         """Should not raise exception on write error."""
@@ -106,10 +180,10 @@ class TestGetRecentEntries:
 
     def test_skips_invalid_json_lines(self, mock_audit_log_for_all_tests):
         """Should skip lines that are not valid JSON."""
-        with open(mock_audit_log_for_all_tests, "w") as f:
-            f.write('{"action": "valid", "details": {}}\n')
-            f.write('not valid json\n')
-            f.write('{"action": "also_valid", "details": {}}\n')
+        with open(mock_audit_log_for_all_tests, "wb") as f:
+            f.write(b'{"action": "valid", "details": {}}\n')
+            f.write(b'not valid json\n')
+            f.write(b'{"action": "also_valid", "details": {}}\n')
 
         result = audit_log.get_recent_entries()
 
@@ -117,6 +191,77 @@ class TestGetRecentEntries:
         assert result[0]["action"] == "also_valid"
         assert result[1]["action"] == "valid"
 
+    def test_iter_entries_reads_oldest_first(self, mock_audit_log_for_all_tests):
+        """iter_entries should stream every valid entry in file order."""
+        with open(mock_audit_log_for_all_tests, "wb") as f:
+            f.write(b'{"action": "valid", "details": {}}\n')
+            f.write(b'not valid json\n')
+            f.write(b'{"action": "also_valid", "details": {}}\n')
+
+        assert [e["action"] for e in audit_log.iter_entries()] == ["valid", "also_valid"]
+
+    def test_iter_entries_missing_file(self, mock_audit_log_for_all_tests):
+        """iter_entries should yield nothing when the log doesn't exist."""
+        assert list(audit_log.iter_entries()) == []
+
+    def test_skips_invalid_utf8_lines(self, mock_audit_log_for_all_tests):
+        """A line with invalid UTF-8 should be skipped, not drop the whole log."""
+        with open(mock_audit_log_for_all_tests, "wb") as f:
+            f.write(b'{"action": "valid", "details": {}}\n')
+            f.write(b'{"action": "\xff\xfe", "details": {}}\n')
+            f.write(b'\n')
+            f.write(b'{"action": "also_valid", "details": {}}\n')
+
+        result = audit_log.get_recent_entries()
+
+        assert [e["action"] for e in result] == ["also_valid", "valid"]
+
+
+class TestTailRead:
+    """Tests for reading only the end of long logs."""
+
+    def _write_log(self, path, count):
+        with open(path, "wb") as f:
+            for i in range(count):
+                entry = {"action": f"action_{i}", "details": {"pad": "x" * (i % 7)}}
+                f.write(_dumps(entry) + b"\n")
+                if i % 5 == 0:
+                    f.write(b"not valid json\n")
+
+    @pytest.mark.parametrize("limit", [1, 3, 17, 60, 200])
+    def test_matches_full_read(self, mock_audit_log_for_all_tests, limit):
+        """Should return exactly the newest valid entries, skipping bad lines."""
+        self._write_log(mock_audit_log_for_all_tests, 60)
+
+        result = audit_log.get_recent_entries(limit=limit)
+
+        expected = [f"action_{i}" for i in range(59, max(-1, 59 - limit), -1)]
+        assert [e["action"] for e in result] == expected
+
+    def test_handles_missing_trailing_newline(self, mock_audit_log_for_all_tests):
+        """The last line should be read even without a trailing newline."""
+        with open(mock_audit_log_for_all_tests, "wb") as f:
+            f.write(b'{"action": "first"}\n{"action": "last"}')
+
+        result = audit_log.get_recent_entries(limit=5)
+
+        assert [e["action"] for e in result] == ["last", "first"]
+
+    def test_handles_empty_file(self, mock_audit_log_for_all_tests):
+        """An empty log should return no entries."""
+        mock_audit_log_for_all_tests.write_bytes(b"")
+        assert audit_log.get_recent_entries() == []
+
+    def test_only_parses_tail_of_long_log(self, mock_audit_log_for_all_tests):
+        """A small limit on a long log should only parse lines near the end."""
+        self._write_log(mock_audit_log_for_all_tests, 2000)
+
+        with patch.object(audit_log.jsonio, "loads", wraps=audit_log.jsonio.loads) as mock_loads:
+            result = audit_log.get_recent_entries(limit=2)
+
+        assert [e["action"] for e in result] == ["action_1999", "action_1998"]
+        assert mock_loads.call_count == 2
+
 
 class TestFormatEntriesForDisplay:
     """Tests for format_entries_for_display function."""
@@ -236,6 +381,18 @@ class TestClearAuditLog:
         assert result is True
         assert not mock_audit_log_for_all_tests.exists()
 
+    def test_truncate_keeps_file_and_descriptor(self, mock_audit_log_for_all_tests):
+        """truncate=True should empty the file without reopening it on the next write."""
+        audit_log.log_action("before", {})
+
+        assert audit_log.clear_audit_log(truncate=True) is True
+        assert mock_audit_log_for_all_tests.read_bytes() == b""
+
+        with patch.object(audit_log.os, "open", wraps=audit_log.os.open) as mock_open:
+            audit_log.log_action("after", {})
+        mock_open.assert_not_called()
+        assert [e["action"] for e in audit_log.get_recent_entries()] == ["after"]
+
     def test_returns_true_when_no_file(self, mock_audit_log_for_all_tests):
         """Should return True even when file doesn't exist."""
         assert not mock_audit_log_for_all_tests.exists()
@@ -260,24 +417,40 @@ class TestClearAuditLog:
 class TestGetAuditLogPath:
     """Tests for get_audit_log_path function."""
 
-    def test_returns_path_in_cache_dir(self):
+    @pytest.fixture
+    def home(self, tmp_path, monkeypatch):
+        """Run the real (unpatched, uncached) function against a temp home."""
+        home = tmp_path / "home"
+        home.mkdir()
+        monkeypatch.setattr(Path, "home", lambda: home)
+        monkeypatch.setattr(audit_log, "get_audit_log_path", _real_get_audit_log_path)
+        _real_get_audit_log_path.cache_clear()
+        yield home
+        audit_log._close_log_fd()
+        _real_get_audit_log_path.cache_clear()
+
+    def test_returns_path_in_cache_dir(self, home):
         """Should return path in ~/.cache/applemusic-mcp/."""
         result = audit_log.get_audit_log_path()
 
-        assert result.name == "audit_log.jsonl"
-        assert "applemusic-mcp" in str(result)
-        assert ".cache" in str(result)
+        assert result == home / ".cache" / "applemusic-mcp" / "audit_log.jsonl"
 
-    def test_creates_parent_directory(self, tmp_path):
+    def test_creates_parent_directory(self, home):
         """Should create parent directory if it doesn't exist."""
-        test_dir = tmp_path / "new_cache" / "applemusic-mcp"
-        expected_path = test_dir / "audit_log.jsonl"
+        assert not (home / ".cache").exists()
+
+        result = audit_log.get_audit_log_path()
+
+        assert result.parent.is_dir()
+
+    def test_resolves_once_and_recreates_removed_dir(self, home):
+        """The path is cached; a removed cache dir is recreated on the next write."""
+        log_path = audit_log.get_audit_log_path()
+        with patch.object(Path, "mkdir") as mock_mkdir:
+            assert audit_log.get_audit_log_path() == log_path
+        mock_mkdir.assert_not_called()
 
-        with patch.object(Path, "home", return_value=tmp_path):
-            with patch.object(audit_log, "get_audit_log_path", wraps=audit_log.get_audit_log_path):
-                # Manually construct what the function does
-                log_dir = tmp_path / ".cache" / "applemusic-mcp"
-                log_dir.mkdir(parents=True, exist_ok=True)
-                result = log_dir / "audit_log.jsonl"
+        log_path.parent.rmdir()
+        audit_log.log_action("after_rmdir", {})
 
-        assert result.parent.exists()
+        assert [e["action"] for e in audit_log.get_recent_entries()] == ["after_rmdir"]
@@ -3,12 +3,15 @@
 import json
 import time
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 import pytest
 
 from applemusic_mcp import auth
 
+# Token expiries are offsets of hours or days, so one clock read per run is enough
+NOW = time.time()
+
 
 class TestGetConfigDir:
     """Tests for get_config_dir function."""
@@ -39,8 +42,7 @@ class TestLoadConfig:
     def test_loads_valid_config(self, mock_config_dir, sample_config):
         """Should load valid config file."""
         config_file = mock_config_dir / "config.json"
-        with open(config_file, "w") as f:
-            json.dump(sample_config, f)
+        config_file.write_text(json.dumps(sample_config))
 
         result = auth.load_config()
 
@@ -54,9 +56,7 @@ class TestLoadConfig:
 
     def test_raises_on_invalid_json(self, mock_config_dir):
         """Should raise error on invalid JSON."""
-        config_file = mock_config_dir / "config.json"
-        with open(config_file, "w") as f:
-            f.write("not valid json {{{")
+        (mock_config_dir / "config.json").write_text("not valid json {{{")
 
         with pytest.raises(json.JSONDecodeError):
             auth.load_config()
@@ -88,15 +88,14 @@ class TestGetPrivateKeyPath:
 class TestGetDeveloperToken:
     """Tests for get_developer_token function."""
 
-    def test_returns_valid_token(self, mock_config_dir, mock_developer_token):
+    def test_returns_valid_token(self, token_paths, mock_developer_token):
         """Should return token when valid and not expired."""
-        token_file = mock_config_dir / "developer_token.json"
+        token_file = token_paths.dev_token_path
         token_data = {
             "token": mock_developer_token,
-            "expires": time.time() + 86400 * 30,  # 30 days from now
+            "expires": NOW + 86400 * 30,  # 30 days from now
         }
-        with open(token_file, "w") as f:
-            json.dump(token_data, f)
+        token_file.write_text(json.dumps(token_data))
 
         result = auth.get_developer_token()
 
@@ -109,30 +108,28 @@ class TestGetDeveloperToken:
 
         assert "Developer token not found" in str(exc_info.value)
 
-    def test_raises_when_token_expired(self, mock_config_dir, mock_developer_token):
+    def test_raises_when_token_expired(self, token_paths, mock_developer_token):
         """Should raise ValueError when token is expired."""
-        token_file = mock_config_dir / "developer_token.json"
+        token_file = token_paths.dev_token_path
         token_data = {
             "token": mock_developer_token,
-            "expires": time.time() - 86400,  # Expired yesterday
+            "expires": NOW - 86400,  # Expired yesterday
         }
-        with open(token_file, "w") as f:
-            json.dump(token_data, f)
+        token_file.write_text(json.dumps(token_data))
 
         with pytest.raises(ValueError) as exc_info:
             auth.get_developer_token()
 
         assert "expired" in str(exc_info.value).lower()
 
-    def test_raises_when_token_expiring_soon(self, mock_config_dir, mock_developer_token):
+    def test_raises_when_token_expiring_soon(self, token_paths, mock_developer_token):
         """Should raise ValueError when token expires within 1 day."""
-        token_file = mock_config_dir / "developer_token.json"
+        token_file = token_paths.dev_token_path
         token_data = {
             "token": mock_developer_token,
-            "expires": time.time() + 3600,  # 1 hour from now
+            "expires": NOW + 3600,  # 1 hour from now
         }
-        with open(token_file, "w") as f:
-            json.dump(token_data, f)
+        token_file.write_text(json.dumps(token_data))
 
         with pytest.raises(ValueError) as exc_info:
             auth.get_developer_token()
@@ -143,12 +140,11 @@ class TestGetDeveloperToken:
 class TestGetUserToken:
     """Tests for get_user_token function."""
 
-    def test_returns_valid_token(self, mock_config_dir, mock_user_token):
+    def test_returns_valid_token(self, token_paths, mock_user_token):
         """Should return user token when present."""
-        token_file = mock_config_dir / "music_user_token.json"
+        token_file = token_paths.user_token_path
         token_data = {"music_user_token": mock_user_token}
-        with open(token_file, "w") as f:
-            json.dump(token_data, f)
+        token_file.write_text(json.dumps(token_data))
 
         result = auth.get_user_token()
 
@@ -162,14 +158,54 @@ class TestGetUserToken:
         assert "Music user token not found" in str(exc_info.value)
 
 
+class TestTokenFileCache:
+    """Tests for re-reading token files only when they change."""
+
+    def test_reuses_parse_while_unchanged(self, mock_config_dir, mock_user_token):
+        """Repeated lookups should not re-parse an unchanged file."""
+        auth.save_user_token(mock_user_token)
+
+        with patch("applemusic_mcp.auth.json.load", wraps=json.load) as mock_load:
+            for _ in range(5):
+                assert auth.get_user_token() == mock_user_token
+
+        assert mock_load.call_count == 1
+
+    def test_save_invalidates_cache(self, mock_config_dir):
+        """A newly saved token should be returned immediately."""
+        auth.save_user_token("first")
+        assert auth.get_user_token() == "first"
+
+        auth.save_user_token("second")
+        assert auth.get_user_token() == "second"
+
+    def test_external_rewrite_is_picked_up(self, token_paths, mock_user_token):
+        """A file rewritten by another process (different size) should be re-read."""
+        token_file = token_paths.user_token_path
+        token_file.write_text(json.dumps({"music_user_token": "old"}))
+        assert auth.get_user_token() == "old"
+
+        token_file.write_text(json.dumps({"music_user_token": mock_user_token}))
+        assert auth.get_user_token() == mock_user_token
+
+    def test_deleted_file_raises(self, token_paths, mock_user_token):
+        """Removing the token file should not serve the stale cached token."""
+        auth.save_user_token(mock_user_token)
+        assert auth.get_user_token() == mock_user_token
+
+        token_paths.user_token_path.unlink()
+        with pytest.raises(FileNotFoundError):
+            auth.get_user_token()
+
+
 class TestSaveUserToken:
     """Tests for save_user_token function."""
 
-    def test_saves_token_to_file(self, mock_config_dir, mock_user_token):
+    def test_saves_token_to_file(self, token_paths, mock_user_token):
         """Should save token to JSON file."""
         auth.save_user_token(mock_user_token)
 
-        token_file = mock_config_dir / "music_user_token.json"
+        token_file = token_paths.user_token_path
         assert token_file.exists()
 
         with open(token_file) as f:
@@ -178,6 +214,18 @@ class TestSaveUserToken:
         assert data["music_user_token"] == mock_user_token
         assert "created" in data
 
+    def test_replaces_file_instead_of_rewriting(self, token_paths, tmp_path):
+        """Saving should swap in a new file, leaving other links to the old one intact."""
+        auth.save_user_token("first")
+        link = tmp_path / "linked_token.json"
+        link.hardlink_to(token_paths.user_token_path)
+
+        auth.save_user_token("second")
+
+        assert json.loads(link.read_text())["music_user_token"] == "first"
+        assert auth.get_user_token() == "second"
+        assert not token_paths.user_token_path.with_suffix(".json.tmp").exists()
+
 
 class TestCreateAuthHtml:
     """Tests for create_auth_html function."""
@@ -216,8 +264,7 @@ class TestGetUserPreferences:
     def test_returns_defaults_when_no_preferences_section(self, mock_config_dir, sample_config):
         """Should return defaults when preferences section missing."""
         config_file = mock_config_dir / "config.json"
-        with open(config_file, "w") as f:
-            json.dump(sample_config, f)
+        config_file.write_text(json.dumps(sample_config))
 
         prefs = auth.get_user_preferences()
 
@@ -234,8 +281,7 @@ class TestGetUserPreferences:
             "clean_only": False,
         }
         config_file = mock_config_dir / "config.json"
-        with open(config_file, "w") as f:
-            json.dump(config, f)
+        config_file.write_text(json.dumps(config))
 
         prefs = auth.get_user_preferences()
 
@@ -252,8 +298,7 @@ class TestGetUserPreferences:
             # clean_only not set
         }
         config_file = mock_config_dir / "config.json"
-        with open(config_file, "w") as f:
-            json.dump(config, f)
+        config_file.write_text(json.dumps(config))
 
         prefs = auth.get_user_preferences()
 
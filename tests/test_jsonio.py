@@ -0,0 +1,48 @@
+"""Tests for jsonio module.
+
+Both backends must behave the same: the stdlib fallback is what users get
+without the optional ``fast`` extra.
+"""
+
+import pytest
+
+from applemusic_mcp import jsonio
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run the test against orjson (when installed) and the stdlib fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(jsonio, "orjson", None)
+    elif jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+class TestRoundTrip:
+    """Tests for dumps/loads."""
+
+    def test_dumps_is_compact_utf8_bytes(self, backend):
+        """Should produce compact bytes with non-ASCII kept as UTF-8."""
+        assert jsonio.dumps({"name": "Beyoncé", "ids": [1, 2]}) == (
+            '{"name":"Beyoncé","ids":[1,2]}'.encode()
+        )
+
+    def test_loads_accepts_bytes_and_str(self, backend):
+        """Should decode both bytes and str."""
+        assert jsonio.loads(b'{"a": 1}') == {"a": 1}
+        assert jsonio.loads('{"a": 1}') == {"a": 1}
+
+
+class TestDecodeErrors:
+    """Tests that bad input raises jsonio.JSONDecodeError on either backend."""
+
+    @pytest.mark.parametrize(
+        "data",
+        [b'{"op": "set", "sect', b'{"key": "\xff\xfe"}', "not json"],
+        ids=["truncated", "invalid_utf8", "garbage_str"],
+    )
+    def test_raises_json_decode_error(self, backend, data):
+        """Should raise the one documented exception type."""
+        with pytest.raises(jsonio.JSONDecodeError):
+            jsonio.loads(data)
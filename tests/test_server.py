@@ -1,174 +1,234 @@
 """Tests for server module."""
 
 import json
+import statistics
+import sys
 import time
-from unittest.mock import patch, MagicMock
+from collections import Counter
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 import pytest
-import sys
 import responses
 
 from applemusic_mcp import server
 
+# Same clock reading the token files in conftest are stamped with
+from .conftest import NOW
+
+API_BASE = "https://api.music.apple.com/v1"
+LIBRARY_URL = f"{API_BASE}/me/library"
+LIB_PLAYLISTS_URL = f"{API_BASE}/me/library/playlists"
+LIB_SONGS_URL = f"{API_BASE}/me/library/songs"
+RECOMMENDATIONS_URL = f"{API_BASE}/me/recommendations"
+CATALOG_SEARCH_URL = f"{API_BASE}/catalog/us/search"
+
+LIB_PLAYLISTS_OK_BODY = {
+    "data": [
+        {"id": "p.abc123", "attributes": {"name": "Test Playlist", "canEdit": True}},
+        {"id": "p.def456", "attributes": {"name": "Read Only", "canEdit": False}},
+    ]
+}
+LIB_PLAYLISTS_ERR_BODY = {"error": "Unauthorized"}
+
+# Library songs as the API and AppleScript report them; tests take slices
+_LIBRARY_API_SONGS = tuple(
+    {
+        "id": f"i.lib{i}",
+        "attributes": {
+            "name": f"Track {i}",
+            "artistName": "Artist",
+            "albumName": "Album",
+            "contentRating": "clean",
+        },
+    }
+    for i in range(150)
+)
+_LIBRARY_AS_SONGS = tuple(
+    {"name": f"Track {i}", "artist": "Artist", "album": "Album", "id": f"PID{i}"}
+    for i in range(150)
+)
 
-class TestGetTokenExpirationWarning:
-    """Tests for get_token_expiration_warning function."""
+# Served on every call of a callback-mocked endpoint, so encode it once
+_FIVE_TRACK_BODY = json.dumps({"data": _LIBRARY_API_SONGS[:5]}).encode()
+
+# 50 library playlists (realistic library size) with a fuzzy-match target,
+# "Rock & Roll", in the middle
+_FIFTY_PLAYLISTS = [
+    {"id": f"p.test{i}", "attributes": {"name": f"Playlist {i}"}} for i in range(25)
+]
+_FIFTY_PLAYLISTS.append({"id": "p.target", "attributes": {"name": "Rock & Roll"}})
+_FIFTY_PLAYLISTS.extend(
+    {"id": f"p.test{i}", "attributes": {"name": f"Playlist {i}"}} for i in range(25, 50)
+)
+_FIFTY_PLAYLISTS_BODY = json.dumps({"data": _FIFTY_PLAYLISTS}).encode()
 
-    def test_returns_none_when_no_token_file(self, mock_config_dir):
-        """Should return None when token file doesn't exist."""
-        result = server.get_token_expiration_warning()
-        assert result is None
 
-    def test_returns_none_when_token_valid(self, mock_config_dir):
-        """Should return None when token has more than 30 days left."""
-        token_file = mock_config_dir / "developer_token.json"
-        token_data = {"expires": time.time() + 86400 * 60}  # 60 days
-        with open(token_file, "w") as f:
-            json.dump(token_data, f)
+def _recommendations_body(n_items: int) -> bytes:
+    """Encoded 'For You' recommendations response holding n_items songs."""
+    songs = [
+        {
+            "id": f"rec{i}",
+            "type": "songs",
+            "attributes": {
+                "name": f"Song {i}",
+                "artistName": "Artist",
+                "releaseDate": "2024-01-01",
+            },
+        }
+        for i in range(1, n_items + 1)
+    ]
+    group = {
+        "attributes": {"title": {"stringForDisplay": "For You"}},
+        "relationships": {"contents": {"data": songs}},
+    }
+    return json.dumps({"data": [group]}).encode()
 
-        result = server.get_token_expiration_warning()
-        assert result is None
 
-    def test_returns_warning_when_expiring_soon(self, mock_config_dir):
-        """Should return warning when token expires within 30 days."""
-        token_file = mock_config_dir / "developer_token.json"
-        token_data = {"expires": time.time() + 86400 * 15}  # 15 days
-        with open(token_file, "w") as f:
-            json.dump(token_data, f)
+_RECOMMENDATIONS_50_BODY = _recommendations_body(50)
+_RECOMMENDATIONS_20_BODY = _recommendations_body(20)
 
-        result = server.get_token_expiration_warning()
-        assert result is not None
-        assert "days" in result  # Could be 14 or 15 depending on timing
-        assert "generate-token" in result
 
+# What asc.get_playlist_tracks reports for a five-track playlist. _playlist_tracks
+# copies each entry into its own dict, so the tuple can be shared across calls.
+_FIVE_AS_TRACKS = _LIBRARY_AS_SONGS[:5]
 
-class TestGetHeaders:
-    """Tests for get_headers function."""
 
-    def test_returns_headers_with_tokens(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
-        """Should return properly formatted headers."""
-        # Setup token files
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 30}, f)
+@pytest.fixture(autouse=True)
+def _fresh_library_playlists():
+    """Don't let one test's mocked playlist list answer the next test's lookups."""
+    server._invalidate_library_playlists()
+    yield
+    server._invalidate_library_playlists()
 
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
 
-        result = server.get_headers()
+@pytest.fixture(autouse=True)
+def _fresh_catalog_album_matches():
+    """Don't let one test's mocked album search answer the next test's lookups."""
+    server._catalog_album_matches.clear()
+    yield
+    server._catalog_album_matches.clear()
 
-        assert "Authorization" in result
-        assert result["Authorization"].startswith("Bearer ")
-        assert "Music-User-Token" in result
-        assert result["Content-Type"] == "application/json"
 
+@pytest.fixture
+def api_only(monkeypatch):
+    """Run as if AppleScript were unavailable (non-macOS)."""
+    monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
 
-class TestGetLibraryPlaylists:
-    """Tests for get_library_playlists function (API path)."""
 
-    @responses.activate
-    def test_returns_playlists(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
-        """Should return formatted playlist list via API."""
-        # Disable AppleScript to test API path
-        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
+@pytest.fixture
+def applescript_mode(monkeypatch):
+    """Run as if on macOS with AppleScript available."""
+    monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
 
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
 
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
+@pytest.fixture
+def no_verify_wait(monkeypatch):
+    """Skip the real-time settle/retry sleeps of AppleScript add verification."""
+    monkeypatch.setattr(server, "_ROLLBACK_SETTLE_S", 0)
+    monkeypatch.setattr(server, "_VERIFY_DELAY_S", 0)
 
-        # Mock API response
-        responses.add(
-            responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
-            json={
-                "data": [
-                    {"id": "p.abc123", "attributes": {"name": "Test Playlist", "canEdit": True}},
-                    {"id": "p.def456", "attributes": {"name": "Read Only", "canEdit": False}},
-                ]
-            },
-            status=200,
-        )
 
-        result = server.playlist(action="list")
+class TestGetTokenExpirationWarning:
+    """Tests for get_token_expiration_warning function."""
 
-        assert "Test Playlist" in result
-        assert "p.abc123" in result
-        assert "Read Only" in result
-        assert "p.def456" in result
-        assert "2 items" in result
+    def test_returns_none_when_no_token_file(self, mock_config_dir):
+        """Should return None when token file doesn't exist."""
+        result = server.get_token_expiration_warning()
+        assert result is None
 
-    @responses.activate
-    def test_handles_api_error(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
-        """Should return error message on API failure."""
-        # Disable AppleScript to test API path
-        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
+    @pytest.mark.parametrize(
+        "days,expected",
+        [
+            (60, None),  # more than 30 days left
+            (15, "days"),  # could be 14 or 15 depending on timing
+        ],
+    )
+    def test_warns_only_when_expiring_soon(self, token_paths, days, expected):
+        """Should return a warning only when the token expires within 30 days."""
+        token_file = token_paths.dev_token_path
+        token_file.write_text(json.dumps({"expires": NOW + 86400 * days}))
 
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
+        result = server.get_token_expiration_warning()
+        if expected is None:
+            assert result is None
+        else:
+            assert expected in result
+            assert "generate-token" in result
 
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
 
-        responses.add(
-            responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
-            json={"error": "Unauthorized"},
-            status=401,
-        )
+@pytest.mark.needs_tokens
+class TestGetHeaders:
+    """Tests for get_headers function."""
 
-        result = server.playlist(action="list")
+    def test_returns_headers_with_tokens(self):
+        """Should return properly formatted headers."""
+        result = server.get_headers()
 
-        assert "API Error" in result or "401" in result
+        assert "Authorization" in result
+        assert result["Authorization"].startswith("Bearer ")
+        assert "Music-User-Token" in result
+        assert result["Content-Type"] == "application/json"
 
 
-class TestCreatePlaylist:
-    """Tests for create_playlist function (API path)."""
+@pytest.mark.needs_tokens
+class TestPlaylistApiPath:
+    """Tests for playlist list/create actions (API path)."""
 
-    @responses.activate
-    def test_creates_playlist_successfully(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
+    @pytest.mark.parametrize(
+        "action,kwargs,method,status,payload,expected",
+        [
+            (
+                "list",
+                {},
+                responses.GET,
+                200,
+                LIB_PLAYLISTS_OK_BODY,
+                ["Test Playlist", "p.abc123", "Read Only", "p.def456", "2 items"],
+            ),
+            ("list", {}, responses.GET, 401, LIB_PLAYLISTS_ERR_BODY, ["API Error", "401"]),
+            (
+                "create",
+                {"name": "My New Playlist", "description": "A description"},
+                responses.POST,
+                201,
+                {"data": [{"id": "p.newplaylist123"}]},
+                ["My New Playlist", "p.newplaylist123"],
+            ),
+            # An empty data array should not raise; the ID is reported as None
+            (
+                "create",
+                {"name": "Empty Reply"},
+                responses.POST,
+                201,
+                {"data": []},
+                ["Created playlist 'Empty Reply' (ID: None)"],
+            ),
+        ],
+        ids=["list", "list_api_error", "create", "create_empty_data"],
+    )
+    def test_playlist_action(
+        self, rsps, monkeypatch, action, kwargs, method, status, payload, expected
     ):
-        """Should create playlist via API and return ID."""
+        """Should format the API result for the action, or report the API error."""
         # Disable AppleScript to test API path
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
 
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
+        rsps.add(method, LIB_PLAYLISTS_URL, json=payload, status=status)
 
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
+        result = server.playlist(action=action, **kwargs)
 
-        responses.add(
-            responses.POST,
-            "https://api.music.apple.com/v1/me/library/playlists",
-            json={"data": [{"id": "p.newplaylist123"}]},
-            status=201,
-        )
+        for text in expected:
+            assert text in result
 
-        result = server.playlist(
-            action="create", name="My New Playlist", description="A description"
-        )
+    def test_create_with_undecodable_reply(self, rsps, monkeypatch):
+        """A created playlist whose reply isn't JSON is still reported as created."""
+        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
+        rsps.add(responses.POST, LIB_PLAYLISTS_URL, body="<html>", status=201)
 
-        assert "My New Playlist" in result
-        assert "p.newplaylist123" in result
+        result = server.playlist(action="create", name="Odd Reply")
+
+        assert result == "Created playlist 'Odd Reply' (ID: None)"
 
 
 @pytest.mark.skipif(
@@ -294,22 +354,13 @@ class TestMoveToFolder:
         assert "allow_duplicates" in result
 
 
+@pytest.mark.needs_tokens
 class TestAddToPlaylist:
     """Tests for add_to_playlist function."""
 
-    @responses.activate
-    def test_adds_tracks_successfully(self, mock_config_dir, mock_developer_token, mock_user_token):
+    def test_adds_tracks_successfully(self, rsps):
         """Should add tracks and return confirmation."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        responses.add(
+        rsps.add(
             responses.POST,
             "https://api.music.apple.com/v1/me/library/playlists/p.test123/tracks",
             status=204,
@@ -322,17 +373,8 @@ class TestAddToPlaylist:
         assert "Added" in result
         assert "3 track" in result
 
-    def test_handles_empty_track(self, mock_config_dir, mock_developer_token, mock_user_token):
+    def test_handles_empty_track(self):
         """Should return error for empty track."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
         result = server.playlist(action="add", playlist="p.test123", track="")
 
         assert "Provide track or album parameter" in result
@@ -379,27 +421,16 @@ class TestSplitTrackArtistCandidates:
         assert server._split_track_artist_candidates("Song - ") == []
 
 
+@pytest.mark.needs_tokens
 class TestSearchLibrary:
     """Tests for search_library function."""
 
-    @responses.activate
-    def test_returns_search_results(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_returns_search_results(self, rsps, monkeypatch):
         """Should return formatted search results via API fallback."""
         # Force API path by disabling AppleScript
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
 
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/me/library/search",
             json={
@@ -428,24 +459,15 @@ class TestSearchLibrary:
         assert "i.abc123" in result
 
 
+@pytest.mark.needs_tokens
 class TestSearchCatalog:
     """Tests for search_catalog function."""
 
-    @responses.activate
-    def test_returns_catalog_results(self, mock_config_dir, mock_developer_token, mock_user_token):
+    def test_returns_catalog_results(self, rsps):
         """Should return formatted catalog search results."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/search",
+            CATALOG_SEARCH_URL,
             json={
                 "results": {
                     "songs": {
@@ -479,68 +501,44 @@ class TestCheckAuthStatus:
         assert "Developer Token" in result
         assert "Music User Token" in result
 
-    def test_reports_valid_tokens(self, mock_config_dir, mock_developer_token, mock_user_token):
-        """Should report OK for valid tokens."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
+    @pytest.mark.parametrize(
+        "write_tokens,expected",
+        [(60, "OK"), (10, "EXPIRES IN")],
+        indirect=["write_tokens"],
+        ids=["valid", "expiring"],
+    )
+    def test_reports_developer_token_status(self, write_tokens, expected, monkeypatch):
+        """Should report OK for valid tokens and warn about expiring ones."""
         # Don't actually test API connection
-        with patch.object(server, "get_headers", return_value={}):
-            with patch("requests.get") as mock_get:
-                mock_get.return_value.status_code = 200
-                result = server.config(action="auth-status")
-
-        assert "OK" in result
-        assert "Developer Token" in result
-
-    def test_reports_expiring_token(self, mock_config_dir, mock_developer_token, mock_user_token):
-        """Should warn about expiring token."""
-        # Setup expiring token
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 10}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
+        monkeypatch.setattr(server, "get_headers", lambda: {})
+        monkeypatch.setattr(
+            server._session, "get", lambda *args, **kwargs: SimpleNamespace(status_code=200)
+        )
         result = server.config(action="auth-status")
 
-        assert "EXPIRES IN" in result or "10" in result
+        assert expected in result
+        assert "Developer Token" in result
 
 
 class TestFormatDuration:
     """Tests for format_duration helper function."""
 
-    def test_formats_standard_duration(self):
-        """Should format milliseconds as m:ss."""
-        assert server.format_duration(225000) == "3:45"
-        assert server.format_duration(60000) == "1:00"
-        assert server.format_duration(5000) == "0:05"
-
-    def test_handles_zero(self):
-        """Should return empty string for zero."""
-        assert server.format_duration(0) == ""
-
-    def test_handles_none(self):
-        """Should return empty string for None."""
-        assert server.format_duration(None) == ""
-
-    def test_handles_negative(self):
-        """Should return empty string for negative values."""
-        assert server.format_duration(-1000) == ""
-        assert server.format_duration(-60000) == ""
-
-    def test_handles_large_duration(self):
-        """Should handle songs longer than an hour."""
-        # 1 hour, 5 minutes, 30 seconds = 3930000 ms
-        assert server.format_duration(3930000) == "65:30"
+    @pytest.mark.parametrize(
+        "ms,expected",
+        [
+            (225000, "3:45"),
+            (60000, "1:00"),
+            (5000, "0:05"),
+            (0, ""),
+            (None, ""),
+            (-1000, ""),
+            (-60000, ""),
+            (3930000, "65:30"),  # over an hour stays m:ss
+        ],
+    )
+    def test_formats_duration(self, ms, expected):
+        """Should format milliseconds as m:ss, or empty for missing/non-positive values."""
+        assert server.format_duration(ms) == expected
 
 
 class TestExtractTrackData:
@@ -641,6 +639,45 @@ class TestTruncate:
         assert result == ""
 
 
+_LONG_TRACK = {
+    "name": "A" * 100,
+    "artist": "B" * 50,
+    "duration": "3:00",
+    "album": "C" * 100,
+    "year": "2024",
+    "genre": "Rock",
+    "id": "12345678901234567890",
+}
+
+_MEDIUM_TRACK = {
+    "name": "A" * 50,
+    "artist": "B" * 30,
+    "duration": "3:00",
+    "album": "Album",
+    "year": "2024",
+    "genre": "Rock",
+    "id": "12345678901234567890",
+}
+
+
+@pytest.fixture(scope="module")
+def big_tracks_200():
+    """Long-field tracks too large for the Full tier."""
+    return [_LONG_TRACK] * 200
+
+
+@pytest.fixture(scope="module")
+def big_tracks_450():
+    """Tracks too large for the Clipped tier."""
+    return [_MEDIUM_TRACK] * 450
+
+
+@pytest.fixture(scope="module")
+def big_tracks_800():
+    """Tracks too large for the Compact tier."""
+    return [_MEDIUM_TRACK] * 800
+
+
 class TestFormatTrackList:
     """Tests for format_track_list helper function."""
 
@@ -663,19 +700,9 @@ class TestFormatTrackList:
         assert len(lines) == 1
         assert "Song Name - Artist Name (3:45) Album Name [2024] Rock 123" == lines[0]
 
-    def test_clipped_format_when_full_exceeds_limit(self):
+    def test_clipped_format_when_full_exceeds_limit(self, big_tracks_200):
         """Should use clipped format when full format exceeds MAX_OUTPUT_CHARS."""
-        track = {
-            "name": "A" * 100,
-            "artist": "B" * 50,
-            "duration": "3:00",
-            "album": "C" * 100,
-            "year": "2024",
-            "genre": "Rock",
-            "id": "12345678901234567890",
-        }
-        tracks = [track] * 200
-        lines, tier = server.format_track_list(tracks)
+        lines, tier = server.format_track_list(big_tracks_200)
 
         assert tier == "Clipped"
         assert len(lines) == 200
@@ -684,19 +711,9 @@ class TestFormatTrackList:
         assert "[2024]" in lines[0]  # Year still present
         assert "Rock" in lines[0]  # Genre still present
 
-    def test_compact_format_when_clipped_exceeds_limit(self):
+    def test_compact_format_when_clipped_exceeds_limit(self, big_tracks_450):
         """Should use compact format when clipped format exceeds MAX_OUTPUT_CHARS."""
-        track = {
-            "name": "A" * 50,
-            "artist": "B" * 30,
-            "duration": "3:00",
-            "album": "Album",
-            "year": "2024",
-            "genre": "Rock",
-            "id": "12345678901234567890",
-        }
-        tracks = [track] * 450
-        lines, tier = server.format_track_list(tracks)
+        lines, tier = server.format_track_list(big_tracks_450)
 
         assert tier == "Compact"
         assert len(lines) == 450
@@ -704,19 +721,9 @@ class TestFormatTrackList:
         assert "[2024]" not in lines[0]  # Year dropped
         assert "(3:00)" in lines[0]  # Duration still present
 
-    def test_minimal_format_when_compact_exceeds_limit(self):
+    def test_minimal_format_when_compact_exceeds_limit(self, big_tracks_800):
         """Should use minimal format when compact format also exceeds limit."""
-        track = {
-            "name": "A" * 50,
-            "artist": "B" * 30,
-            "duration": "3:00",
-            "album": "Album",
-            "year": "2024",
-            "genre": "Rock",
-            "id": "12345678901234567890",
-        }
-        tracks = [track] * 800
-        lines, tier = server.format_track_list(tracks)
+        lines, tier = server.format_track_list(big_tracks_800)
 
         assert tier == "Minimal"
         assert len(lines) == 800
@@ -747,25 +754,37 @@ class TestFormatTrackList:
         assert tier == "Full"
         assert lines == []
 
+    def test_tier_boundary_counts_joining_newlines(self, monkeypatch):
+        """A tier fits when its lines joined by newlines are exactly the limit."""
+        track = {
+            "name": "Song",
+            "artist": "Artist",
+            "duration": "3:00",
+            "album": "Album",
+            "year": "",
+            "genre": "",
+            "id": "123",
+        }
+        tracks = [track, track]  # 2 x 30 chars + 1 newline = 61
+
+        monkeypatch.setattr(server, "MAX_OUTPUT_CHARS", 61)
+        assert server.format_track_list(tracks)[1] == "Full"
 
+        monkeypatch.setattr(server, "MAX_OUTPUT_CHARS", 60)
+        lines, tier = server.format_track_list(tracks)
+        assert tier == "Compact"
+        assert lines == ["Song - Artist (3:00) 123"] * 2
+
+
+@pytest.mark.needs_tokens
 class TestSearchCatalogSongsHelper:
     """Tests for _search_catalog_songs internal helper."""
 
-    @responses.activate
-    def test_returns_songs_on_success(self, mock_config_dir, mock_developer_token, mock_user_token):
+    def test_returns_songs_on_success(self, rsps):
         """Should return list of song dicts on successful search."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/search",
+            CATALOG_SEARCH_URL,
             json={
                 "results": {
                     "songs": {
@@ -785,21 +804,11 @@ class TestSearchCatalogSongsHelper:
         assert len(result) == 1
         assert result[0]["id"] == "123"
 
-    @responses.activate
-    def test_returns_empty_on_error(self, mock_config_dir, mock_developer_token, mock_user_token):
+    def test_returns_empty_on_error(self, rsps):
         """Should return empty list on API error."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/search",
+            CATALOG_SEARCH_URL,
             json={"error": "Unauthorized"},
             status=401,
         )
@@ -817,23 +826,12 @@ class TestAddSongsToLibraryHelper:
         assert success is False
         assert "No catalog IDs" in msg
 
-    @responses.activate
-    def test_returns_success_on_valid_response(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
+    @pytest.mark.needs_tokens
+    def test_returns_success_on_valid_response(self, rsps):
         """Should return success tuple on successful add."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        responses.add(
+        rsps.add(
             responses.POST,
-            "https://api.music.apple.com/v1/me/library",
+            LIBRARY_URL,
             status=202,
         )
 
@@ -841,23 +839,12 @@ class TestAddSongsToLibraryHelper:
         assert success is True
         assert "1 song" in msg
 
-    @responses.activate
-    def test_returns_error_on_api_failure(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
+    @pytest.mark.needs_tokens
+    def test_returns_error_on_api_failure(self, rsps):
         """Should return error tuple on API failure."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        responses.add(
+        rsps.add(
             responses.POST,
-            "https://api.music.apple.com/v1/me/library",
+            LIBRARY_URL,
             status=401,
         )
 
@@ -874,21 +861,12 @@ class TestAddToLibraryTool:
         result = server.library(action="add")
         assert "Error: Provide track or album parameter" in result
 
-    @responses.activate
-    def test_adds_songs_successfully(self, mock_config_dir, mock_developer_token, mock_user_token):
+    @pytest.mark.needs_tokens
+    def test_adds_songs_successfully(self, rsps):
         """Should add songs and return success message."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        responses.add(
+        rsps.add(
             responses.POST,
-            "https://api.music.apple.com/v1/me/library",
+            LIBRARY_URL,
             status=202,
         )
 
@@ -898,74 +876,70 @@ class TestAddToLibraryTool:
 
 
 class TestPlayTrackMatching:
-    """Tests for play_track song matching logic."""
-
-    def test_matches_featured_artist_in_song_name(self):
-        """Should match artist in song name for featured artists."""
-        # Mock song with featured artist in title
-        song = {
-            "id": "123",
-            "attributes": {
-                "name": "Uptown Funk (feat. Bruno Mars)",
-                "artistName": "Mark Ronson",
-                "url": "https://music.apple.com/us/song/123",
-            },
-        }
-
-        # Check if "Bruno Mars" matches (in song name, not artistName)
-        song_name = song["attributes"]["name"]
-        song_artist = song["attributes"]["artistName"]
-        artist = "Bruno Mars"
-
-        # This is the matching logic from play_track
-        matches_artist = (
-            artist.lower() in song_artist.lower() or artist.lower() in song_name.lower()
-        )
-        assert matches_artist is True
-
-    def test_matches_artist_in_artist_name(self):
-        """Should match artist in artistName field."""
-        song_name = "Bohemian Rhapsody"
-        song_artist = "Queen"
-        artist = "Queen"
+    """Tests for play_track catalog song matching (_catalog_song_matches)."""
+
+    @pytest.mark.parametrize(
+        "song_name,song_artist,track,artist,expected",
+        [
+            # Featured artist appears in the song name, not artistName
+            ("Uptown Funk (feat. Bruno Mars)", "Mark Ronson", "Uptown Funk", "Bruno Mars", True),
+            ("Bohemian Rhapsody", "Queen", "Bohemian Rhapsody", "Queen", True),
+            ("Some Song", "Some Artist", "Some Song", "Different Artist", False),
+            ("Bohemian Rhapsody (Remastered 2011)", "Queen", "Bohemian Rhapsody", "Queen", True),
+            ("BOHEMIAN RHAPSODY", "QUEEN", "bohemian rhapsody", "queen", True),
+            ("Killer Queen", "Queen", "Bohemian Rhapsody", "Queen", False),
+            ("Bohemian Rhapsody", "Queen", "Bohemian Rhapsody", "", True),
+        ],
+        ids=[
+            "featured_artist_in_song_name",
+            "artist_in_artist_name",
+            "artist_not_found",
+            "partial_track_name",
+            "case_insensitive",
+            "track_not_found",
+            "no_artist_requested",
+        ],
+    )
+    def test_catalog_song_matches(self, song_name, song_artist, track, artist, expected):
+        """Track must be a substring of the title; artist may be in artistName or title."""
+        assert server._catalog_song_matches(song_name, song_artist, track, artist) is expected
+
+
+class _FakeAsc:
+    """Stands in for the applescript module, replying to the named calls only.
+
+    Each keyword maps an asc function name to the value it returns; calls are
+    counted per name. Any other attribute raises, so a test shows exactly which
+    AppleScript calls a code path makes.
+    """
 
-        matches_artist = (
-            artist.lower() in song_artist.lower() or artist.lower() in song_name.lower()
-        )
-        assert matches_artist is True
+    def __init__(self, **replies):
+        self.calls: Counter[str] = Counter()
+        for name, reply in replies.items():
+            setattr(self, name, self._replier(name, reply))
 
-    def test_no_match_when_artist_not_found(self):
-        """Should not match when artist is in neither field."""
-        song_name = "Some Song"
-        song_artist = "Some Artist"
-        artist = "Different Artist"
+    def _replier(self, name, reply):
+        def call(*args, **kwargs):
+            self.calls[name] += 1
+            return reply
 
-        matches_artist = (
-            artist.lower() in song_artist.lower() or artist.lower() in song_name.lower()
-        )
-        assert matches_artist is False
+        return call
 
-    def test_partial_track_name_match(self):
-        """Should match partial track names."""
-        song_name = "Bohemian Rhapsody (Remastered 2011)"
-        track_name = "Bohemian Rhapsody"
 
-        matches_track = track_name.lower() in song_name.lower()
-        assert matches_track is True
+class _ExplicitCacheStub:
+    """Stands in for TrackCache, answering batch explicit lookups from a dict."""
 
-    def test_case_insensitive_matching(self):
-        """Should match regardless of case."""
-        song_name = "BOHEMIAN RHAPSODY"
-        song_artist = "QUEEN"
-        track_name = "bohemian rhapsody"
-        artist = "queen"
+    def __init__(self, explicit: dict[str, str]):
+        self.explicit = explicit
+        self.lookups: list[list[str]] = []
 
-        matches_track = track_name.lower() in song_name.lower()
-        matches_artist = artist.lower() in song_artist.lower()
-        assert matches_track is True
-        assert matches_artist is True
+    def get_explicit_many(self, track_ids):
+        ids = list(track_ids)
+        self.lookups.append(ids)
+        return {tid: self.explicit[tid] for tid in ids if tid in self.explicit}
 
 
+@pytest.mark.needs_tokens
 class TestPaginationWithFetchExplicit:
     """Tests for pagination when fetch_explicit is True.
 
@@ -974,10 +948,7 @@ class TestPaginationWithFetchExplicit:
     cache for explicit status, only hitting API on cache miss.
     """
 
-    @responses.activate
-    def test_uses_applescript_with_cache_when_fetch_explicit_true(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_uses_applescript_with_cache_when_fetch_explicit_true(self, rsps, monkeypatch):
         """With fetch_explicit=True and playlist name, should use AppleScript + cache.
 
         AppleScript provides fast native access, cache stores explicit status.
@@ -985,35 +956,19 @@ class TestPaginationWithFetchExplicit:
         """
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
 
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
         # Mock AppleScript - SHOULD be called
         mock_applescript_called = False
 
         def mock_asc_get_tracks(*args, **kwargs):
             nonlocal mock_applescript_called
             mock_applescript_called = True
-            return (
-                True,
-                [
-                    {"name": f"Track {i}", "artist": "Artist", "album": "Album", "id": f"PID{i}"}
-                    for i in range(5)
-                ],
-            )
+            return (True, _FIVE_AS_TRACKS)
 
-        # Mock cache - return cached explicit status for all tracks
-        mock_cache = MagicMock()
-        mock_cache.get_explicit.return_value = "Clean"  # All tracks have cached explicit status
+        # Stub cache - all tracks have cached explicit status
+        cache = _ExplicitCacheStub({f"PID{i}": "Clean" for i in range(5)})
 
         with patch.object(server.asc, "get_playlist_tracks", side_effect=mock_asc_get_tracks):
-            with patch.object(server, "get_track_cache", return_value=mock_cache):
+            with patch.object(server, "get_track_cache", return_value=cache):
                 # Call with playlist name and fetch_explicit=True
                 result = server.playlist(
                     action="tracks", playlist="Test Playlist", fetch_explicit=True
@@ -1024,8 +979,8 @@ class TestPaginationWithFetchExplicit:
                     mock_applescript_called
                 ), "AppleScript should be called for fast native access"
 
-                # Cache should be checked for each track (via get_explicit)
-                assert mock_cache.get_explicit.call_count == 5
+                # Cache should be checked for all tracks in one batch lookup
+                assert cache.lookups == [[f"PID{i}" for i in range(5)]]
 
                 # Should show all 5 tracks
                 assert "=== 5 tracks ===" in result
@@ -1033,10 +988,7 @@ class TestPaginationWithFetchExplicit:
                 assert "Track 4" in result
                 # Note: text format may not display explicit status, but cache was used
 
-    @responses.activate
-    def test_optimized_pagination_minimal_api_calls(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_optimized_pagination_minimal_api_calls(self, rsps, monkeypatch):
         """With limit specified, should only fetch needed tracks, not all.
 
         Performance test: limit=5 on a 500 track playlist should make 1 API call,
@@ -1044,43 +996,15 @@ class TestPaginationWithFetchExplicit:
         """
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
 
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
         # Mock API: return 5 tracks (simulating a partial response)
         api_call_count = 0
 
         def request_callback(request):
             nonlocal api_call_count
             api_call_count += 1
-            return (
-                200,
-                {},
-                json.dumps(
-                    {
-                        "data": [
-                            {
-                                "id": f"i.lib{i}",
-                                "attributes": {
-                                    "name": f"Track {i}",
-                                    "artistName": "Artist",
-                                    "albumName": "Album",
-                                    "contentRating": "clean",
-                                },
-                            }
-                            for i in range(5)
-                        ]
-                    }
-                ),
-            )
+            return (200, {}, _FIVE_TRACK_BODY)
 
-        responses.add_callback(
+        rsps.add_callback(
             responses.GET,
             "https://api.music.apple.com/v1/me/library/playlists/p.test123/tracks",
             callback=request_callback,
@@ -1090,31 +1014,71 @@ class TestPaginationWithFetchExplicit:
         # Call with playlist ID and limit=5
         result = server.playlist(action="tracks", playlist="p.test123", limit=5)
 
-        # Should only make 1 API call, not multiple
+        # Should only make 1 API call, not multiple, asking for just the page
         assert api_call_count == 1, f"Expected 1 API call, got {api_call_count}"
+        assert "limit=5" in rsps.calls[0].request.url
+        assert "offset=0" in rsps.calls[0].request.url
         assert "Track 0" in result
         assert "Track 4" in result
 
+    def test_optimized_pagination_starts_api_at_offset(self, rsps, monkeypatch):
+        """A later page should be fetched directly, not by re-reading earlier tracks."""
+        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
+        rsps.add(
+            responses.GET,
+            "https://api.music.apple.com/v1/me/library/playlists/p.test123/tracks",
+            json={
+                "data": [
+                    {"id": f"i.lib{i}", "attributes": {"name": f"Track {i}", "artistName": "A"}}
+                    for i in range(40, 45)
+                ],
+                "meta": {"total": 500},
+            },
+            status=200,
+        )
+
+        result = server.playlist(action="tracks", playlist="p.test123", limit=5, offset=40)
+
+        assert len(rsps.calls) == 1
+        assert "offset=40" in rsps.calls[0].request.url
+        assert "limit=5" in rsps.calls[0].request.url
+        assert "Track 40" in result
+        assert "Track 44" in result
+        assert "of 500" in result
+
+    @pytest.mark.parametrize(
+        "meta,expected",
+        [
+            ({"total": 12}, "Offset 40 exceeds playlist size of 12 tracks"),
+            ({}, "Offset 40 is past the end of the playlist"),
+        ],
+        ids=["known_total", "unknown_total"],
+    )
+    def test_optimized_pagination_offset_past_end(self, rsps, monkeypatch, meta, expected):
+        """An offset past the last track is out of range, not an empty playlist."""
+        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
+        rsps.add(
+            responses.GET,
+            "https://api.music.apple.com/v1/me/library/playlists/p.test123/tracks",
+            json={"data": [], "meta": meta},
+            status=200,
+        )
+
+        result = server.playlist(action="tracks", playlist="p.test123", limit=5, offset=40)
+
+        assert result == expected
 
+
+@pytest.mark.needs_tokens
 class TestFindApiPlaylistByName:
     """Tests for _find_api_playlist_by_name function."""
 
-    @responses.activate
-    def test_finds_exact_match(self, mock_config_dir, mock_developer_token, mock_user_token):
+    def test_finds_exact_match(self, rsps):
         """Should find playlist by exact name match."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
         # Mock API response
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={
                 "data": [
                     {"id": "p.abc123", "attributes": {"name": "My Playlist"}},
@@ -1128,20 +1092,11 @@ class TestFindApiPlaylistByName:
         assert playlist_id == "p.abc123"
         assert fuzzy_match is None  # Should be exact match
 
-    @responses.activate
-    def test_finds_partial_match(self, mock_config_dir, mock_developer_token, mock_user_token):
+    def test_finds_partial_match(self, rsps):
         """Should find playlist by partial name match."""
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={
                 "data": [
                     {"id": "p.emoji123", "attributes": {"name": "🎸 Rock Playlist"}},
@@ -1154,23 +1109,12 @@ class TestFindApiPlaylistByName:
         playlist_id, fuzzy_match = server._find_api_playlist_by_name("Rock Playlist")
         assert playlist_id == "p.emoji123"
 
-    @responses.activate
-    def test_prefers_exact_match_over_partial(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
+    def test_prefers_exact_match_over_partial(self, rsps):
         """Should prefer exact match over partial match."""
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
         # Partial match comes first in the list, but exact match should win
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={
                 "data": [
                     {"id": "p.partial", "attributes": {"name": "Rock Playlist Extended"}},
@@ -1184,22 +1128,11 @@ class TestFindApiPlaylistByName:
         assert playlist_id == "p.exact"
         assert fuzzy_match is None  # Should be exact match
 
-    @responses.activate
-    def test_returns_none_when_not_found(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
+    def test_returns_none_when_not_found(self, rsps):
         """Should return None when playlist not found."""
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={"data": []},
             status=200,
         )
@@ -1208,22 +1141,11 @@ class TestFindApiPlaylistByName:
         assert playlist_id is None
         assert fuzzy_match is None
 
-    @responses.activate
-    def test_returns_none_on_api_error(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
+    def test_returns_none_on_api_error(self, rsps):
         """Should return None on API error (graceful fallback)."""
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             status=401,  # Unauthorized
         )
 
@@ -1232,6 +1154,156 @@ class TestFindApiPlaylistByName:
         assert fuzzy_match is None
 
 
+@pytest.mark.needs_tokens
+class TestLibraryPlaylistsCache:
+    """Tests for reusing the fetched library playlist list across lookups."""
+
+    def _add_playlists(self, rsps, *names):
+        data = [{"id": f"p.{i}", "attributes": {"name": n}} for i, n in enumerate(names)]
+        rsps.add(responses.GET, LIB_PLAYLISTS_URL, json={"data": data}, status=200)
+
+    def test_reuses_list_within_ttl(self, rsps):
+        """A second lookup should not page through the API again."""
+        self._add_playlists(rsps, "Road Trip", "Chill")
+
+        assert server._find_api_playlist_by_name("Road Trip")[0] == "p.0"
+        assert server._find_api_playlist_by_name("Chill")[0] == "p.1"
+        assert len(rsps.calls) == 1
+
+    def test_repeat_name_reuses_match(self, rsps, monkeypatch):
+        """Resolving the same name again should skip both the API and the matching."""
+        self._add_playlists(rsps, "Jack & Norah")
+        match_calls = 0
+        real_match = server._fuzzy_match_entity
+
+        def counting_match(*args, **kwargs):
+            nonlocal match_calls
+            match_calls += 1
+            return real_match(*args, **kwargs)
+
+        monkeypatch.setattr(server, "_fuzzy_match_entity", counting_match)
+
+        first = server._resolve_playlist("Jack and Norah")
+        second = server._resolve_playlist("Jack and Norah")
+
+        assert first.api_id == second.api_id == "p.0"
+        assert second.applescript_name == "Jack & Norah"
+        assert len(rsps.calls) == 1
+        assert match_calls == 1
+
+    def test_refetches_after_ttl(self, rsps, monkeypatch):
+        """An expired list should be fetched again."""
+        self._add_playlists(rsps, "Road Trip")
+        server._find_api_playlist_by_name("Road Trip")
+
+        monkeypatch.setattr(server, "LIBRARY_PLAYLISTS_TTL", 0)
+        server._find_api_playlist_by_name("Road Trip")
+
+        assert len(rsps.calls) == 2
+
+    def test_error_response_is_not_cached(self, rsps):
+        """A failed fetch should not hide playlists from the next lookup."""
+        rsps.add(responses.GET, LIB_PLAYLISTS_URL, json=LIB_PLAYLISTS_ERR_BODY, status=401)
+        assert server._find_api_playlist_by_name("Road Trip") == (None, None)
+
+        rsps.reset()
+        self._add_playlists(rsps, "Road Trip")
+        assert server._find_api_playlist_by_name("Road Trip")[0] == "p.0"
+
+    def test_drop_during_fetch_is_not_overwritten(self, rsps):
+        """A fetch that overlaps a drop shouldn't store the list it read before the drop."""
+
+        def fetch_then_drop(request):
+            server._invalidate_library_playlists()
+            body = {"data": [{"id": "p.0", "attributes": {"name": "Road Trip"}}]}
+            return 200, {}, json.dumps(body)
+
+        rsps.add_callback(responses.GET, LIB_PLAYLISTS_URL, callback=fetch_then_drop)
+        assert server._find_api_playlist_by_name("Road Trip")[0] == "p.0"
+
+        assert server._library_playlists_cache is None
+        assert server._playlist_name_matches == {}
+
+    def test_create_drops_cached_list(self, rsps, monkeypatch):
+        """A playlist created after a lookup should be found by the next lookup."""
+        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
+        self._add_playlists(rsps, "Road Trip")
+        assert server._find_api_playlist_by_name("New Mix") == (None, None)
+
+        rsps.add(responses.POST, LIB_PLAYLISTS_URL, json={"data": [{"id": "p.new"}]}, status=201)
+        server.playlist(action="create", name="New Mix")
+
+        rsps.replace(
+            responses.GET,
+            LIB_PLAYLISTS_URL,
+            json={"data": [{"id": "p.new", "attributes": {"name": "New Mix"}}]},
+            status=200,
+        )
+        assert server._find_api_playlist_by_name("New Mix")[0] == "p.new"
+
+    @pytest.mark.parametrize(
+        "kwargs,asc_fn",
+        [
+            ({"folder": "Driving"}, "move_to_folder"),
+            ({"allow_duplicates": True}, "move_to_root"),
+        ],
+        ids=["to_folder", "to_root"],
+    )
+    def test_move_drops_cached_list(self, rsps, monkeypatch, kwargs, asc_fn):
+        """A moved playlist is recreated with a new ID, so its name must be looked up again."""
+        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
+        monkeypatch.setattr(server.asc, asc_fn, lambda *args: (True, "Moved"))
+        self._add_playlists(rsps, "Road Trip")
+        assert server._resolve_playlist("Road Trip").api_id == "p.0"
+
+        server.playlist(action="move", playlist="Road Trip", **kwargs)
+
+        rsps.replace(
+            responses.GET,
+            LIB_PLAYLISTS_URL,
+            json={"data": [{"id": "p.moved", "attributes": {"name": "Road Trip"}}]},
+            status=200,
+        )
+        assert server._resolve_playlist("Road Trip").api_id == "p.moved"
+        assert len(rsps.calls) == 2
+
+
+@pytest.mark.needs_tokens
+class TestCatalogAlbumMatchCache:
+    """Tests for reusing catalog album matches across lookups."""
+
+    ALBUMS_BODY = {
+        "results": {
+            "albums": {
+                "data": [{"id": "1440", "attributes": {"name": "GNX", "artistName": "Kendrick"}}]
+            }
+        }
+    }
+
+    def test_reuses_match_within_ttl(self, rsps):
+        """Looking the same album up again should not search the catalog again."""
+        rsps.add(responses.GET, CATALOG_SEARCH_URL, json=self.ALBUMS_BODY, status=200)
+
+        first = server._find_matching_catalog_album("GNX", "Kendrick")
+        second = server._find_matching_catalog_album("GNX", "Kendrick")
+
+        assert first[0]["id"] == second[0]["id"] == "1440"
+        assert second[1] is None
+        assert len(rsps.calls) == 1
+
+    def test_miss_is_not_cached(self, rsps):
+        """A failed search should be retried by the next lookup."""
+        rsps.add(responses.GET, CATALOG_SEARCH_URL, json={"error": "down"}, status=500)
+        assert server._find_matching_catalog_album("GNX")[1] == "Not found in catalog"
+
+        rsps.replace(responses.GET, CATALOG_SEARCH_URL, json=self.ALBUMS_BODY, status=200)
+        album, error, _ = server._find_matching_catalog_album("GNX")
+
+        assert error is None
+        assert album["id"] == "1440"
+        assert len(rsps.calls) == 2
+
+
 class TestResolvePlaylistApiLookup:
     """Tests for _resolve_playlist API lookup behavior."""
 
@@ -1251,20 +1323,12 @@ class TestResolvePlaylistApiLookup:
         assert resolved.error is not None
         assert "required" in resolved.error.lower()
 
-    @responses.activate
-    def test_looks_up_api_id_for_name(self, mock_config_dir, mock_developer_token, mock_user_token):
+    @pytest.mark.needs_tokens
+    def test_looks_up_api_id_for_name(self, rsps):
         """Should look up API playlist ID when given a name."""
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={
                 "data": [
                     {"id": "p.found123", "attributes": {"name": "My Music"}},
@@ -1281,22 +1345,12 @@ class TestResolvePlaylistApiLookup:
         assert resolved.error is None
         assert resolved.raw_input == "My Music"
 
-    @responses.activate
-    def test_falls_back_to_name_when_not_in_api(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
+    @pytest.mark.needs_tokens
+    def test_falls_back_to_name_when_not_in_api(self, rsps):
         """Should fall back to playlist name when not found in API."""
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={"data": []},  # Empty - playlist not in API
             status=200,
         )
@@ -1308,12 +1362,12 @@ class TestResolvePlaylistApiLookup:
         assert resolved.applescript_name == "Local Only Playlist"
         assert resolved.error is None
 
-    def test_handles_ps_i_love_you_as_name(self):
+    def test_handles_ps_i_love_you_as_name(self, monkeypatch):
         """Should treat 'p.s. I love you' as a name, not an ID."""
         # This tests the edge case where a playlist name starts with "p."
         # but isn't an ID (has spaces/punctuation after p.)
-        with patch.object(server, "_find_api_playlist_by_name", return_value=(None, None)):
-            resolved = server._resolve_playlist("p.s. I love you")
+        monkeypatch.setattr(server, "_find_api_playlist_by_name", lambda name: (None, None))
+        resolved = server._resolve_playlist("p.s. I love you")
 
         # Should be treated as a name, not an ID
         assert resolved.api_id is None
@@ -1321,27 +1375,57 @@ class TestResolvePlaylistApiLookup:
         assert resolved.error is None
 
 
+class TestNormalizeWithTracking:
+    """Tests for the memoized fuzzy-match normalization."""
+
+    def test_normalizes_and_reports_transformations(self):
+        """Should lowercase, strip articles/emoji, and offer the and/& variant."""
+        variations, transformations = server._normalize_with_tracking("The Rock & Roll 🎸")
+
+        assert variations == ["rock roll", "rock and roll"]
+        assert "removed article 'the'" in transformations
+        assert "'and' ↔ '&'" in transformations
+
+    def test_cached_result_is_not_shared(self):
+        """Mutating a returned list must not leak into later lookups."""
+        variations, transformations = server._normalize_with_tracking("Road Trip")
+        variations.append("junk")
+        transformations.append("junk")
+
+        assert server._normalize_with_tracking("Road Trip") == (["road trip"], [])
+
+
+class TestFuzzyMatchEntity:
+    """Tests for the exact/partial/fuzzy pass order of _fuzzy_match_entity."""
+
+    def _match(self, query, names):
+        return server._fuzzy_match_entity(query, [{"name": n} for n in names], lambda c: c["name"])
+
+    def test_exact_match_beats_earlier_partial(self):
+        """An exact hit anywhere in the list wins over a partial hit before it."""
+        matched, fuzzy = self._match("chill", ["Chill Vibes", "CHILL"])
+
+        assert matched == {"name": "CHILL"}
+        assert fuzzy is None
+
+    def test_first_partial_match_wins(self):
+        """Without an exact hit, the first substring match is returned as partial."""
+        matched, fuzzy = self._match("chill", ["Workout", "Chill Vibes", "Chill Mix"])
+
+        assert matched == {"name": "Chill Vibes"}
+        assert fuzzy.match_type == "partial"
+
+
+@pytest.mark.needs_tokens
 class TestFuzzyMatchingPlaylistResolution:
     """Tests for fuzzy matching playlist names - REGRESSION TESTS."""
 
-    @responses.activate
-    def test_fuzzy_matches_and_vs_ampersand(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
+    def test_fuzzy_matches_and_vs_ampersand(self, rsps):
         """Should fuzzy match 'Jack and Norah' to 'Jack & Norah'."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
         # Mock API response with playlist named "Jack & Norah"
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={
                 "data": [
                     {"id": "p.jack123", "attributes": {"name": "Jack & Norah"}},
@@ -1363,23 +1447,12 @@ class TestFuzzyMatchingPlaylistResolution:
             resolved.fuzzy_match.transformations
         )
 
-    @responses.activate
-    def test_fuzzy_matches_with_emojis(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
+    def test_fuzzy_matches_with_emojis(self, rsps):
         """Should fuzzy match playlist names with emojis removed."""
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
         # Mock API response with emoji playlist
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={
                 "data": [
                     {"id": "p.emoji123", "attributes": {"name": "🤟👶🎸 Jack & Norah"}},
@@ -1397,23 +1470,12 @@ class TestFuzzyMatchingPlaylistResolution:
         assert resolved.error is None
         assert resolved.fuzzy_match is not None
 
-    @responses.activate
-    def test_exact_match_preferred_over_fuzzy(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
+    def test_exact_match_preferred_over_fuzzy(self, rsps):
         """Should prefer exact match over fuzzy match."""
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
         # Mock API response with both exact and fuzzy matches
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={
                 "data": [
                     {
@@ -1433,26 +1495,15 @@ class TestFuzzyMatchingPlaylistResolution:
         assert resolved.applescript_name == "Rock Music"
         assert resolved.fuzzy_match is None or resolved.fuzzy_match.match_type == "exact"
 
-    @responses.activate
-    def test_resolved_object_has_both_ids_after_fuzzy_match(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
+    def test_resolved_object_has_both_ids_after_fuzzy_match(self, rsps):
         """REGRESSION TEST: Resolved object MUST have both api_id and applescript_name after fuzzy match.
 
         This is the critical fix for the bug where remove_from_playlist("Jack and Norah", ...)
         would fail because fuzzy matching converted to API ID but function needs AppleScript name.
         """
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={
                 "data": [
                     {"id": "p.test123", "attributes": {"name": "Test & Playlist"}},
@@ -1472,56 +1523,44 @@ class TestFuzzyMatchingPlaylistResolution:
         assert resolved.applescript_name == "Test & Playlist"
 
 
+@pytest.mark.needs_tokens
 class TestPlaylistResolutionPerformance:
     """Performance tests for playlist resolution."""
 
-    @responses.activate
-    def test_fuzzy_matching_performance_with_many_playlists(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
+    def test_fuzzy_matching_performance_with_many_playlists(self, rsps):
         """Should complete fuzzy matching in reasonable time even with many playlists.
 
         This tests the optimization where fuzzy matching only happens if exact/partial fails.
         With 50 playlists and target at position 25, should complete quickly.
         """
-        import time as time_module
-
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        # Mock API with 50 playlists (realistic library size)
-        playlists = [
-            {"id": f"p.test{i}", "attributes": {"name": f"Playlist {i}"}} for i in range(25)
-        ]
-        # Add fuzzy match target in the middle
-        playlists.append({"id": "p.target", "attributes": {"name": "Rock & Roll"}})
-        # Add more playlists after
-        playlists.extend(
-            [{"id": f"p.test{i}", "attributes": {"name": f"Playlist {i}"}} for i in range(25, 50)]
-        )
-
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
-            json={"data": playlists},
+            LIB_PLAYLISTS_URL,
+            body=_FIFTY_PLAYLISTS_BODY,
             status=200,
+            content_type="application/json",
         )
 
-        start = time_module.time()
         resolved = server._resolve_playlist("Rock and Roll")  # Fuzzy: "and" → "&"
-        elapsed = time_module.time() - start
-
-        # Should complete in under 500ms (fuzzy matching is now fallback-only)
-        assert elapsed < 0.5, f"Fuzzy matching took {elapsed:.2f}s, should be < 0.5s"
         assert resolved.api_id == "p.target"
         assert resolved.applescript_name == "Rock & Roll"
         assert resolved.fuzzy_match is not None, "Should be a fuzzy match"
 
+        # Time the matching itself, cold each run, and take the median so a
+        # busy CI machine can't fail the test on one slow sample
+        def name_of(pl):
+            return pl["attributes"]["name"]
+
+        samples = []
+        for _ in range(5):
+            server._normalized_variations.cache_clear()
+            start = time.perf_counter()
+            server._fuzzy_match_entity("Rock and Roll", _FIFTY_PLAYLISTS, name_of)
+            samples.append(time.perf_counter() - start)
+        elapsed = statistics.median(samples)
+
+        assert elapsed < 0.05, f"Fuzzy matching took {elapsed:.3f}s, should be < 0.05s"
+
 
 # =============================================================================
 # Integration Tests - Real User Journeys
@@ -1539,21 +1578,17 @@ class TestPlaylistResolutionPerformance:
 # =============================================================================
 
 
+@pytest.mark.needs_tokens
+@pytest.mark.usefixtures("api_only")
 class TestUserJourneyAPIOnly:
     """Integration tests for API-only mode (non-macOS or AppleScript unavailable)."""
 
-    @responses.activate
-    def test_first_2_actions_search_and_list_playlists(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_first_2_actions_search_and_list_playlists(self, rsps):
         """First things users do: search for music and see their playlists."""
-        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         # 1. Search catalog for a song
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/search",
+            CATALOG_SEARCH_URL,
             json={
                 "results": {
                     "songs": {
@@ -1581,9 +1616,9 @@ class TestUserJourneyAPIOnly:
         assert "Beatles" in result
 
         # 2. List playlists
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={
                 "data": [
                     {"id": "p.favorites", "attributes": {"name": "Favorites", "canEdit": True}},
@@ -1597,18 +1632,12 @@ class TestUserJourneyAPIOnly:
         assert "Favorites" in result
         assert "Workout Mix" in result
 
-    @responses.activate
-    def test_first_5_actions_basic_playlist_workflow(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_first_5_actions_basic_playlist_workflow(self, rsps):
         """Getting started: search, list playlists, get tracks, add to playlist."""
-        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         # 1. Search catalog
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/search",
+            CATALOG_SEARCH_URL,
             json={
                 "results": {
                     "songs": {
@@ -1634,9 +1663,9 @@ class TestUserJourneyAPIOnly:
         assert "Bohemian Rhapsody" in result
 
         # 2. List playlists
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={
                 "data": [
                     {"id": "p.rock", "attributes": {"name": "Classic Rock", "canEdit": True}},
@@ -1648,17 +1677,7 @@ class TestUserJourneyAPIOnly:
         assert "Classic Rock" in result
 
         # 3. Get playlist tracks
-        responses.add(
-            responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
-            json={
-                "data": [
-                    {"id": "p.rock", "attributes": {"name": "Classic Rock", "canEdit": True}},
-                ]
-            },
-            status=200,
-        )
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/me/library/playlists/p.rock/tracks",
             json={
@@ -1680,7 +1699,7 @@ class TestUserJourneyAPIOnly:
         assert "Stairway to Heaven" in result
 
         # 4. Search library
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/me/library/search",
             json={
@@ -1705,18 +1724,11 @@ class TestUserJourneyAPIOnly:
         result = server.library(action="search", query="Hotel California")
         assert "Hotel California" in result
 
-        # 5. Add track to playlist (via catalog search + add)
-        responses.add(
-            responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
-            json={
-                "data": [{"id": "p.rock", "attributes": {"name": "Classic Rock", "canEdit": True}}]
-            },
-            status=200,
-        )
-        responses.add(
+        # 5. Add track to playlist (via catalog search + add); the playlist
+        # list registered in step 2 still answers the name lookup
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/search",
+            CATALOG_SEARCH_URL,
             json={
                 "results": {
                     "songs": {
@@ -1738,19 +1750,19 @@ class TestUserJourneyAPIOnly:
             },
             status=200,
         )
-        responses.add(
+        rsps.add(
             responses.POST,
-            "https://api.music.apple.com/v1/me/library",
+            LIBRARY_URL,
             json={},
             status=202,
         )
-        responses.add(
+        rsps.add(
             responses.POST,
             "https://api.music.apple.com/v1/me/library/playlists/p.rock/tracks",
             json={},
             status=201,
         )
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/me/library/playlists/p.rock/tracks",
             json={
@@ -1768,18 +1780,12 @@ class TestUserJourneyAPIOnly:
         )
         assert "Dream On" in result or "Added" in result or "error" not in result.lower()
 
-    @responses.activate
-    def test_first_10_actions_regular_user(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_first_10_actions_regular_user(self, rsps):
         """Regular user: create playlist, add/remove tracks, get recommendations."""
-        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         # 6. Create a new playlist
-        responses.add(
+        rsps.add(
             responses.POST,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={"data": [{"id": "p.new123", "attributes": {"name": "My New Playlist"}}]},
             status=201,
         )
@@ -1789,7 +1795,7 @@ class TestUserJourneyAPIOnly:
         assert "p.new123" in result or "My New Playlist" in result
 
         # 7. Get recently played
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/me/recent/played/tracks",
             json={
@@ -1811,9 +1817,9 @@ class TestUserJourneyAPIOnly:
         assert "Yesterday" in result or "recent" in result.lower()
 
         # 8. Get recommendations
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/recommendations",
+            RECOMMENDATIONS_URL,
             json={"data": [{"id": "rec1", "type": "playlists", "attributes": {"name": "For You"}}]},
             status=200,
         )
@@ -1821,7 +1827,7 @@ class TestUserJourneyAPIOnly:
         # Just check it doesn't error
 
         # 9. Get heavy rotation
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/me/history/heavy-rotation",
             json={
@@ -1839,9 +1845,9 @@ class TestUserJourneyAPIOnly:
         assert "Abbey Road" in result or result  # Just check no error
 
         # 10. Get artist top songs
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/search",
+            CATALOG_SEARCH_URL,
             json={
                 "results": {
                     "artists": {
@@ -1856,7 +1862,7 @@ class TestUserJourneyAPIOnly:
             },
             status=200,
         )
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/catalog/us/artists/artist1/view/top-songs",
             json={
@@ -1877,41 +1883,27 @@ class TestUserJourneyAPIOnly:
         result = server.discover(action="top_songs", artist="The Beatles")
         assert "Come Together" in result or "Beatles" in result
 
-    def _setup_tokens(self, mock_config_dir, mock_developer_token, mock_user_token):
-        """Helper to setup authentication tokens."""
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
 
+@pytest.mark.needs_tokens
+@pytest.mark.usefixtures("api_only")
 class TestUserJourneyFuzzyMatching:
     """Integration tests for fuzzy matching across all entity types."""
 
-    @responses.activate
-    def test_fuzzy_playlist_workflow(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_fuzzy_playlist_workflow(self, rsps):
         """User workflow with fuzzy-named playlist: get tracks, add, remove."""
-        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         # Playlist has special characters
         playlist_data = [
             {"id": "p.fuzzy1", "attributes": {"name": "🎸 Rock & Roll Classics", "canEdit": True}}
         ]
 
         # 1. Get tracks from fuzzy-named playlist (typed without emoji, "and" instead of "&")
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={"data": playlist_data},
             status=200,
         )
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/me/library/playlists/p.fuzzy1/tracks",
             json={
@@ -1932,18 +1924,12 @@ class TestUserJourneyFuzzyMatching:
 
         result = server.playlist(action="tracks", playlist="Rock and Roll Classics")
         assert "Sweet Child" in result
-        assert "Fuzzy match" in result or "fuzzy" in result.lower()
+        assert "fuzzy" in result.lower()
 
         # 2. Add to fuzzy-named playlist
-        responses.add(
-            responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
-            json={"data": playlist_data},
-            status=200,
-        )
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/search",
+            CATALOG_SEARCH_URL,
             json={
                 "results": {
                     "songs": {
@@ -1965,19 +1951,19 @@ class TestUserJourneyFuzzyMatching:
             },
             status=200,
         )
-        responses.add(
+        rsps.add(
             responses.POST,
-            "https://api.music.apple.com/v1/me/library",
+            LIBRARY_URL,
             json={},
             status=202,
         )
-        responses.add(
+        rsps.add(
             responses.POST,
             "https://api.music.apple.com/v1/me/library/playlists/p.fuzzy1/tracks",
             json={},
             status=201,
         )
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/me/library/playlists/p.fuzzy1/tracks",
             json={"data": [{"id": "i.new", "attributes": {"name": "Back in Black"}}]},
@@ -1989,18 +1975,12 @@ class TestUserJourneyFuzzyMatching:
         )
         assert "Back in Black" in result or "Added" in result
 
-    @responses.activate
-    def test_fuzzy_track_search_in_catalog(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_fuzzy_track_search_in_catalog(self, rsps):
         """User searches with typos/variations, fuzzy matching finds correct track."""
-        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         # API returns track with proper name
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/search",
+            CATALOG_SEARCH_URL,
             json={
                 "results": {
                     "songs": {
@@ -2027,18 +2007,12 @@ class TestUserJourneyFuzzyMatching:
         result = server.catalog(action="search", query="Cant Buy Me Love Beatles")
         assert "Can't Buy Me Love" in result or "Cant Buy Me Love" in result
 
-    @responses.activate
-    def test_fuzzy_album_search(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_fuzzy_album_search(self, rsps):
         """User searches for album with fuzzy name."""
-        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         # Test _find_matching_catalog_album with fuzzy input
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/search",
+            CATALOG_SEARCH_URL,
             json={
                 "results": {
                     "albums": {
@@ -2066,54 +2040,32 @@ class TestUserJourneyFuzzyMatching:
         assert error is None
         assert album.get("id") == "album1"
 
-    def _setup_tokens(self, mock_config_dir, mock_developer_token, mock_user_token):
-        """Helper to setup authentication tokens."""
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
 
+@pytest.mark.needs_tokens
+@pytest.mark.usefixtures("applescript_mode")
 class TestUserJourneyMacOSOnly:
     """Integration tests for macOS-only mode (AppleScript preferred)."""
 
-    def test_playlist_operations_prefer_applescript(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_playlist_operations_prefer_applescript(self, monkeypatch):
         """On macOS, playlist operations should prefer AppleScript when possible."""
-        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         # Mock AppleScript module
-        mock_asc = MagicMock()
-        mock_asc.get_playlists.return_value = (
-            True,
-            [{"name": "Chill Vibes", "id": "abc123", "count": 25}],
+        fake_asc = _FakeAsc(
+            get_playlists=(True, [{"name": "Chill Vibes", "id": "abc123", "count": 25}])
         )
-        monkeypatch.setattr(server, "asc", mock_asc)
+        monkeypatch.setattr(server, "asc", fake_asc)
 
         result = server.playlist(action="list")
         assert "Chill Vibes" in result
-        mock_asc.get_playlists.assert_called_once()
-
-    def test_remove_from_playlist_uses_applescript_name(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
-        """remove_from_playlist MUST use AppleScript name, not API ID."""
-        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
+        assert fake_asc.calls == {"get_playlists": 1}
 
+    def test_remove_from_playlist_uses_applescript_name(self, monkeypatch):
+        """remove_from_playlist MUST use AppleScript name, not API ID."""
         # Mock AppleScript
-        mock_asc = MagicMock()
-        mock_asc.get_playlists.return_value = (
-            True,
-            [{"name": "🎵 My Mix", "id": "xyz789", "count": 10}],
+        fake_asc = _FakeAsc(
+            get_playlists=(True, [{"name": "🎵 My Mix", "id": "xyz789", "count": 10}]),
+            remove_track_from_playlist=(True, "Removed"),
         )
-        mock_asc.remove_track_from_playlist.return_value = (True, "Removed")
-        monkeypatch.setattr(server, "asc", mock_asc)
+        monkeypatch.setattr(server, "asc", fake_asc)
 
         # Resolve playlist with fuzzy name
         resolved = server._resolve_playlist("My Mix")
@@ -2122,17 +2074,8 @@ class TestUserJourneyMacOSOnly:
         assert resolved.applescript_name == "🎵 My Mix"
         assert resolved.api_id is None or resolved.applescript_name is not None
 
-    def _setup_tokens(self, mock_config_dir, mock_developer_token, mock_user_token):
-        """Helper to setup authentication tokens."""
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
 
+@pytest.mark.usefixtures("no_verify_wait")
 class TestAlbumDisambiguation:
     """Tests for album param behavior: disambiguation filter when track is present, whole-album add when alone."""
 
@@ -2202,14 +2145,10 @@ class TestAlbumDisambiguation:
             not resolve_album_called
         ), "_resolve_album should NOT be called when both track and album are provided"
 
-    @responses.activate
-    def test_album_with_track_uses_album_as_filter(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    @pytest.mark.needs_tokens
+    def test_album_with_track_uses_album_as_filter(self, rsps, monkeypatch):
         """album + track together should use album as disambiguation, NOT add whole album."""
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         mock_asc = MagicMock()
         mock_asc.get_playlists.return_value = (
             True,
@@ -2249,14 +2188,10 @@ class TestAlbumDisambiguation:
             or call_args.kwargs.get("album") == "Ready, Steady, Wiggle!"
         )
 
-    @responses.activate
-    def test_library_ids_route_to_applescript_for_non_api_playlists(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    @pytest.mark.needs_tokens
+    def test_library_ids_route_to_applescript_for_non_api_playlists(self, rsps, monkeypatch):
         """Library IDs should use AppleScript mode for non-API playlists, not fail with 403."""
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         mock_asc = MagicMock()
         mock_asc.get_playlists.return_value = (
             True,
@@ -2272,7 +2207,7 @@ class TestAlbumDisambiguation:
         monkeypatch.setattr(server, "asc", mock_asc)
 
         # Mock library song lookup for the ID
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/me/library/songs/i.abc123",
             json={
@@ -2296,55 +2231,38 @@ class TestAlbumDisambiguation:
         # AppleScript should have been used
         mock_asc.add_track_to_playlist.assert_called_once()
 
-    def _setup_tokens(self, mock_config_dir, mock_developer_token, mock_user_token):
-        """Helper to setup authentication tokens."""
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
 
+@pytest.mark.needs_tokens
+@pytest.mark.usefixtures("no_verify_wait")
 class TestUserJourneyCombinedMode:
     """Integration tests for combined mode (both API and AppleScript available)."""
 
-    @responses.activate
-    def test_add_to_playlist_chooses_best_mode(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_add_to_playlist_chooses_best_mode(self, rsps, monkeypatch):
         """add_to_playlist should use AppleScript for track names, API for IDs."""
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         # Mock AppleScript
-        mock_asc = MagicMock()
-        mock_asc.get_playlists.return_value = (
-            True,
-            [{"name": "Workout", "id": "work123", "count": 50}],
+        fake_asc = _FakeAsc(
+            get_playlists=(True, [{"name": "Workout", "id": "work123", "count": 50}]),
+            track_exists_in_playlist=(True, False),  # Track doesn't exist yet
+            add_track_to_playlist=(True, "Added"),
         )
-        mock_asc.track_exists_in_playlist.return_value = (True, False)  # Track doesn't exist yet
-        mock_asc.add_track_to_playlist.return_value = (True, "Added")
-        monkeypatch.setattr(server, "asc", mock_asc)
+        monkeypatch.setattr(server, "asc", fake_asc)
 
         # Mock API for playlist resolution
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={"data": [{"id": "p.work", "attributes": {"name": "Workout", "canEdit": True}}]},
             status=200,
         )
 
         # Add track by name - should use AppleScript
-        result = server.playlist(action="add", playlist="Workout", track="Eye of the Tiger")
+        server.playlist(action="add", playlist="Workout", track="Eye of the Tiger")
 
         # AppleScript should have been called for track name operations
-        # (The exact assertion depends on implementation details)
+        assert fake_asc.calls["add_track_to_playlist"] >= 1
 
-    def test_playlist_list_does_not_cascade_to_api_on_applescript_failure(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_playlist_list_does_not_cascade_to_api_on_applescript_failure(self, monkeypatch):
         """When AppleScript fails on macOS, _playlist_list must NOT silently
         cascade to the API. The API path returns a strict subset (only
         API-visible playlists) and silently swapping views on AS failure
@@ -2355,8 +2273,6 @@ class TestUserJourneyCombinedMode:
 
         # Tokens configured but should NOT be touched — fallthrough is
         # blocked.
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         mock_asc = MagicMock()
         mock_asc.get_playlists.return_value = (
             False,
@@ -2379,32 +2295,18 @@ class TestUserJourneyCombinedMode:
         # Does NOT leak the developer-token error
         assert "Developer token not found" not in result
 
-    def _setup_tokens(self, mock_config_dir, mock_developer_token, mock_user_token):
-        """Helper to setup authentication tokens."""
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
 
+@pytest.mark.needs_tokens
 class TestUserJourneyPowerUser:
     """Integration tests for power user workflows (20+ actions)."""
 
-    @responses.activate
-    def test_album_workflow(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_album_workflow(self, rsps, monkeypatch):
         """Power user: add entire album to library."""
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         # Search for album
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/search",
+            CATALOG_SEARCH_URL,
             json={
                 "results": {
                     "albums": {
@@ -2426,28 +2328,23 @@ class TestUserJourneyPowerUser:
         )
 
         # Add album to library
-        responses.add(
+        rsps.add(
             responses.POST,
-            "https://api.music.apple.com/v1/me/library",
+            LIBRARY_URL,
             json={},
             status=202,
         )
 
         result = server.library(action="add", album="Dark Side of the Moon", artist="Pink Floyd")
-        assert "Dark Side" in result or "Added" in result.lower() or "Album" in result
+        assert "Dark Side" in result or "added" in result.lower() or "Album" in result
 
-    @responses.activate
-    def test_copy_playlist_workflow(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_copy_playlist_workflow(self, rsps, monkeypatch):
         """Power user: copy a playlist."""
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         # Source playlist
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={
                 "data": [{"id": "p.src", "attributes": {"name": "Original Mix", "canEdit": True}}]
             },
@@ -2455,7 +2352,7 @@ class TestUserJourneyPowerUser:
         )
 
         # Get source tracks
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/me/library/playlists/p.src/tracks",
             json={
@@ -2468,15 +2365,15 @@ class TestUserJourneyPowerUser:
         )
 
         # Create new playlist
-        responses.add(
+        rsps.add(
             responses.POST,
-            "https://api.music.apple.com/v1/me/library/playlists",
+            LIB_PLAYLISTS_URL,
             json={"data": [{"id": "p.new", "attributes": {"name": "Copy of Original Mix"}}]},
             status=201,
         )
 
         # Add tracks to new playlist
-        responses.add(
+        rsps.add(
             responses.POST,
             "https://api.music.apple.com/v1/me/library/playlists/p.new/tracks",
             json={},
@@ -2488,18 +2385,13 @@ class TestUserJourneyPowerUser:
         )
         assert "p.new" in result or "Copy" in result or "copied" in result.lower()
 
-    @responses.activate
-    def test_search_deduplication(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    def test_search_deduplication(self, rsps, monkeypatch):
         """Search results should be deduplicated by track ID."""
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         # API returns duplicates
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/search",
+            CATALOG_SEARCH_URL,
             json={
                 "results": {
                     "songs": {
@@ -2549,34 +2441,15 @@ class TestUserJourneyPowerUser:
         # Should show "2 Songs" not "3 Songs"
         assert "2 Songs" in result
 
-    def _setup_tokens(self, mock_config_dir, mock_developer_token, mock_user_token):
-        """Helper to setup authentication tokens."""
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
 
+@pytest.mark.needs_tokens
 class TestCatalogAlbumDetails:
     """Tests for catalog album_details action."""
 
-    @responses.activate
-    def test_album_details_by_id(self, mock_config_dir, mock_developer_token, mock_user_token):
+    def test_album_details_by_id(self, rsps):
         """Should fetch album metadata and tracks by catalog ID."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
         # Mock album metadata response
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/catalog/us/albums/1781270319",
             json={
@@ -2599,7 +2472,7 @@ class TestCatalogAlbumDetails:
         )
 
         # Mock tracks response
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/catalog/us/albums/1781270319/tracks",
             json={
@@ -2624,129 +2497,96 @@ class TestCatalogAlbumDetails:
         assert "wacced out murals" in result
         assert "squabble up" in result
 
-    @responses.activate
-    def test_album_details_by_name_fuzzy_match(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
-        """Should find album by name using fuzzy matching."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        # Mock search response
-        responses.add(
-            responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/search",
-            json={
-                "results": {
-                    "albums": {
-                        "data": [
-                            {
-                                "id": "123",
-                                "attributes": {"name": "Abbey Road", "artistName": "The Beatles"},
+    @pytest.mark.parametrize(
+        "routes,album,artist,expected",
+        [
+            pytest.param(
+                [
+                    (
+                        CATALOG_SEARCH_URL,
+                        {
+                            "results": {
+                                "albums": {
+                                    "data": [
+                                        {
+                                            "id": "123",
+                                            "attributes": {
+                                                "name": "Abbey Road",
+                                                "artistName": "The Beatles",
+                                            },
+                                        }
+                                    ]
+                                }
                             }
-                        ]
-                    }
-                }
-            },
-            status=200,
-        )
-
-        # Mock album metadata
-        responses.add(
-            responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/albums/123",
-            json={
-                "data": [
-                    {
-                        "id": "123",
-                        "attributes": {
-                            "name": "Abbey Road",
-                            "artistName": "The Beatles",
-                            "releaseDate": "1969-09-26",
-                            "genreNames": ["Rock"],
-                            "recordLabel": "Apple Records",
-                            "trackCount": 17,
-                            "copyright": "℗ 1969",
                         },
-                    }
-                ]
-            },
-            status=200,
-        )
-
-        # Mock tracks
-        responses.add(
-            responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/albums/123/tracks",
-            json={
-                "data": [
-                    {
-                        "id": "t1",
-                        "attributes": {"name": "Come Together", "durationInMillis": 259000},
-                    },
-                ]
-            },
-            status=200,
-        )
-
-        result = server.catalog(action="album_details", album="abbey road", artist="beatles")
-
-        assert "Abbey Road" in result
-        assert "The Beatles" in result
-        assert "Come Together" in result
-
-    @responses.activate
-    def test_album_details_missing_album_error(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
-        """Should return error when album not found."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        # Mock search with no results
-        responses.add(
-            responses.GET,
-            "https://api.music.apple.com/v1/catalog/us/search",
-            json={"results": {"albums": {"data": []}}},
-            status=200,
-        )
-
-        result = server.catalog(action="album_details", album="NonexistentAlbum999")
-
-        assert "not found" in result.lower() or "error" in result.lower()
-
-
+                    ),
+                    (
+                        "https://api.music.apple.com/v1/catalog/us/albums/123",
+                        {
+                            "data": [
+                                {
+                                    "id": "123",
+                                    "attributes": {
+                                        "name": "Abbey Road",
+                                        "artistName": "The Beatles",
+                                        "releaseDate": "1969-09-26",
+                                        "genreNames": ["Rock"],
+                                        "recordLabel": "Apple Records",
+                                        "trackCount": 17,
+                                        "copyright": "℗ 1969",
+                                    },
+                                }
+                            ]
+                        },
+                    ),
+                    (
+                        "https://api.music.apple.com/v1/catalog/us/albums/123/tracks",
+                        {
+                            "data": [
+                                {
+                                    "id": "t1",
+                                    "attributes": {
+                                        "name": "Come Together",
+                                        "durationInMillis": 259000,
+                                    },
+                                },
+                            ]
+                        },
+                    ),
+                ],
+                "abbey road",
+                "beatles",
+                ("Abbey Road", "The Beatles", "Come Together"),
+                id="fuzzy_match",
+            ),
+            pytest.param(
+                [(CATALOG_SEARCH_URL, {"results": {"albums": {"data": []}}})],
+                "NonexistentAlbum999",
+                "",
+                ("not found",),
+                id="missing_album_error",
+            ),
+        ],
+    )
+    def test_album_details_by_name(self, rsps, routes, album, artist, expected):
+        """Should find an album by fuzzy name, or report it not found."""
+        # Mock search, then album metadata and tracks when there's a match
+        for url, payload in routes:
+            rsps.add(responses.GET, url, json=payload, status=200)
+
+        result = server.catalog(action="album_details", album=album, artist=artist)
+
+        assert all(s in result for s in expected)
+
+
+@pytest.mark.needs_tokens
 class TestDiscoverStorefrontParameter:
     """Tests for discover action storefront parameter."""
 
-    @responses.activate
-    def test_charts_with_storefront_parameter(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
+    def test_charts_with_storefront_parameter(self, rsps):
         """Should query Italian charts without changing default storefront."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
         # Mock Italy charts response
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/catalog/it/charts",
             json={
@@ -2773,26 +2613,14 @@ class TestDiscoverStorefrontParameter:
         result = server.discover(action="charts", chart_type="songs", storefront="it")
 
         # Verify it was called with 'it' storefront
-        assert len(responses.calls) == 1
-        assert "/catalog/it/charts" in responses.calls[0].request.url
+        assert len(rsps.calls) == 1
+        assert "/catalog/it/charts" in rsps.calls[0].request.url
         assert "Italian Song" in result or "Top brani" in result
 
-    @responses.activate
-    def test_top_songs_with_storefront_parameter(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
+    def test_top_songs_with_storefront_parameter(self, rsps):
         """Should query artist top songs in specific storefront."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
         # Mock search in JP storefront
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/catalog/jp/search",
             json={
@@ -2806,7 +2634,7 @@ class TestDiscoverStorefrontParameter:
         )
 
         # Mock top songs
-        responses.add(
+        rsps.add(
             responses.GET,
             "https://api.music.apple.com/v1/catalog/jp/artists/jp-artist-123/view/top-songs",
             json={
@@ -2823,115 +2651,39 @@ class TestDiscoverStorefrontParameter:
         result = server.discover(action="top_songs", artist="Japanese Artist", storefront="jp")
 
         # Verify JP storefront was used
-        assert any("/catalog/jp/" in call.request.url for call in responses.calls)
+        assert any("/catalog/jp/" in call.request.url for call in rsps.calls)
         assert "Japanese Artist" in result
 
 
+@pytest.mark.needs_tokens
 class TestDiscoverRecommendationsLimit:
     """Tests for discover recommendations limit parameter."""
 
-    @responses.activate
-    def test_recommendations_respects_limit_parameter(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
-        """Should only return requested number of recommendations."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        # Mock recommendations response with many items
-        responses.add(
+    @pytest.mark.parametrize(
+        "limit,body,min_lines,max_lines",
+        [
+            (15, _RECOMMENDATIONS_50_BODY, 1, 20),  # ~15 lines, not 50; buffer for formatting
+            (0, _RECOMMENDATIONS_20_BODY, 7, 25),  # all: at least 7-8 items from the category
+        ],
+        ids=["respects_limit", "limit_zero_returns_all"],
+    )
+    def test_recommendations_limit(self, rsps, limit, body, min_lines, max_lines):
+        """Should return only the requested number of recommendations (all when limit=0)."""
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/recommendations",
-            json={
-                "data": [
-                    {
-                        "attributes": {"title": {"stringForDisplay": "For You"}},
-                        "relationships": {
-                            "contents": {
-                                "data": [
-                                    {
-                                        "id": f"rec{i}",
-                                        "type": "songs",
-                                        "attributes": {
-                                            "name": f"Song {i}",
-                                            "artistName": "Artist",
-                                            "releaseDate": "2024-01-01",
-                                        },
-                                    }
-                                    for i in range(1, 51)  # 50 items
-                                ]
-                            }
-                        },
-                    }
-                ]
-            },
+            RECOMMENDATIONS_URL,
+            body=body,
             status=200,
+            content_type="application/json",
         )
 
-        # Request only 15 items
-        result = server.discover(action="recommendations", limit=15, format="text")
+        result = server.discover(action="recommendations", limit=limit, format="text")
 
         # Count items in result (rough check - each song should have a line)
-        lines = [l for l in result.split("\n") if l.strip() and not l.startswith("===")]
-        # Should have ~15 lines, not 50
-        assert len(lines) <= 20  # Allow some buffer for formatting
-
-    @responses.activate
-    def test_recommendations_limit_zero_returns_all(
-        self, mock_config_dir, mock_developer_token, mock_user_token
-    ):
-        """Should return all recommendations when limit=0."""
-        # Setup tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-        # Mock recommendations response
-        responses.add(
-            responses.GET,
-            "https://api.music.apple.com/v1/me/recommendations",
-            json={
-                "data": [
-                    {
-                        "attributes": {"title": {"stringForDisplay": "For You"}},
-                        "relationships": {
-                            "contents": {
-                                "data": [
-                                    {
-                                        "id": f"rec{i}",
-                                        "type": "songs",
-                                        "attributes": {
-                                            "name": f"Song {i}",
-                                            "artistName": "Artist",
-                                            "releaseDate": "2024-01-01",
-                                        },
-                                    }
-                                    for i in range(1, 21)  # 20 items
-                                ]
-                            }
-                        },
-                    }
-                ]
-            },
-            status=200,
+        n_lines = sum(
+            1 for line in result.splitlines() if line.strip() and not line.startswith("===")
         )
-
-        # Request with limit=0 (should return all)
-        result = server.discover(action="recommendations", limit=0, format="text")
-
-        # Should have all ~20 items
-        lines = [l for l in result.split("\n") if l.strip() and not l.startswith("===")]
-        assert len(lines) >= 7  # At least 7-8 items from the category
+        assert min_lines <= n_lines <= max_lines
 
 
 class TestHasDeveloperToken:
@@ -3169,6 +2921,52 @@ class TestAppleScriptPerTrackGuards:
         s = captured["script"]
         assert "skip inaccessible tracks" in s
 
+    def test_search_library_script_honors_limit(self):
+        from applemusic_mcp import applescript as asc
+
+        captured = {}
+
+        def fake_run(script):
+            captured["script"] = script
+            return True, ""
+
+        with patch.object(asc, "run_applescript", fake_run):
+            asc.search_library("anything", "songs", limit=7)
+
+        assert "set maxResults to 7" in captured["script"]
+
+    def test_library_search_passes_limit_to_applescript(self, monkeypatch, mock_config_dir):
+        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
+        seen = {}
+
+        def fake_search(query, types, limit=100):
+            seen["limit"] = limit
+            return True, [{"name": "Song", "artist": "A", "id": "P1"}]
+
+        monkeypatch.setattr(server.asc, "search_library", fake_search)
+        server._library_search("song", limit=5, fetch_explicit=False, clean_only=False)
+        assert seen["limit"] == 10
+
+        server._library_search("song", limit=500, fetch_explicit=False, clean_only=False)
+        assert seen["limit"] == 100
+
+    @pytest.mark.parametrize("clean_only", [False, True])
+    def test_library_search_trims_to_limit_after_dedupe(
+        self, monkeypatch, mock_config_dir, clean_only
+    ):
+        monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
+        rows = [{"name": f"Song {i}", "artist": "A", "id": f"P{i}"} for i in range(6)]
+
+        def fake_search(query, types, limit=100):
+            # Every hit comes back twice
+            return True, [dict(r) for r in rows for _ in range(2)][:limit]
+
+        monkeypatch.setattr(server.asc, "search_library", fake_search)
+        out = server._library_search(
+            "song", limit=3, format="json", fetch_explicit=False, clean_only=clean_only
+        )
+        assert [t["id"] for t in json.loads(out)] == ["P0", "P1", "P2"]
+
     def test_search_playlist_script_wraps_per_track(self):
         from applemusic_mcp import applescript as asc
 
@@ -3194,7 +2992,7 @@ class TestLibrarySearchSurfacesAppleScriptError:
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
 
         # AppleScript fails outright
-        def fake_search(query, types):
+        def fake_search(query, types, limit=100):
             return False, "AppleScript exited with code 1"
 
         monkeypatch.setattr(server.asc, "search_library", fake_search)
@@ -3210,38 +3008,27 @@ class TestLibrarySearchSurfacesAppleScriptError:
         assert "AppleScript also failed" in result
         assert "AppleScript exited with code 1" in result
 
+    @pytest.mark.needs_tokens
     @pytest.mark.usefixtures("mock_config_dir")
-    def test_no_songs_found_includes_applescript_failure(
-        self, monkeypatch, mock_config_dir, mock_developer_token, mock_user_token
-    ):
+    def test_no_songs_found_includes_applescript_failure(self, rsps, monkeypatch):
         """If AS fails AND API returns zero songs, the user should still see
         why AS failed — not a bare 'No songs found' that hides the cause."""
-        import responses as resp_lib
-
-        # Configure tokens so the API path actually runs (no FileNotFoundError)
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 30}, f)
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
 
-        def fake_search(query, types):
+        def fake_search(query, types, limit=100):
             return False, "Music app not running"
 
         monkeypatch.setattr(server.asc, "search_library", fake_search)
 
-        with resp_lib.RequestsMock() as r:
-            r.add(
-                resp_lib.GET,
-                f"{server.BASE_URL}/me/library/search",
-                json={"results": {"library-songs": {"data": []}}},
-                status=200,
-            )
-            result = server._library_search("nonexistent track")
+        rsps.add(
+            responses.GET,
+            f"{server.BASE_URL}/me/library/search",
+            json={"results": {"library-songs": {"data": []}}},
+            status=200,
+        )
+        result = server._library_search("nonexistent track")
 
+        assert len(rsps.calls) == 1
         assert "No songs found" in result
         assert "AppleScript also failed" in result
         assert "Music app not running" in result
@@ -3347,6 +3134,162 @@ class TestFormatApplescriptError:
         assert "()" not in msg
 
 
+class TestOsascriptHost:
+    """Tests for the persistent osascript host's pipe protocol.
+
+    A small Python program stands in for the JXA host so the framing,
+    timeout, and respawn logic run on every platform.
+    """
+
+    _FAKE_HOST = (
+        "import json, sys, time\n"
+        "for line in sys.stdin:\n"
+        "    script = json.loads(line)\n"
+        "    if script == 'hang':\n"
+        "        time.sleep(10)\n"
+        "    if script == 'die':\n"
+        "        sys.exit(1)\n"
+        "    ok = not script.startswith('bad')\n"
+        "    print(json.dumps({'ok': ok, 'out': script.upper() + '\\n'}), flush=True)\n"
+    )
+
+    def _host(self, monkeypatch):
+        import subprocess
+
+        from applemusic_mcp import applescript as asc
+
+        host = asc._OsascriptHost()
+        spawns = []
+
+        def fake_spawn():
+            spawns.append(1)
+            return subprocess.Popen(
+                [sys.executable, "-c", self._FAKE_HOST],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+
+        monkeypatch.setattr(host, "_spawn", fake_spawn)
+        return host, spawns
+
+    def test_reuses_one_process(self, monkeypatch):
+        host, spawns = self._host(monkeypatch)
+        try:
+            assert host.run('return "a"\nreturn "ü"') == (True, 'RETURN "A"\nRETURN "Ü"')
+            assert host.run("second") == (True, "SECOND")
+            assert len(spawns) == 1
+        finally:
+            host.close()
+
+    def test_error_reply(self, monkeypatch):
+        host, _ = self._host(monkeypatch)
+        try:
+            assert host.run("bad script") == (False, "BAD SCRIPT")
+        finally:
+            host.close()
+
+    def test_timeout_kills_and_respawns(self, monkeypatch):
+        host, spawns = self._host(monkeypatch)
+        try:
+            ok, out = host.run("hang", timeout=0.2)
+            assert ok is False
+            from applemusic_mcp import applescript as asc
+
+            assert asc.classify_error(out) == asc.ERROR_TIMEOUT
+            assert host.run("next") == (True, "NEXT")
+            assert len(spawns) == 2
+        finally:
+            host.close()
+
+    def test_host_exit_reports_error_without_rerun(self, monkeypatch):
+        host, spawns = self._host(monkeypatch)
+        try:
+            ok, out = host.run("die")
+            assert ok is False
+            assert "exited" in out
+            assert len(spawns) == 1
+        finally:
+            host.close()
+
+    def test_falls_back_to_oneshot_when_spawn_fails(self, monkeypatch):
+        from applemusic_mcp import applescript as asc
+
+        def broken_spawn():
+            raise OSError("no osascript")
+
+        monkeypatch.setattr(asc._host, "_spawn", broken_spawn)
+        monkeypatch.setattr(asc, "_run_applescript_oneshot", lambda s: (True, "oneshot"))
+        assert asc.run_applescript("return 1") == (True, "oneshot")
+
+    def test_env_var_disables_host(self, monkeypatch):
+        from applemusic_mcp import applescript as asc
+
+        monkeypatch.setenv("APPLEMUSIC_PERSISTENT_OSASCRIPT", "0")
+        monkeypatch.setattr(asc._host, "run", lambda s: pytest.fail("host used"))
+        monkeypatch.setattr(asc, "_run_applescript_oneshot", lambda s: (True, "oneshot"))
+        assert asc.run_applescript("return 1") == (True, "oneshot")
+
+
+class TestGetPlaylistsBulk:
+    """asc.get_playlists bulk fetch with per-playlist fallback."""
+
+    def test_bulk_path_parses(self, monkeypatch):
+        from applemusic_mcp import applescript as asc
+
+        scripts = []
+
+        def mock_run(script):
+            scripts.append(script)
+            return True, (
+                "Road Trip|||ABC|||false|||12|||45:00\nTop 25|||DEF|||true|||25|||1:30:00\n"
+            )
+
+        monkeypatch.setattr(asc, "run_applescript", mock_run)
+        ok, playlists = asc.get_playlists()
+        assert ok is True
+        assert len(scripts) == 1
+        assert "name of every user playlist" in scripts[0]
+        assert playlists[0] == {
+            "name": "Road Trip",
+            "id": "ABC",
+            "smart": False,
+            "track_count": 12,
+            "duration": "45:00",
+        }
+        assert playlists[1]["smart"] is True
+
+    def test_falls_back_to_slow_path(self, monkeypatch):
+        from applemusic_mcp import applescript as asc
+
+        scripts = []
+
+        def mock_run(script):
+            scripts.append(script)
+            if len(scripts) == 1:
+                return False, "Music got an error: Can't get time of every user playlist. (-1728)"
+            return True, "Road Trip|||ABC|||false|||12|||0:00\n"
+
+        monkeypatch.setattr(asc, "run_applescript", mock_run)
+        ok, playlists = asc.get_playlists()
+        assert ok is True
+        assert len(scripts) == 2
+        assert playlists[0]["name"] == "Road Trip"
+
+    def test_environmental_error_skips_slow_path(self, monkeypatch):
+        from applemusic_mcp import applescript as asc
+
+        scripts = []
+
+        def mock_run(script):
+            scripts.append(script)
+            return False, "Not authorized to send Apple events to Music. (-1743)"
+
+        monkeypatch.setattr(asc, "run_applescript", mock_run)
+        ok, _ = asc.get_playlists()
+        assert ok is False
+        assert len(scripts) == 1
+
+
 class TestPlaylistCreateNoTokenLeakOnAsFailure:
     """Regression test for the Reddit-reported bug — _playlist_create must
     NOT cascade to the API path on macOS when AS fails. Otherwise a
@@ -3809,22 +3752,11 @@ class TestLibrarySearchEmptyDoesNotLeakToken:
         assert "applemusic-mcp generate-token" not in result
         assert "applemusic-mcp authorize" not in result
 
-    def test_tokenful_macos_empty_as_still_cascades_for_cloud_check(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    @pytest.mark.needs_tokens
+    def test_tokenful_macos_empty_as_still_cascades_for_cloud_check(self, rsps, monkeypatch):
         """When a token IS configured, empty AS results still cascade to API
         — the API may see cloud-synced tracks AS hasn't seen yet. This is
         the legitimate use case the cascade was originally designed for."""
-        import responses as resp_lib
-
-        # Configure tokens
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 30}, f)
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
 
         mock_asc = MagicMock()
@@ -3834,29 +3766,28 @@ class TestLibrarySearchEmptyDoesNotLeakToken:
         mock_asc.classify_error = real_asc.classify_error
         monkeypatch.setattr(server, "asc", mock_asc)
 
-        with resp_lib.RequestsMock() as r:
-            r.add(
-                resp_lib.GET,
-                f"{server.BASE_URL}/me/library/search",
-                json={
-                    "results": {
-                        "library-songs": {
-                            "data": [
-                                {
-                                    "id": "i.cloud123",
-                                    "attributes": {
-                                        "name": "Cloud Track",
-                                        "artistName": "Cloud Artist",
-                                        "albumName": "Cloud Album",
-                                    },
-                                }
-                            ]
-                        }
+        rsps.add(
+            responses.GET,
+            f"{server.BASE_URL}/me/library/search",
+            json={
+                "results": {
+                    "library-songs": {
+                        "data": [
+                            {
+                                "id": "i.cloud123",
+                                "attributes": {
+                                    "name": "Cloud Track",
+                                    "artistName": "Cloud Artist",
+                                    "albumName": "Cloud Album",
+                                },
+                            }
+                        ]
                     }
-                },
-                status=200,
-            )
-            result = server._library_search("cloud track")
+                }
+            },
+            status=200,
+        )
+        result = server._library_search("cloud track")
 
         # API was reached and surfaced the cloud-synced result
         assert "Cloud Track" in result
@@ -4095,6 +4026,39 @@ class TestLibraryAddUiOnTokenlessMacos:
         assert "Developer token not found" not in result
 
 
+class TestBlockingToolRegistration:
+    """Tools are registered as async wrappers that run in worker threads."""
+
+    def test_all_tools_registered_async(self):
+        """Every registered tool should be async so none block the event loop."""
+        tools = server.mcp._tool_manager.list_tools()
+        assert tools
+        assert all(t.is_async for t in tools)
+
+    def test_tool_runs_off_event_loop_thread(self):
+        """Calling through FastMCP should run the function in a worker thread."""
+        import asyncio
+        import threading
+
+        seen = {}
+
+        @server.blocking_tool()
+        def _probe_tool(value: str = "") -> str:
+            """Probe tool."""
+            seen["thread"] = threading.current_thread()
+            return f"got {value}"
+
+        try:
+            assert _probe_tool(value="direct") == "got direct"
+            result = asyncio.run(server.mcp.call_tool("_probe_tool", {"value": "x"}))
+            assert "got x" in str(result)
+            assert seen["thread"] is not threading.main_thread()
+            schema = server.mcp._tool_manager.get_tool("_probe_tool").parameters
+            assert "value" in schema["properties"]
+        finally:
+            server.mcp._tool_manager._tools.pop("_probe_tool", None)
+
+
 class TestApplyPagination:
     """Unit tests for the _apply_pagination helper."""
 
@@ -4158,28 +4122,6 @@ class TestLibraryBrowsePagination:
     first page, second page (non-zero offset), and fetch-all (limit=0).
     """
 
-    def _setup_tokens(self, mock_config_dir, mock_developer_token, mock_user_token):
-        dev_token_file = mock_config_dir / "developer_token.json"
-        with open(dev_token_file, "w") as f:
-            json.dump({"token": mock_developer_token, "expires": time.time() + 86400 * 60}, f)
-        user_token_file = mock_config_dir / "music_user_token.json"
-        with open(user_token_file, "w") as f:
-            json.dump({"music_user_token": mock_user_token}, f)
-
-    def _make_api_song(self, i):
-        return {
-            "id": f"i.lib{i}",
-            "attributes": {
-                "name": f"Track {i}",
-                "artistName": "Artist",
-                "albumName": "Album",
-                "contentRating": "clean",
-            },
-        }
-
-    def _make_as_song(self, i):
-        return {"name": f"Track {i}", "artist": "Artist", "album": "Album", "id": f"PID{i}"}
-
     # ── AppleScript path ──────────────────────────────────────────────────────
 
     def test_applescript_offset_zero_limit_ten_returns_first_page(self, monkeypatch):
@@ -4187,7 +4129,7 @@ class TestLibraryBrowsePagination:
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
         mock_asc = MagicMock()
         mock_asc.get_library_songs_page.return_value = (
-            True, [self._make_as_song(i) for i in range(10)], 100, ""
+            True, list(_LIBRARY_AS_SONGS[:10]), 100, ""
         )
         monkeypatch.setattr(server, "asc", mock_asc)
 
@@ -4202,7 +4144,7 @@ class TestLibraryBrowsePagination:
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
         mock_asc = MagicMock()
         mock_asc.get_library_songs_page.return_value = (
-            True, [self._make_as_song(i) for i in range(10, 20)], 100, ""
+            True, list(_LIBRARY_AS_SONGS[10:20]), 100, ""
         )
         monkeypatch.setattr(server, "asc", mock_asc)
 
@@ -4219,7 +4161,7 @@ class TestLibraryBrowsePagination:
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
         mock_asc = MagicMock()
         mock_asc.get_library_songs.return_value = (
-            True, [self._make_as_song(i) for i in range(150)]
+            True, list(_LIBRARY_AS_SONGS)
         )
         monkeypatch.setattr(server, "asc", mock_asc)
 
@@ -4231,18 +4173,14 @@ class TestLibraryBrowsePagination:
 
     # ── API path ──────────────────────────────────────────────────────────────
 
-    @responses.activate
-    def test_api_offset_zero_limit_ten_returns_first_page(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    @pytest.mark.needs_tokens
+    def test_api_offset_zero_limit_ten_returns_first_page(self, rsps, monkeypatch):
         """offset=0, limit=10: returns first 10 items in a single API call."""
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/songs",
-            json={"data": [self._make_api_song(i) for i in range(10)]},
+            LIB_SONGS_URL,
+            json={"data": list(_LIBRARY_API_SONGS[:10])},
             status=200,
         )
 
@@ -4250,20 +4188,16 @@ class TestLibraryBrowsePagination:
 
         assert "Track 0" in result
         assert "Track 9" in result
-        assert len(responses.calls) == 1
+        assert len(rsps.calls) == 1
 
-    @responses.activate
-    def test_api_offset_ten_limit_ten_returns_second_page(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    @pytest.mark.needs_tokens
+    def test_api_offset_ten_limit_ten_returns_second_page(self, rsps, monkeypatch):
         """offset=10, limit=10: fetches offset+limit items, returns items 11-20."""
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/songs",
-            json={"data": [self._make_api_song(i) for i in range(20)]},
+            LIB_SONGS_URL,
+            json={"data": list(_LIBRARY_API_SONGS[:20])},
             status=200,
         )
 
@@ -4273,28 +4207,24 @@ class TestLibraryBrowsePagination:
         assert "Track 19" in result
         assert "Track 0" not in result
         assert "Track 9" not in result
-        assert len(responses.calls) == 1
+        assert len(rsps.calls) == 1
 
-    @responses.activate
-    def test_api_limit_zero_fetches_all_across_multiple_calls(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    @pytest.mark.needs_tokens
+    def test_api_limit_zero_fetches_all_across_multiple_calls(self, rsps, monkeypatch):
         """limit=0: keeps calling API until a partial batch signals the end."""
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
         # Full batch of 100 → pagination continues
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/songs",
-            json={"data": [self._make_api_song(i) for i in range(100)]},
+            LIB_SONGS_URL,
+            json={"data": list(_LIBRARY_API_SONGS[:100])},
             status=200,
         )
         # Partial batch of 50 → pagination stops
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/songs",
-            json={"data": [self._make_api_song(i) for i in range(100, 150)]},
+            LIB_SONGS_URL,
+            json={"data": list(_LIBRARY_API_SONGS[100:150])},
             status=200,
         )
 
@@ -4302,7 +4232,7 @@ class TestLibraryBrowsePagination:
 
         assert "Track 0" in result
         assert "Track 149" in result
-        assert len(responses.calls) == 2
+        assert len(rsps.calls) == 2
 
     # ── Regression: offset == limit on a large library ───────────────────────
 
@@ -4311,7 +4241,7 @@ class TestLibraryBrowsePagination:
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
         mock_asc = MagicMock()
         mock_asc.get_library_songs_page.return_value = (
-            True, [self._make_as_song(i) for i in range(10, 20)], 1000, ""
+            True, list(_LIBRARY_AS_SONGS[10:20]), 1000, ""
         )
         monkeypatch.setattr(server, "asc", mock_asc)
 
@@ -4323,18 +4253,14 @@ class TestLibraryBrowsePagination:
         assert "Track 19" in result
         assert "Track 0" not in result
 
-    @responses.activate
-    def test_api_large_library_second_page_returns_tracks_not_error(
-        self, mock_config_dir, mock_developer_token, mock_user_token, monkeypatch
-    ):
+    @pytest.mark.needs_tokens
+    def test_api_large_library_second_page_returns_tracks_not_error(self, rsps, monkeypatch):
         """Regression: API path, 1000+ song library, offset=10, limit=10 returns page 2."""
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", False)
-        self._setup_tokens(mock_config_dir, mock_developer_token, mock_user_token)
-
-        responses.add(
+        rsps.add(
             responses.GET,
-            "https://api.music.apple.com/v1/me/library/songs",
-            json={"data": [self._make_api_song(i) for i in range(20)]},
+            LIB_SONGS_URL,
+            json={"data": list(_LIBRARY_API_SONGS[:20])},
             status=200,
         )
 
@@ -4349,7 +4275,7 @@ class TestLibraryBrowsePagination:
         """clean_only=True uses the full-fetch path so the reported total reflects post-filter count."""
         monkeypatch.setattr(server, "APPLESCRIPT_AVAILABLE", True)
         mock_asc = MagicMock()
-        songs = [self._make_as_song(i) for i in range(5)]
+        songs = list(_LIBRARY_AS_SONGS[:5])
         mock_asc.get_library_songs.return_value = (True, songs)
         monkeypatch.setattr(server, "asc", mock_asc)
 
@@ -8,9 +8,10 @@ import pytest
 import json
 import tempfile
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
-from applemusic_mcp.track_cache import TrackCache, get_track_cache
+from applemusic_mcp import jsonio
+from applemusic_mcp.track_cache import TrackCache, get_track_cache, _normalize_name_key
 
 
 class TestTrackCacheBasics:
@@ -24,13 +25,14 @@ class TestTrackCacheBasics:
             assert cache.cache_file == tmp_path / "cache.json"
 
     def test_cache_file_created(self, tmp_path):
-        """Should create cache file on save."""
+        """Should create cache file on flush."""
         with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
             cache = TrackCache()
             cache.set_track_metadata(
                 explicit="No",
                 persistent_id="ABC123"
             )
+            cache.flush()
             assert cache.cache_file.exists()
 
 
@@ -64,6 +66,31 @@ class TestGetExplicit:
             assert cache.get_explicit("CLEAN123") == "No"
 
 
+class TestGetExplicitMany:
+    """Test batch explicit status retrieval."""
+
+    def test_returns_only_cached_ids(self, tmp_path):
+        """Should map cached IDs to their status and leave out the rest."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache = TrackCache()
+            cache.set_track_metadata(explicit="Yes", persistent_id="EXPLICIT123")
+            cache.set_track_metadata(explicit="No", persistent_id="CLEAN123")
+
+            result = cache.get_explicit_many(["EXPLICIT123", "missing", "CLEAN123"])
+
+            assert result == {"EXPLICIT123": "Yes", "CLEAN123": "No"}
+
+    def test_skips_stale_unknown(self, tmp_path):
+        """Stale "Unknown" tombstones should be left out, like get_explicit."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache = TrackCache()
+            cache.mark_unknown("FRESH")
+            with patch('applemusic_mcp.track_cache.time.time', return_value=1000.0):
+                cache.mark_unknown("STALE")
+
+            assert cache.get_explicit_many(["FRESH", "STALE"]) == {"FRESH": "Unknown"}
+
+
 class TestMultiIDIndexing:
     """Test that tracks are indexed by all three ID types."""
 
@@ -179,6 +206,7 @@ class TestCachePersistence:
                 persistent_id="TRACK123",
                 isrc="USRC19300278"
             )
+            cache.flush()
 
             # Verify file exists and contains data
             assert cache.cache_file.exists()
@@ -198,8 +226,7 @@ class TestCachePersistence:
                 "albums": {},
                 "name_index": {}
             }
-            with open(cache_file, 'w') as f:
-                json.dump(cache_data, f)
+            cache_file.write_text(json.dumps(cache_data))
 
             # Load cache
             cache = TrackCache()
@@ -233,12 +260,245 @@ class TestCachePersistence:
                 explicit="No",
                 persistent_id="TRACK123"
             )
+            cache1.flush()
 
             # Second instance (simulates restart)
             cache2 = TrackCache()
             assert cache2.get_explicit("TRACK123") == "No"
 
 
+class TestJournal:
+    """Test the append-only journal that replaces full-cache rewrites."""
+
+    def test_set_appends_instead_of_rewriting(self, tmp_path):
+        """Mutations should append to cache.log, not rewrite cache.json."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache = TrackCache()
+            cache.set_track_metadata(explicit="No", persistent_id="TRACK1")
+            cache.set_track_metadata(explicit="Yes", persistent_id="TRACK2")
+            assert not cache.cache_file.exists()
+            lines = (tmp_path / "cache.log").read_bytes().splitlines()
+            assert len(lines) == 2
+            assert json.loads(lines[0])["key"] == "TRACK1"
+
+    def test_noop_set_does_not_append(self, tmp_path):
+        """Re-setting an already cached ID should not grow the journal."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache = TrackCache()
+            cache.set_track_metadata(explicit="No", persistent_id="TRACK1")
+            size = (tmp_path / "cache.log").stat().st_size
+            cache.set_track_metadata(explicit="Yes", persistent_id="TRACK1")
+            assert (tmp_path / "cache.log").stat().st_size == size
+
+    def test_load_replays_and_compacts_journal(self, tmp_path):
+        """A new instance should replay the journal, then fold it into cache.json."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache1 = TrackCache()
+            cache1.set_track_metadata(explicit="Yes", persistent_id="TRACK1", name="Song")
+            cache1.set_album_metadata(library_id="l.ALB", name="Album")
+
+            cache2 = TrackCache()
+            assert cache2.get_explicit("TRACK1") == "Yes"
+            assert cache2.get_track_by_name("Song") == "TRACK1"
+            assert cache2.get_album("l.ALB") == {"name": "Album"}
+            assert (tmp_path / "cache.log").stat().st_size == 0
+            with open(cache2.cache_file) as f:
+                assert "TRACK1" in json.load(f)["tracks"]
+
+    def test_skips_torn_journal_line(self, tmp_path):
+        """A partially written last record should be ignored on replay."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache1 = TrackCache()
+            cache1.set_track_metadata(explicit="No", persistent_id="TRACK1")
+            with open(tmp_path / "cache.log", "ab") as f:
+                f.write(b'{"op": "set", "sect')
+
+            cache2 = TrackCache()
+            assert cache2.get_explicit("TRACK1") == "No"
+            assert cache2.get_stats()["track_count"] == 1
+
+    @pytest.mark.parametrize("backend", ["orjson", "stdlib"])
+    def test_skips_torn_line_with_broken_utf8(self, tmp_path, monkeypatch, backend):
+        """Records after a torn line with invalid UTF-8 should replay on either backend."""
+        if backend == "stdlib":
+            monkeypatch.setattr(jsonio, "orjson", None)
+        elif jsonio.orjson is None:
+            pytest.skip("orjson not installed")
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache1 = TrackCache()
+            cache1.set_track_metadata(explicit="No", persistent_id="TRACK1")
+            with open(tmp_path / "cache.log", "ab") as f:
+                f.write(b'{"op": "set", "key": "\xff\xfe\n')
+            cache1.set_track_metadata(explicit="Yes", persistent_id="TRACK2")
+
+            cache2 = TrackCache()
+            assert cache2.get_explicit("TRACK1") == "No"
+            assert cache2.get_explicit("TRACK2") == "Yes"
+
+    def test_clear_tracks_is_journaled(self, tmp_path):
+        """Section clears should survive a restart."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache1 = TrackCache()
+            cache1.set_track_metadata(explicit="No", persistent_id="TRACK1")
+            cache1.set_album_metadata(library_id="l.ALB", name="Album")
+            cache1.clear_tracks()
+
+            cache2 = TrackCache()
+            assert cache2.get_explicit("TRACK1") is None
+            assert cache2.get_album("l.ALB") == {"name": "Album"}
+
+    def test_compacts_when_journal_grows(self, tmp_path):
+        """The journal should be folded into the snapshot once it's large."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path), \
+                patch('applemusic_mcp.track_cache.COMPACT_MIN_BYTES', 0):
+            cache = TrackCache()
+            cache.set_track_metadata(explicit="No", persistent_id="TRACK1")
+            assert cache.cache_file.exists()
+            assert (tmp_path / "cache.log").stat().st_size == 0
+
+    def test_flush_without_journal_is_noop(self, tmp_path):
+        """Flushing with nothing journaled should not create the snapshot."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache = TrackCache()
+            cache.flush()
+            assert not cache.cache_file.exists()
+
+
+class TestBulkUpsert:
+    """Test set_tracks_bulk batching."""
+
+    def test_bulk_sets_all_entries(self, tmp_path):
+        """Every entry should be cached and name-indexed."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache = TrackCache()
+            cache.set_tracks_bulk([
+                {"explicit": "Yes", "persistent_id": "P1", "catalog_id": "111", "name": "One"},
+                {"explicit": "No", "library_id": "i.L2", "name": "Two", "artist": "Band"},
+                {"explicit": "Unknown", "persistent_id": "P3"},
+            ])
+            assert cache.get_explicit("P1") == "Yes"
+            assert cache.get_explicit("111") == "Yes"
+            assert cache.get_explicit("i.L2") == "No"
+            assert cache.get_explicit("P3") == "Unknown"
+            assert cache.get_track_by_name("Two", "Band") == "i.L2"
+
+    def test_bulk_appends_once(self, tmp_path):
+        """A bulk call should journal with a single append."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache = TrackCache()
+            with patch.object(cache, '_append', wraps=cache._append) as mock_append:
+                cache.set_tracks_bulk(
+                    [{"explicit": "No", "persistent_id": f"P{i}"} for i in range(50)]
+                )
+            assert mock_append.call_count == 1
+            assert len(mock_append.call_args[0][0]) == 50
+
+    def test_bulk_skips_append_when_nothing_new(self, tmp_path):
+        """Entries that are all cached already should not touch disk."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache = TrackCache()
+            cache.set_tracks_bulk([{"explicit": "No", "persistent_id": "P1"}])
+            with patch.object(cache, '_append') as mock_append:
+                cache.set_tracks_bulk([{"explicit": "Yes", "persistent_id": "P1"}])
+                cache.set_tracks_bulk([])
+            mock_append.assert_not_called()
+
+
+class TestUnknownTombstones:
+    """Test negative caching of failed explicit lookups."""
+
+    def test_fresh_unknown_is_returned(self, tmp_path):
+        """A recent failed lookup should be served from cache."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache = TrackCache()
+            cache.mark_unknown("P1")
+            assert cache.get_explicit("P1") == "Unknown"
+
+    def test_stale_unknown_is_a_miss(self, tmp_path):
+        """After UNKNOWN_TTL the tombstone should read as a miss so callers retry."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache = TrackCache()
+            with patch('applemusic_mcp.track_cache.time.time', return_value=1000.0):
+                cache.mark_unknown("P1")
+            assert cache.get_explicit("P1") is None
+
+    def test_legacy_unknown_without_timestamp_is_a_miss(self, tmp_path):
+        """Tombstones cached before timestamps existed should be retried."""
+        cache_file = tmp_path / "cache.json"
+        cache_file.write_text(json.dumps(
+            {"tracks": {"P1": {"explicit": "Unknown"}}, "albums": {}, "name_index": {}}
+        ))
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            assert TrackCache().get_explicit("P1") is None
+
+    def test_real_value_replaces_tombstone(self, tmp_path):
+        """A successful lookup should overwrite a fresh tombstone."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache = TrackCache()
+            cache.mark_unknown("P1")
+            cache.set_track_metadata(explicit="Yes", persistent_id="P1")
+            assert cache.get_explicit("P1") == "Yes"
+
+            cache.set_track_metadata(explicit="Unknown", persistent_id="P1")
+            assert cache.get_explicit("P1") == "Yes"
+
+    def test_stale_tombstone_is_refreshed(self, tmp_path):
+        """Re-marking a stale tombstone should restart its TTL and persist."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache = TrackCache()
+            with patch('applemusic_mcp.track_cache.time.time', return_value=1000.0):
+                cache.mark_unknown("P1")
+            cache.mark_unknown("P1")
+            assert cache.get_explicit("P1") == "Unknown"
+            assert TrackCache().get_explicit("P1") == "Unknown"
+
+
+class TestInterning:
+    """Test memory sharing of repeated metadata."""
+
+    def test_repeated_strings_are_interned(self, tmp_path):
+        """Explicit and artist values should share one string object."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache = TrackCache()
+            # Built at runtime so each entry holds its own equal-but-distinct strings
+            cache.set_tracks_bulk([
+                {
+                    "explicit": "".join(["N", "o"]),
+                    "persistent_id": pid,
+                    "artist": "".join(["Ba", "nd"]),
+                }
+                for pid in ("P1", "P2")
+            ])
+            one, two = cache._cache["tracks"]["P1"], cache._cache["tracks"]["P2"]
+            assert one["explicit"] is two["explicit"]
+            assert one["artist"] is two["artist"]
+
+    def test_reload_shares_metadata_across_ids(self, tmp_path):
+        """IDs of one track should point at a single dict after reload."""
+        with patch('applemusic_mcp.track_cache.get_cache_dir', return_value=tmp_path):
+            cache = TrackCache()
+            cache.set_track_metadata(explicit="Yes", persistent_id="P1", catalog_id="111")
+            cache.flush()
+
+            reloaded = TrackCache()
+            tracks = reloaded._cache["tracks"]
+            assert tracks["P1"] is tracks["111"]
+            assert reloaded.get_explicit("111") == "Yes"
+
+
+class TestNormalizeNameKey:
+    """Test name-index key normalization."""
+
+    def test_name_only_key(self):
+        """Without an artist the key is just the normalized name."""
+        assert _normalize_name_key("  Abbey Road ") == "abbey road"
+        assert _normalize_name_key("Abbey Road", "") == "abbey road"
+
+    def test_name_and_artist_key(self):
+        """Artist is appended after a pipe, normalized the same way."""
+        assert _normalize_name_key("Abbey Road", " The Beatles") == "abbey road|the beatles"
+
+
 class TestClearCache:
     """Test cache clearing functionality."""
 
@@ -281,6 +541,36 @@ class TestGlobalCacheInstance:
         cache2 = get_track_cache()
         assert cache1 is cache2
 
+    def test_concurrent_first_calls_build_one_instance(self, monkeypatch):
+        """Threads racing on the first call should all get the same instance."""
+        import threading
+        import time
+
+        from applemusic_mcp import track_cache
+
+        built = []
+
+        def slow_cache():
+            time.sleep(0.01)
+            built.append(MagicMock(spec=TrackCache))
+            return built[-1]
+
+        monkeypatch.setattr(track_cache, "_track_cache", None)
+        monkeypatch.setattr(track_cache, "TrackCache", slow_cache)
+        monkeypatch.setattr(track_cache.atexit, "register", lambda fn: fn)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_track_cache())) for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(built) == 1
+        assert len(results) == 8
+        assert all(r is built[0] for r in results)
+
 
 class TestEdgeCases:
     """Test edge cases and error handling."""
@@ -347,6 +637,7 @@ class TestEdgeCases:
                     explicit="No",
                     persistent_id="TRACK123"
                 )
+                cache.flush()
             except Exception as e:
                 pytest.fail(f"set_track_metadata raised exception: {e}")
             finally: